@@ -39,6 +39,13 @@ class Env(object):
     action_space = None
     observation_space = None
 
+    # Level of validation of the actions in `check_action`: one of 'full' (every
+    # action is checked), 'sampling' (one action every
+    # `action_validation_interval` steps is checked) or 'off'. Set it on an
+    # environment, or on `gym.Env` to change the default for all environments.
+    action_validation = 'full'
+    action_validation_interval = 100
+
     def step(self, action):
         """Run one timestep of the environment's dynamics. When end of
         episode is reached, you are responsible for calling `reset()`
@@ -57,6 +64,28 @@ class Env(object):
         """
         raise NotImplementedError
 
+    def check_action(self, action):
+        """Checks that the action is a member of the action space, according to
+        the level of validation `action_validation`.
+
+        Args:
+            action (object): an action provided by the agent
+
+        Raises:
+            AssertionError: if the action is checked and is invalid
+        """
+        if self.action_validation == 'off':
+            return
+        if self.action_validation == 'sampling':
+            count = getattr(self, '_action_validation_count', 0)
+            self._action_validation_count = count + 1
+            if count % self.action_validation_interval:
+                return
+        elif self.action_validation != 'full':
+            raise error.Error('Invalid action validation level: {}. Must be one '
+                'of `full`, `sampling` or `off`.'.format(self.action_validation))
+        assert self.action_space.contains(action), "%r (%s) invalid"%(action, type(action))
+
     def reset(self):
         """Resets the state of the environment and returns an initial observation.
 
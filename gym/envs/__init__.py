@@ -6,14 +6,12 @@ from gym.envs.registration import registry, register, make, spec
 register(
     id = 'HovorkaCambridge-v0',
     entry_point = 'gym.envs.diabetes.hovorka_cambridge:HovorkaCambridgeBase',
-    # The true max episode steps are 72, but that becomes a bug in the TimeLimit wrapper..
-    max_episode_steps = 200,
+    max_episode_steps = 72,
 )
 register(
     id = 'HovorkaDiscrete-v0',
     entry_point = 'gym.envs.diabetes.hovorka_discrete:HovorkaDiscrete',
-    # The true max episode steps are 72, but that becomes a bug in the TimeLimit wrapper..
-    max_episode_steps = 200,
+    max_episode_steps = 72,
 )
 
 # Algorithmic
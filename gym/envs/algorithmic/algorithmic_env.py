@@ -160,7 +160,7 @@ class AlgorithmicEnv(Env):
         return len(self.input_data)
 
     def step(self, action):
-        assert self.action_space.contains(action)
+        self.check_action(action)
         self.last_action = action
         inp_act, out_act, pred = action
         done = False
@@ -239,7 +239,7 @@ class LunarLander(gym.Env, EzPickle):
         if self.continuous:
             action = np.clip(action, -1, +1).astype(np.float32)
         else:
-            assert self.action_space.contains(action), "%r (%s) invalid " % (action, type(action))
+            self.check_action(action)
 
         # Engines
         tip  = (math.sin(self.lander.angle), math.cos(self.lander.angle))
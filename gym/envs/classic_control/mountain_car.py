@@ -42,7 +42,7 @@ class MountainCarEnv(gym.Env):
         return [seed]
 
     def step(self, action):
-        assert self.action_space.contains(action), "%r (%s) invalid" % (action, type(action))
+        self.check_action(action)
 
         position, velocity = self.state
         velocity += (action-1)*self.force + math.cos(3*position)*(-self.gravity)
@@ -230,7 +230,20 @@ class HovorkaCambridgeBase(gym.Env):
         Take action. In the diabetes simulation this means increase, decrease or do nothing
         to the insulin to carb ratio (bolus).
         """
+        observation, reward, done, info = self.step_n(action, 1)
+        return observation, reward, done, {'bg': info['bg']}
 
+    def step_n(self, action, n):
+        """
+        Take the same action for `n` consecutive decision intervals (of `simulation_time`
+        minutes each), in a single integration of the Hovorka model: the solver is not
+        restarted between the intervals, and the bg history is only concatenated once.
+        This is equivalent to `n` calls to `step`, and stops early if the episode is done.
+
+        Returns the observation after the last interval, the sum of the rewards of the
+        intervals, done, and in info the number of simulated intervals (`'num_steps'`)
+        and the blood glucose trace of these intervals, one value per minute (`'bg'`).
+        """
         # if type(action).__module__ != np.__name__:
         # if not isinstance(action, np.ndarray):
         # action = np.array([action])
@@ -240,133 +253,143 @@ class HovorkaCambridgeBase(gym.Env):
         elif action < self.action_space.low:
             action = self.action_space.low
 
-        assert self.action_space.contains(action), "%r (%s) invalid"%(action, type(action))
+        self.check_action(action)
 
         self.integrator.set_initial_value(self.simulation_state, self.num_iters)
 
-        bg = []
-        bolus_given = np.zeros(1)
+        total_reward = 0.
+        bg_history = [self.bg_history]
 
-        for i in range(self.simulation_time):
+        for num_steps in range(1, n + 1):
+            bg = []
+            bolus_given = np.zeros(1)
 
-            # ===============================================
-            # Solving one step of the Hovorka model
-            # ===============================================
+            for i in range(self.simulation_time):
 
-            # Calculating insulin on board
-            self.insulinOnBoard = np.zeros(1)
-            if self.bolusHistoryIndex > 0:
-                for b in range(self.bolusHistoryIndex):
-                    self.insulinOnBoard = self.insulinOnBoard + self.bolusHistoryValue[b] * self.scalableExpIOB(self.num_iters - self.bolusHistoryTime[b], 75, 300)
+                # ===============================================
+                # Solving one step of the Hovorka model
+                # ===============================================
 
-            # If there is a meal, give a bolus
-            # print("numero iter", self.num_iters)
-            if self.meal_indicator[self.num_iters] > 0:
-                insulin_rate = action + np.round(max(self.meal_indicator[self.num_iters] * (180 / self.bolus), 0), 1)
-            else:
-                insulin_rate = action
+                # Calculating insulin on board
+                self.insulinOnBoard = np.zeros(1)
+                if self.bolusHistoryIndex > 0:
+                    for b in range(self.bolusHistoryIndex):
+                        self.insulinOnBoard = self.insulinOnBoard + self.bolusHistoryValue[b] * self.scalableExpIOB(self.num_iters - self.bolusHistoryTime[b], 75, 300)
 
-            bolus_given =  bolus_given + self.meal_indicator[self.num_iters] * (180 / self.bolus)
+                # If there is a meal, give a bolus
+                # print("numero iter", self.num_iters)
+                if self.meal_indicator[self.num_iters] > 0:
+                    insulin_rate = action + np.round(max(self.meal_indicator[self.num_iters] * (180 / self.bolus), 0), 1)
+                else:
+                    insulin_rate = action
 
-            # Add given bolus to history
-            if self.meal_indicator[self.num_iters] > 0:
-                self.bolusHistoryIndex = self.bolusHistoryIndex + 1
-                self.bolusHistoryValue.append(self.meal_indicator[self.num_iters] * (180/self.bolus))
-                self.bolusHistoryTime.append(self.num_iters)
+                bolus_given =  bolus_given + self.meal_indicator[self.num_iters] * (180 / self.bolus)
 
+                # Add given bolus to history
+                if self.meal_indicator[self.num_iters] > 0:
+                    self.bolusHistoryIndex = self.bolusHistoryIndex + 1
+                    self.bolusHistoryValue.append(self.meal_indicator[self.num_iters] * (180/self.bolus))
+                    self.bolusHistoryTime.append(self.num_iters)
 
-            # Updating the carb and insulin parameters in the model
-            self.integrator.set_f_params(insulin_rate, self.meals[self.num_iters], self.P)
 
-            # Integration step
-            self.integrator.integrate(self.integrator.t + 1)
+                # Updating the carb and insulin parameters in the model
+                self.integrator.set_f_params(insulin_rate, self.meals[self.num_iters], self.P)
 
-            # ===============
-            # CGM noise -- uncomment if CGM noise is to be addded
-            # ===============
+                # Integration step
+                self.integrator.integrate(self.integrator.t + 1)
 
-            # if i % 5 == 0:
-            # # johnson
-            #     self.sensor_noise = 0.7 * (self.sensor_noise[0] + np.random.randn(1))
-            # # paramMCHO = 180
-            #     self.CGMerror = self.CGMepsilon + self.CGMlambda * np.sinh((self.sensor_noise[0] - self.CGMgamma) / self.CGMdelta)
-            # # ar(1), colored}
-            # if i % 5 == 0:
-            # phi = 0.8
-            # self.CGMerror = phi * self.CGMerror + np.sqrt(1 - phi ** 2) * self.sensorNoiseValue * np.random.randn(1)[0]
+                # ===============
+                # CGM noise -- uncomment if CGM noise is to be addded
+                # ===============
 
-            # # mult
-            # self.CGMerror = self.sensorNoiseValue * self.state(self.integrator.y[-1]) * np.random.randn(1)[0]
+                # if i % 5 == 0:
+                # # johnson
+                #     self.sensor_noise = 0.7 * (self.sensor_noise[0] + np.random.randn(1))
+                # # paramMCHO = 180
+                #     self.CGMerror = self.CGMepsilon + self.CGMlambda * np.sinh((self.sensor_noise[0] - self.CGMgamma) / self.CGMdelta)
+                # # ar(1), colored}
+                # if i % 5 == 0:
+                # phi = 0.8
+                # self.CGMerror = phi * self.CGMerror + np.sqrt(1 - phi ** 2) * self.sensorNoiseValue * np.random.randn(1)[0]
 
-            # # white, add
-            # self.CGMerror = self.sensorNoiseValue * np.random.randn(1)
+                # # mult
+                # self.CGMerror = self.sensorNoiseValue * self.state(self.integrator.y[-1]) * np.random.randn(1)[0]
 
-            # # No noise
-            # self.CGMerror = 0
+                # # white, add
+                # self.CGMerror = self.sensorNoiseValue * np.random.randn(1)
 
-            # self.CGMaux.append(self.CGMerror)
+                # # No noise
+                # self.CGMerror = 0
 
-            # bg.append(self.integrator.y[-1] * 18 + self.CGMerror)
+                # self.CGMaux.append(self.CGMerror)
 
-            # Stop uncomment here! Miguel: double check this!
-            # =================================================================
+                # bg.append(self.integrator.y[-1] * 18 + self.CGMerror)
 
-            bg.append(self.integrator.y[-1] * 18)
+                # Stop uncomment here! Miguel: double check this!
+                # =================================================================
 
-            # self.num_iters += 5
-            self.num_iters += self.n_solver_steps
+                bg.append(self.integrator.y[-1] * 18)
 
-        # Updating environment parameters
-        self.simulation_state = self.integrator.y
+                # self.num_iters += 5
+                self.num_iters += self.n_solver_steps
 
-        # Recording bg history for plotting and insulin for the state space
-        self.bg_history = np.concatenate([self.bg_history, bg])
-        self.insulin_history = np.concatenate([self.insulin_history, action])
+            # Recording bg history for plotting and insulin for the state space
+            bg_history.append(bg)
+            self.insulin_history = np.concatenate([self.insulin_history, action])
 
-        # Miguel: What is this?
-        # self.insulinOnBoard = np.zeros(1)
-        # if self.bolusHistoryIndex > 0:
-        #     for b in range(self.bolusHistoryIndex):
-        #         self.insulinOnBoard = self.insulinOnBoard + self.bolusHistoryValue[b] * self.scalableExpIOB(self.num_iters - self.bolusHistoryTime[b], 75, 300)
+            # Miguel: What is this?
+            # self.insulinOnBoard = np.zeros(1)
+            # if self.bolusHistoryIndex > 0:
+            #     for b in range(self.bolusHistoryIndex):
+            #         self.insulinOnBoard = self.insulinOnBoard + self.bolusHistoryValue[b] * self.scalableExpIOB(self.num_iters - self.bolusHistoryTime[b], 75, 300)
 
-        # Updating state
-        self.state = np.concatenate([bg, list(reversed(self.insulin_history[-4:])), self.insulinOnBoard, bolus_given])
+            # Updating state
+            self.state = np.concatenate([bg, list(reversed(self.insulin_history[-4:])), self.insulinOnBoard, bolus_given])
 
-        done = 0
+            done = 0
 
-        #Set environment done = True if blood_glucose_level is negative, out of bounds or over the time limit
-        if (np.max(bg) > self.bg_threshold_high or np.max(bg) < self.bg_threshold_low):
-            done = 1
+            #Set environment done = True if blood_glucose_level is negative, out of bounds or over the time limit
+            if (np.max(bg) > self.bg_threshold_high or np.max(bg) < self.bg_threshold_low):
+                done = 1
 
-        if self.num_iters > self.max_iter:
-            done = 1
+            if self.num_iters > self.max_iter:
+                done = 1
 
-        done = bool(done)
+            done = bool(done)
 
-        # ====================================================================================
-        # Calculate Reward  (and give error if action is taken after terminal state)
-        # ====================================================================================
+            # ====================================================================================
+            # Calculate Reward  (and give error if action is taken after terminal state)
+            # ====================================================================================
 
-        if not done:
-            reward = rewardFunction.calculate_reward(np.array(bg), self.reward_flag, 108, action, self.init_basal_optimal)
+            if not done:
+                reward = rewardFunction.calculate_reward(np.array(bg), self.reward_flag, 108, action, self.init_basal_optimal)
 
-        elif self.steps_beyond_done is None:
-            # Blood glucose below zero -- simulation out of bounds
-            self.steps_beyond_done = 0
-            # reward = 0.0
-            # reward = -1000
-            reward = rewardFunction.calculate_reward(np.array(bg), self.reward_flag, 108, action, self.init_basal_optimal)
+            elif self.steps_beyond_done is None:
+                # Blood glucose below zero -- simulation out of bounds
+                self.steps_beyond_done = 0
+                # reward = 0.0
+                # reward = -1000
+                reward = rewardFunction.calculate_reward(np.array(bg), self.reward_flag, 108, action, self.init_basal_optimal)
             
-        else:
-            if self.steps_beyond_done == 0:
-                logger.warning("You are calling 'step()' even though this environment has already returned done = True. You should always call 'reset()' once you receive 'done = True' -- any further steps are undefined behavior.")
-            self.steps_beyond_done += 1
-            reward = -1000
+            else:
+                if self.steps_beyond_done == 0:
+                    logger.warning("You are calling 'step()' even though this environment has already returned done = True. You should always call 'reset()' once you receive 'done = True' -- any further steps are undefined behavior.")
+                self.steps_beyond_done += 1
+                reward = -1000
+
+            total_reward += np.mean(reward)
+            if done:
+                break
+
+        # Updating environment parameters
+        self.simulation_state = self.integrator.y
+        bg_trace = np.concatenate(bg_history[1:])
+        self.bg_history = np.concatenate([self.bg_history, bg_trace])
 
         # Miguel: que pasa?
         self.previous_action = action
 
-        return np.array(self.state), np.mean(reward), done, {}
+        return np.array(self.state), total_reward, done, {'num_steps': num_steps, 'bg': bg_trace}
 
 
     def reset(self):
@@ -63,3 +63,16 @@ def test_env_render_result_is_immutable():
         output = env.render(mode='ansi')
         assert isinstance(output, string_types)
         env.close()
+
+@pytest.mark.parametrize("env_id", ['Blackjack-v0', 'NChain-v0', 'Roulette-v0',
+    'HotterColder-v0', 'GuessingGame-v0', 'Copy-v0'])
+def test_env_check_action(env_id):
+    # The actions are validated by `Env.check_action`, so that the level of
+    # validation `action_validation` is honored
+    env = envs.make(env_id).unwrapped
+    env.reset()
+    checked = []
+    env.check_action = checked.append
+    action = env.action_space.sample()
+    env.step(action)
+    assert checked == [action]
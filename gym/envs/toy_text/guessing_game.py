@@ -58,7 +58,7 @@ class GuessingGame(gym.Env):
         return [seed]
 
     def step(self, action):
-        assert self.action_space.contains(action)
+        self.check_action(action)
 
         if action < self.number:
             self.observation = 1
@@ -43,7 +43,7 @@ class HotterColder(gym.Env):
         return [seed]
 
     def step(self, action):
-        assert self.action_space.contains(action)
+        self.check_action(action)
 
         if action < self.number:
             self.observation = 1
@@ -36,7 +36,7 @@ class NChainEnv(gym.Env):
         return [seed]
 
     def step(self, action):
-        assert self.action_space.contains(action)
+        self.check_action(action)
         if self.np_random.rand() < self.slip:
             action = not action  # agent slipped, reverse action taken
         if action:  # 'backwards': go back to the beginning, get small reward
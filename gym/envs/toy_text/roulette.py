@@ -25,7 +25,7 @@ class RouletteEnv(gym.Env):
         return [seed]
 
     def step(self, action):
-        assert self.action_space.contains(action)
+        self.check_action(action)
         if action == self.n - 1:
             # observation, reward, done, info
             return 0, 0, True, {}
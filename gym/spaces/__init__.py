@@ -9,5 +9,9 @@ from gym.spaces.dict import Dict
 from gym.spaces.utils import flatdim
 from gym.spaces.utils import flatten
 from gym.spaces.utils import unflatten
+from gym.spaces.utils import FlattenPlan
+from gym.spaces.utils import one_hot_dim
+from gym.spaces.utils import one_hot_encode
+from gym.spaces.utils import one_hot_decode
 
-__all__ = ["Space", "Box", "Discrete", "MultiDiscrete", "MultiBinary", "Tuple", "Dict", "flatdim", "flatten", "unflatten"]
+__all__ = ["Space", "Box", "Discrete", "MultiDiscrete", "MultiBinary", "Tuple", "Dict", "flatdim", "flatten", "unflatten", "FlattenPlan", "one_hot_dim", "one_hot_encode", "one_hot_decode"]
@@ -1,6 +1,6 @@
 import numpy as np
 
-from .space import Space
+from .space import Space, _batch_size
 
 
 class Box(Space):
@@ -19,6 +19,8 @@ class Box(Space):
         >>> Box(low=np.array([-1.0, -2.0]), high=np.array([2.0, 4.0]), dtype=np.float32)
         Box(2,)
 
+    The bounds `low` and `high` are read-only arrays, so that the data derived
+    from them (e.g. the content hash used by `==` and `hash`) is computed once.
     """
     def __init__(self, low, high, shape=None, dtype=np.float32):
         assert dtype is not None, 'dtype must be explicitly provided. '
@@ -35,15 +37,51 @@ class Box(Space):
             self.low = np.full(self.shape, low)
             self.high = np.full(self.shape, high)
 
-        self.low = self.low.astype(self.dtype)
-        self.high = self.high.astype(self.dtype)
-
-        # Boolean arrays which indicate the interval type for each coordinate
-        self.bounded_below = -np.inf < self.low
-        self.bounded_above = np.inf > self.high
+        # Read-only bounds (e.g. the broadcast views of the batched spaces in
+        # `gym.vector.utils.batch_space`) are shared instead of copied, and the
+        # others are copied and made read-only
+        self.low = self.low.astype(self.dtype, copy=self.low.flags.writeable)
+        self.high = self.high.astype(self.dtype, copy=self.high.flags.writeable)
+        self._set_read_only()
 
         super(Box, self).__init__(self.shape, self.dtype)
 
+    # Boundedness masks `(bounded_below, bounded_above)`, cached for read-only
+    # bounds (see `_get_boundedness`)
+    _boundedness = None
+    # Interval types of the coordinates, computed on the first call to
+    # `sample` (see `_get_sampling_masks`)
+    _sampling_masks = None
+    # Scalar bounds of the boxes with read-only and uniform bounds, computed on
+    # the first call to `contains` (see `_get_uniform_bounds`)
+    _uniform_bounds = None
+
+    def _get_boundedness(self):
+        # The masks are computed once for read-only bounds, which cannot be
+        # modified in place (and are then read-only too)
+        read_only = self._is_read_only()
+        if read_only and (self._boundedness is not None):
+            return self._boundedness
+        boundedness = (np.asarray(-np.inf < self.low),
+            np.asarray(np.inf > self.high))
+        if read_only:
+            for mask in boundedness:
+                mask.flags.writeable = False
+            self._boundedness = boundedness
+        return boundedness
+
+    @property
+    def bounded_below(self):
+        """Boolean array which indicates, for each coordinate, whether the
+        interval is bounded below. """
+        return self._get_boundedness()[0]
+
+    @property
+    def bounded_above(self):
+        """Boolean array which indicates, for each coordinate, whether the
+        interval is bounded above. """
+        return self._get_boundedness()[1]
+
     def is_bounded(self, manner="both"):
         below = np.all(self.bounded_below)
         above = np.all(self.bounded_above)
@@ -56,9 +94,28 @@ class Box(Space):
         else:
             raise ValueError("manner is not in {'below', 'above', 'both'}")
 
-    def sample(self):
+    def _get_sampling_masks(self):
+        # Flat boolean masks of the coordinates of each interval type (or an
+        # empty tuple if all the intervals are bounded). They are only cached
+        # for read-only bounds, which cannot be modified in place
+        read_only = self._is_read_only()
+        if read_only and (self._sampling_masks is not None):
+            return self._sampling_masks
+        below, above = self.bounded_below, self.bounded_above
+        if np.all(below) and np.all(above):
+            masks = ()
+        else:
+            below, above = below.ravel(), above.ravel()
+            masks = (~below & ~above, below & ~above, ~below & above,
+                below & above)
+        if read_only:
+            self._sampling_masks = masks
+        return masks
+
+    def sample(self, n=None):
         """
-        Generates a single random sample inside of the Box. 
+        Generates a single random sample inside of the Box, or a batch of `n`
+        samples (with shape `(n,) + self.shape`) if `n` is not `None`.
 
         In creating a sample of the box, each coordinate is sampled according to
         the form of the interval:
@@ -68,38 +125,74 @@ class Box(Space):
         * (-oo, b] : shifted negative exponential distribution
         * (-oo, oo) : normal distribution
         """
+        num_samples = 1 if n is None else n
+        shape = self.shape if n is None else (n,) + self.shape
         high = self.high if self.dtype.kind == 'f' \
                 else self.high.astype('int64') + 1
-        sample = np.empty(self.shape)
-
-        # Masking arrays which classify the coordinates according to interval
-        # type
-        unbounded   = ~self.bounded_below & ~self.bounded_above
-        upp_bounded = ~self.bounded_below &  self.bounded_above
-        low_bounded =  self.bounded_below & ~self.bounded_above
-        bounded     =  self.bounded_below &  self.bounded_above
-        
+
+        masks = self._get_sampling_masks()
+        if not masks:
+            # All the intervals are bounded: the bounds are broadcast, without
+            # flattening them
+            sample = self.np_random.uniform(low=self.low, high=high,
+                size=(num_samples,) + self.shape)
+            return sample.reshape(shape).astype(self.dtype)
+
+        unbounded, low_bounded, upp_bounded, bounded = masks
+        sample = np.empty((num_samples, self.low.size))
+        low, high = self.low.ravel(), high.ravel()
 
         # Vectorized sampling by interval type
-        sample[unbounded] = self.np_random.normal(
-                size=unbounded[unbounded].shape)
+        sample[:, unbounded] = self.np_random.normal(
+                size=(num_samples, np.count_nonzero(unbounded)))
 
-        sample[low_bounded] = self.np_random.exponential(
-            size=low_bounded[low_bounded].shape) + self.low[low_bounded]
+        sample[:, low_bounded] = self.np_random.exponential(
+            size=(num_samples, np.count_nonzero(low_bounded))) + low[low_bounded]
         
-        sample[upp_bounded] = -self.np_random.exponential(
-            size=upp_bounded[upp_bounded].shape) - self.high[upp_bounded]
+        sample[:, upp_bounded] = -self.np_random.exponential(
+            size=(num_samples, np.count_nonzero(upp_bounded))) - high[upp_bounded]
         
-        sample[bounded] = self.np_random.uniform(low=self.low[bounded], 
+        sample[:, bounded] = self.np_random.uniform(low=low[bounded],
                                             high=high[bounded],
-                                            size=bounded[bounded].shape)
+                                            size=(num_samples, np.count_nonzero(bounded)))
+
+        return sample.reshape(shape).astype(self.dtype)
+
+    def _get_uniform_bounds(self):
+        # Scalar bounds, if they are identical for each coordinate, used by the
+        # fast path of `contains`. They are only cached for read-only bounds,
+        # which cannot be modified in place
+        if not self._is_read_only():
+            return None
+        if self._uniform_bounds is None:
+            if self.low.size == 0:
+                self._uniform_bounds = ()
+                return self._uniform_bounds
+            low, high = self.low.flat[0], self.high.flat[0]
+            uniform = np.all(self.low == low) and np.all(self.high == high)
+            self._uniform_bounds = (low, high) if uniform else ()
+        return self._uniform_bounds
 
-        return sample.astype(self.dtype)
-        
     def contains(self, x):
         if isinstance(x, list):
             x = np.array(x)  # Promote list to array for contains check
-        return x.shape == self.shape and np.all(x >= self.low) and np.all(x <= self.high)
+        if x.shape != self.shape:
+            return False
+        if x.size == 1:
+            # Fast path for a single coordinate
+            return bool(self.low.item() <= x.item() <= self.high.item())
+        bounds = self._get_uniform_bounds()
+        if bounds:
+            # Fast path: the bounds are the same for each coordinate
+            return bool(x.min() >= bounds[0] and x.max() <= bounds[1])
+        return bool((x >= self.low).all() and (x <= self.high).all())
+
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if x.ndim == 0 or x.shape[1:] != self.shape:
+            return np.zeros((_batch_size(x),), dtype=np.bool_)
+        valid = (x >= self.low) & (x <= self.high)
+        return valid.reshape((x.shape[0], -1)).all(axis=1)
 
     def to_jsonable(self, sample_n):
         return np.array(sample_n).tolist()
@@ -110,5 +203,15 @@ class Box(Space):
     def __repr__(self):
         return "Box" + str(self.shape)
 
-    def __eq__(self, other):
-        return isinstance(other, Box) and (self.shape == other.shape) and np.allclose(self.low, other.low) and np.allclose(self.high, other.high)
+    def _is_read_only(self):
+        return not (self.low.flags.writeable or self.high.flags.writeable)
+
+    def _set_read_only(self):
+        self.low.flags.writeable = self.high.flags.writeable = False
+
+    def _update_content_hash(self, hasher):
+        hasher.update('Box{}{}'.format(self.shape, self.dtype.str).encode('ascii'))
+        for bound in (self.low, self.high):
+            if self.dtype.kind == 'f':
+                bound = bound + self.dtype.type(0)  # -0. and 0. have the same hash
+            hasher.update(np.ascontiguousarray(bound).tobytes())
@@ -1,5 +1,6 @@
 from collections import OrderedDict
-from .space import Space
+import numpy as np
+from .space import Space, _all_masks, _batch_size
 
 
 class Dict(Space):
@@ -47,8 +48,8 @@ class Dict(Space):
     def seed(self, seed=None):
         [space.seed(seed) for space in self.spaces.values()]
 
-    def sample(self):
-        return OrderedDict([(k, space.sample()) for k, space in self.spaces.items()])
+    def sample(self, n=None):
+        return OrderedDict([(k, space.sample(n)) for k, space in self.spaces.items()])
 
     def contains(self, x):
         if not isinstance(x, dict) or len(x) != len(self.spaces):
@@ -60,6 +61,13 @@ class Dict(Space):
                 return False
         return True
 
+    def contains_batch(self, x):
+        n = _batch_size(x)
+        if not isinstance(x, dict) or set(x.keys()) != set(self.spaces.keys()):
+            return np.zeros((n,), dtype=np.bool_)
+        return _all_masks([space.contains_batch(x[k])
+            for (k, space) in self.spaces.items()], n)
+
     def __getitem__(self, key):
         return self.spaces[key]
 
@@ -83,5 +91,10 @@ class Dict(Space):
             ret.append(entry)
         return ret
 
-    def __eq__(self, other):
-        return isinstance(other, Dict) and self.spaces == other.spaces
+    def _update_content_hash(self, hasher):
+        hasher.update('Dict({})'.format(len(self.spaces)).encode('ascii'))
+        for key, space in self.spaces.items():
+            content_hash = space.content_hash
+            if content_hash is None:
+                return NotImplemented
+            hasher.update('{!r}:{}'.format(key, content_hash).encode('utf-8'))
@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _batch_size
 
 
 class Discrete(Space):
@@ -15,8 +15,8 @@ class Discrete(Space):
         self.n = n
         super(Discrete, self).__init__((), np.int64)
 
-    def sample(self):
-        return self.np_random.randint(self.n)
+    def sample(self, n=None):
+        return self.np_random.randint(self.n, size=n)
 
     def contains(self, x):
         if isinstance(x, int):
@@ -27,8 +27,14 @@ class Discrete(Space):
             return False
         return as_int >= 0 and as_int < self.n
 
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if x.dtype.kind not in 'iu' or x.ndim != 1:
+            return np.zeros((_batch_size(x),), dtype=np.bool_)
+        return (x >= 0) & (x < self.n)
+
     def __repr__(self):
         return "Discrete(%d)" % self.n
 
-    def __eq__(self, other):
-        return isinstance(other, Discrete) and self.n == other.n
+    def _update_content_hash(self, hasher):
+        hasher.update('Discrete({}){}'.format(int(self.n), self.dtype.str).encode('ascii'))
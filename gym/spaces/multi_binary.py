@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _batch_size
 
 
 class MultiBinary(Space):
@@ -7,14 +7,21 @@ class MultiBinary(Space):
         self.n = n
         super(MultiBinary, self).__init__((self.n,), np.int8)
 
-    def sample(self):
-        return self.np_random.randint(low=0, high=2, size=self.n, dtype=self.dtype)
+    def sample(self, n=None):
+        size = self.n if n is None else (n, self.n)
+        return self.np_random.randint(low=0, high=2, size=size, dtype=self.dtype)
 
     def contains(self, x):
         if isinstance(x, list):
             x = np.array(x)  # Promote list to array for contains check
         return ((x==0) | (x==1)).all()
 
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if x.ndim == 0 or x.shape[1:] != self.shape:
+            return np.zeros((_batch_size(x),), dtype=np.bool_)
+        return ((x==0) | (x==1)).reshape((x.shape[0], -1)).all(axis=1)
+
     def to_jsonable(self, sample_n):
         return np.array(sample_n).tolist()
 
@@ -24,5 +31,5 @@ class MultiBinary(Space):
     def __repr__(self):
         return "MultiBinary({})".format(self.n)
 
-    def __eq__(self, other):
-        return isinstance(other, MultiBinary) and self.n == other.n
+    def _update_content_hash(self, hasher):
+        hasher.update('MultiBinary({}){}'.format(self.n, self.dtype.str).encode('ascii'))
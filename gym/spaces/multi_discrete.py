@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _batch_size
 
 
 class MultiDiscrete(Space):
@@ -28,12 +28,16 @@ class MultiDiscrete(Space):
         nvec: vector of counts of each categorical variable
         """
         assert (np.array(nvec) > 0).all(), 'nvec (counts) have to be positive'
-        self.nvec = np.asarray(nvec, dtype=np.int64)
+        nvec = np.asarray(nvec)
+        # The counts are read-only, so the content hash is computed once
+        self.nvec = nvec.astype(np.int64, copy=nvec.flags.writeable)
+        self._set_read_only()
 
         super(MultiDiscrete, self).__init__(self.nvec.shape, np.int64)
 
-    def sample(self):
-        return (self.np_random.random_sample(self.nvec.shape)*self.nvec).astype(self.dtype)
+    def sample(self, n=None):
+        shape = self.nvec.shape if n is None else (n,) + self.nvec.shape
+        return (self.np_random.random_sample(shape)*self.nvec).astype(self.dtype)
 
     def contains(self, x):
         if isinstance(x, list):
@@ -42,6 +46,13 @@ class MultiDiscrete(Space):
         # is within correct bounds for space dtype (even though x does not have to be unsigned)
         return (0 <= x).all() and (x < self.nvec).all()
 
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if x.ndim == 0 or x.shape[1:] != self.shape:
+            return np.zeros((_batch_size(x),), dtype=np.bool_)
+        valid = (0 <= x) & (x < self.nvec)
+        return valid.reshape((x.shape[0], -1)).all(axis=1)
+
     def to_jsonable(self, sample_n):
         return [sample.tolist() for sample in sample_n]
 
@@ -51,5 +62,12 @@ class MultiDiscrete(Space):
     def __repr__(self):
         return "MultiDiscrete({})".format(self.nvec)
 
-    def __eq__(self, other):
-        return isinstance(other, MultiDiscrete) and np.all(self.nvec == other.nvec)
+    def _is_read_only(self):
+        return not self.nvec.flags.writeable
+
+    def _set_read_only(self):
+        self.nvec.flags.writeable = False
+
+    def _update_content_hash(self, hasher):
+        hasher.update('MultiDiscrete{}{}'.format(self.shape, self.dtype.str).encode('ascii'))
+        hasher.update(np.ascontiguousarray(self.nvec, dtype=np.int64).tobytes())
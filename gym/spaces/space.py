@@ -1,3 +1,5 @@
+import hashlib
+
 from gym.utils import seeding
 
 
@@ -10,12 +12,29 @@ class Space(object):
         import numpy as np  # takes about 300-400ms to import, so we load lazily
         self.shape = None if shape is None else tuple(shape)
         self.dtype = None if dtype is None else np.dtype(dtype)
-        self.np_random = None
-        self.seed()
+        self._np_random = None
+        self._content_hash = None
+
+    @property
+    def np_random(self):
+        """The PRNG of this space. It is created lazily, on the first call to
+        `sample` (or to `seed`), since seeding from the operating system's
+        randomness source is expensive, and most spaces are never sampled."""
+        if self._np_random is None:
+            self._np_random, _ = seeding.np_random()
+        return self._np_random
+
+    @np_random.setter
+    def np_random(self, value):
+        self._np_random = value
 
-    def sample(self):
+    def sample(self, n=None):
         """Randomly sample an element of this space. Can be 
-        uniform or non-uniform sampling based on boundedness of space."""
+        uniform or non-uniform sampling based on boundedness of space.
+
+        If `n` is not `None`, draw `n` elements at once and return them as a
+        batch: a numpy array with a leading dimension of size `n` (or a nested
+        structure of such arrays for `Tuple` and `Dict` spaces)."""
         raise NotImplementedError
 
     def seed(self, seed=None):
@@ -30,9 +49,80 @@ class Space(object):
         """
         raise NotImplementedError
 
+    def contains_batch(self, x):
+        """
+        Return a boolean numpy array of shape (n,) specifying, for each
+        element of the batch x (e.g. from `sample(n)`), if it is a valid
+        member of this space
+        """
+        import numpy as np
+        return np.array([self.contains(item) for item in x], dtype=np.bool_)
+
     def __contains__(self, x):
         return self.contains(x)
 
+    @property
+    def content_hash(self):
+        """Stable hash (as a hexadecimal string) of the content of this space,
+        e.g. its shape, dtype and bounds, used for equality and hashing. It is
+        the same across processes, and `None` for the spaces not implementing
+        `_update_content_hash`. It is computed once for the spaces whose
+        content is read-only (e.g. the bounds of `Box`, which are read-only
+        arrays), and from the current content on each call otherwise (e.g. if
+        the bounds are made writeable again)."""
+        read_only = self._is_read_only()
+        content_hash = getattr(self, '_content_hash', None)
+        if (content_hash is None) or (not read_only):
+            hasher = hashlib.sha1()
+            if self._update_content_hash(hasher) is NotImplemented:
+                return None
+            content_hash = hasher.hexdigest()
+            if read_only:
+                self._content_hash = content_hash
+        return content_hash
+
+    def _is_read_only(self):
+        """Whether the content of this space cannot be modified in place, so
+        its content hash can be cached. """
+        return False
+
+    def _set_read_only(self):
+        """Make the content of this space read-only (e.g. its arrays). """
+        pass
+
+    def _update_content_hash(self, hasher):
+        """Feed the content of this space to `hasher` (a `hashlib` object). """
+        return NotImplemented
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Space):
+            return False
+        content_hash = self.content_hash
+        return (content_hash is not None) and (content_hash == other.content_hash)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        content_hash = self.content_hash
+        if content_hash is None:
+            return id(self) >> 4
+        return int(content_hash[:15], 16)
+
+    def __setstate__(self, state):
+        # Spaces pickled before the PRNG was created lazily store it as
+        # `np_random` in their state
+        if 'np_random' in state:
+            state = dict(state)
+            state['_np_random'] = state.pop('np_random')
+        self.__dict__.update(state)
+        # The arrays of a copy are writeable again: make them read-only
+        self._set_read_only()
+        if not self._is_read_only():
+            self._content_hash = None
+
     def to_jsonable(self, sample_n):
         """Convert a batch of samples from this space to a JSONable data type."""
         # By default, assume identity is JSONable
@@ -42,3 +132,27 @@ class Space(object):
         """Convert a JSONable data type to a batch of samples from this space."""
         # By default, assume identity is JSONable
         return sample_n
+
+
+def _batch_size(x):
+    """Number of samples in the (possibly nested, and possibly malformed)
+    batch `x`, i.e. the length of its first leaf, or 0 if it has none."""
+    if isinstance(x, dict):
+        x = list(x.values())
+        return _batch_size(x[0]) if x else 0
+    if isinstance(x, tuple):
+        return _batch_size(x[0]) if x else 0
+    try:
+        return len(x)
+    except TypeError:
+        return 0
+
+
+def _all_masks(masks, n):
+    """Combine the masks of `contains_batch` of the subspaces of a composite
+    space, for a batch of `n` samples (all `False` if their lengths differ,
+    i.e. if the batch is malformed)."""
+    import numpy as np
+    if any(mask.shape != (n,) for mask in masks):
+        return np.zeros((n,), dtype=np.bool_)
+    return np.logical_and.reduce(masks, axis=0) if masks else np.ones((n,), dtype=np.bool_)
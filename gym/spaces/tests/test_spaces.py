@@ -1,4 +1,5 @@
 import json  # note: ujson fails this test due to float equality
+import pickle
 from copy import copy
 
 import numpy as np
@@ -73,6 +74,76 @@ def test_inequality(spaces):
     assert space1 != space2, "Expected {} != {}".format(space1, space2)
 
 
+@pytest.mark.parametrize("make_space", [
+    lambda: Discrete(3),
+    lambda: Box(low=-1., high=np.array([1., 2.]).max(), shape=(2, 2)),
+    lambda: Box(low=np.array([-0., 0.]), high=np.array([1., np.inf]), dtype=np.float32),
+    lambda: MultiDiscrete([2, 2, 100]),
+    lambda: MultiBinary(10),
+    lambda: Tuple([Discrete(5), Box(low=0, high=255, shape=(4, 4), dtype=np.uint8)]),
+    lambda: Dict({"position": Discrete(5),
+          "velocity": Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)}),
+])
+def test_content_hash(make_space):
+    space1, space2 = make_space(), make_space()
+    assert space1.content_hash is not None
+    assert space1.content_hash == space2.content_hash
+    assert hash(space1) == hash(space2)
+    cache = {space1: 'cached'}
+    assert cache[space2] == 'cached'
+
+    space3 = pickle.loads(pickle.dumps(space1))
+    space3._content_hash = None
+    assert space3.content_hash == space1.content_hash
+
+
+def test_content_hash_modified_in_place():
+    # The bounds are read-only, unless they are explicitly made writeable
+    space = Box(low=-1., high=1., shape=(3,), dtype=np.float32)
+    with pytest.raises(ValueError):
+        space.low[0] = -2.
+    content_hash = space.content_hash
+    space.low.flags.writeable = True
+    space.low[0] = -2.
+    assert space.content_hash != content_hash
+    assert space != Box(low=-1., high=1., shape=(3,), dtype=np.float32)
+    assert space.contains(np.array([-1.5, 0., 0.], dtype=np.float32))
+
+    # The hash of read-only spaces is cached
+    low, high = np.zeros((3,), dtype=np.float32), np.ones((3,), dtype=np.float32)
+    low.flags.writeable = high.flags.writeable = False
+    space = Box(low=low, high=high, dtype=np.float32)
+    assert space.content_hash == space._content_hash
+    assert pickle.loads(pickle.dumps(space)) == space
+
+
+@pytest.mark.parametrize("make_space", [
+    lambda array: Box(low=-array, high=array, dtype=np.float64),
+    lambda array: MultiDiscrete(array.astype(np.int64)),
+])
+def test_content_hash_read_only(make_space):
+    array = np.array([1., 2., 3.])
+    space = make_space(array)
+    # The arrays given to the space are copied, and are left writeable
+    assert array.flags.writeable
+    assert space._is_read_only()
+    assert space.content_hash == space._content_hash
+    # The copies are read-only too
+    for other in (pickle.loads(pickle.dumps(space)), copy(space)):
+        assert other._is_read_only()
+        assert other == space and hash(other) == hash(space)
+
+
+def test_content_hash_inequality():
+    assert Box(low=0., high=1., shape=(2,), dtype=np.float32) != \
+        Box(low=0., high=1., shape=(2,), dtype=np.float64)
+    assert Box(low=0., high=1., shape=(2,)) != Box(low=0., high=1., shape=(1, 2))
+    assert Box(low=-0., high=1., shape=(2,)) == Box(low=0., high=1., shape=(2,))
+    assert Tuple([Discrete(2), Discrete(3)]) != Tuple([Discrete(3), Discrete(2)])
+    assert Dict({"a": Discrete(2)}) != Dict({"b": Discrete(2)})
+    assert len(set([Discrete(2), Discrete(2), MultiBinary(2), MultiDiscrete([2])])) == 3
+
+
 @pytest.mark.parametrize("space", [
     Discrete(5),
     Box(low=0, high=255, shape=(2,), dtype='uint8'),
@@ -100,6 +171,152 @@ def test_sample(space):
         raise NotImplementedError
     np.testing.assert_allclose(expected_mean, samples.mean(), atol=3.0 * samples.std())
 
+@pytest.mark.parametrize("space", [
+    Discrete(5),
+    Box(low=0, high=255, shape=(2,), dtype='uint8'),
+    Box(low=-np.inf, high=np.inf, shape=(3,3)),
+    Box(low=np.array([-np.inf, 0., -1.]), high=np.array([0., np.inf, 1.]), dtype=np.float32),
+    Box(low=np.array(-1.), high=np.array(1.), dtype=np.float64),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(6),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"position": Discrete(5),
+          "velocity": Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)}),
+])
+def test_sample_batch(space):
+    space.seed(0)
+    batch = space.sample(7)
+
+    def check(batch, space):
+        if isinstance(space, Tuple):
+            assert isinstance(batch, tuple) and len(batch) == len(space.spaces)
+            for subbatch, subspace in zip(batch, space.spaces):
+                check(subbatch, subspace)
+        elif isinstance(space, Dict):
+            assert list(batch.keys()) == list(space.spaces.keys())
+            for key, subspace in space.spaces.items():
+                check(batch[key], subspace)
+        else:
+            assert isinstance(batch, np.ndarray)
+            assert batch.shape == (7,) + space.shape
+            assert batch.dtype == space.dtype
+            assert all(space.contains(sample) for sample in batch)
+    check(batch, space)
+
+
+def test_box_boundedness_cached():
+    low = np.array([-np.inf, 0., -1.], dtype=np.float32)
+    high = np.array([0., np.inf, 1.], dtype=np.float32)
+    low.flags.writeable = high.flags.writeable = False
+    space = Box(low=low, high=high, dtype=np.float32)
+    assert space.bounded_below is space.bounded_below
+    assert np.array_equal(space.bounded_below, [False, True, True])
+    assert np.array_equal(space.bounded_above, [True, False, True])
+    assert not space.bounded_below.flags.writeable
+
+    # Scalar bounds give 0-d masks
+    space = Box(low=low[2:].reshape(()), high=high[2:].reshape(()), dtype=np.float32)
+    assert space.bounded_below.shape == () and space.is_bounded()
+
+    # The masks of bounds made writeable again follow the changes in place
+    space = Box(low=low.copy(), high=high.copy(), dtype=np.float32)
+    assert np.array_equal(space.bounded_below, [False, True, True])
+    space.low.flags.writeable = True
+    space.low[0] = -1.
+    assert np.all(space.bounded_below)
+
+
+def test_box_sample_bounds_modified_in_place():
+    space = Box(low=np.array([0., -np.inf]), high=np.array([1., 1.]), dtype=np.float64)
+    space.seed(0)
+    assert np.all(space.sample(100)[:, 0] <= 1.)
+    space.low.flags.writeable = space.high.flags.writeable = True
+    space.high[0] = np.inf
+    space.low[1], space.high[1] = 10., 20.
+    assert np.any(space.sample(100)[:, 0] > 1.)
+    assert np.all(space.sample(100)[:, 1] >= 10.)
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(5),
+    Box(low=0, high=100, shape=(2,), dtype='uint8'),
+    Box(low=np.array([-np.inf, 0., -1.]), high=np.array([0., np.inf, 1.]), dtype=np.float32),
+    Box(low=np.array(-1.), high=np.array(1.), dtype=np.float64),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(6),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"position": Discrete(5),
+          "velocity": Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)}),
+])
+def test_contains_batch(space):
+    space.seed(0)
+    batch = space.sample(7)
+    mask = space.contains_batch(batch)
+    assert isinstance(mask, np.ndarray) and mask.dtype == np.bool_
+    assert mask.shape == (7,)
+    assert np.all(mask)
+
+    def corrupt(batch, space):
+        # Make the third sample of the batch invalid
+        if isinstance(space, Tuple):
+            return (corrupt(batch[0], space.spaces[0]),) + tuple(batch[1:])
+        elif isinstance(space, Dict):
+            batch = dict(batch)
+            batch["position"] = corrupt(batch["position"], space.spaces["position"])
+            return batch
+        batch = batch.copy()
+        if isinstance(space, Box):
+            high, low = space.high.flat[-1], space.low.flat[-1]
+            batch.reshape((7, -1))[2, -1] = high + 1 if np.isfinite(high) else low - 1
+        elif isinstance(space, Discrete):
+            batch[2] = space.n
+        elif isinstance(space, MultiDiscrete):
+            batch[2, -1] = space.nvec[-1]
+        else:
+            batch[2, 0] = 2
+        return batch
+    mask = space.contains_batch(corrupt(batch, space))
+    assert np.array_equal(mask, np.arange(7) != 2)
+
+
+def test_contains_batch_wrong_shape():
+    space = Box(low=0, high=1, shape=(3,), dtype=np.float32)
+    mask = space.contains_batch(np.zeros((4, 2), dtype=np.float32))
+    assert not np.any(mask) and mask.shape == (4,)
+
+
+def test_contains_batch_unsigned():
+    space = Discrete(5)
+    mask = space.contains_batch(np.array([0, 4, 5], dtype=np.uint8))
+    assert np.array_equal(mask, [True, True, False])
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(5),
+    Box(low=-1., high=1., shape=(), dtype=np.float32),
+    MultiDiscrete([2, 3]),
+    MultiBinary(2),
+])
+def test_contains_batch_scalar(space):
+    mask = space.contains_batch(np.zeros((), dtype=space.dtype))
+    assert isinstance(mask, np.ndarray) and mask.dtype == np.bool_
+    assert mask.shape == (0,)
+
+
+@pytest.mark.parametrize("space,batch", [
+    (Tuple([Discrete(5), Discrete(2)]), (np.zeros(4, dtype=np.int64),)),
+    (Tuple([Discrete(5), Discrete(2)]), [np.zeros(4, dtype=np.int64)] * 3),
+    (Tuple([Discrete(5), Discrete(2)]), (np.zeros(4, dtype=np.int64), np.zeros(3, dtype=np.int64))),
+    (Dict({"a": Discrete(5), "b": Discrete(2)}), {"a": np.zeros(4, dtype=np.int64)}),
+    (Dict({"a": Discrete(5), "b": Discrete(2)}), {"a": np.zeros(4, dtype=np.int64), "b": np.zeros(3, dtype=np.int64)}),
+    (Dict({"a": Discrete(5)}), (np.zeros(4, dtype=np.int64),)),
+])
+def test_contains_batch_malformed(space, batch):
+    mask = space.contains_batch(batch)
+    assert isinstance(mask, np.ndarray) and mask.dtype == np.bool_
+    assert not np.any(mask) and mask.shape == (4,)
+
+
 @pytest.mark.parametrize("spaces", [
     (Discrete(5), MultiBinary(5)),
     (Box(low=np.array([-10, 0]), high=np.array([10,10]), dtype=np.float32), MultiDiscrete([2, 2, 8])),
@@ -125,3 +342,35 @@ def test_class_inequality(spaces):
 def test_bad_space_calls(space_fn):
     with pytest.raises(AssertionError):
         space_fn()
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(3),
+    Box(low=0., high=np.inf, shape=(2, 2)),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(10),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"position": Discrete(5),
+          "velocity": Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)}),
+])
+def test_lazy_seeding(space):
+    def assert_not_seeded(space):
+        assert space._np_random is None
+        if isinstance(space, Tuple):
+            [assert_not_seeded(subspace) for subspace in space.spaces]
+        elif isinstance(space, Dict):
+            [assert_not_seeded(subspace) for subspace in space.spaces.values()]
+    assert_not_seeded(space)
+
+    space.seed(0)
+    sample_1 = space.sample()
+    space.seed(0)
+    sample_2 = space.sample()
+    assert space.to_jsonable([sample_1]) == space.to_jsonable([sample_2])
+
+    # Spaces pickled with an eagerly created PRNG are still supported
+    state = dict(space.__dict__)
+    state['np_random'] = state.pop('_np_random')
+    unpickled = copy(space)
+    unpickled.__setstate__(state)
+    assert unpickled == space
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from gym.spaces import (Tuple, Box, Discrete, MultiDiscrete, MultiBinary, Dict,
+                        flatdim, flatten, unflatten, FlattenPlan, one_hot_dim,
+                        one_hot_encode, one_hot_decode)
+
+spaces = [
+    Discrete(3),
+    Box(low=0., high=np.inf, shape=(2, 2)),
+    Box(low=0, high=255, shape=(4, 4, 3), dtype=np.uint8),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(10),
+    Tuple([Discrete(5), Discrete(10)]),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"position": Discrete(5),
+          "velocity": Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)}),
+    Dict({"sensors": Dict({"camera": Box(low=0, high=1, shape=(3, 3)),
+                           "status": Tuple((MultiBinary(4), Discrete(7)))}),
+          "controller": MultiDiscrete([5, 2, 2])}),
+]
+
+
+def assert_nested_equal(lhs, rhs):
+    if isinstance(rhs, dict):
+        assert isinstance(lhs, dict) and set(lhs.keys()) == set(rhs.keys())
+        for key in rhs.keys():
+            assert_nested_equal(lhs[key], rhs[key])
+    elif isinstance(rhs, tuple):
+        assert isinstance(lhs, tuple) and len(lhs) == len(rhs)
+        for lhs_, rhs_ in zip(lhs, rhs):
+            assert_nested_equal(lhs_, rhs_)
+    else:
+        assert np.all(np.asarray(lhs) == np.asarray(rhs))
+
+
+@pytest.mark.parametrize("space", spaces)
+def test_flatten_plan(space):
+    plan = FlattenPlan(space)
+    assert plan.flatdim == flatdim(space)
+
+    sample = space.sample()
+    flattened = plan.flatten(sample)
+    expected = flatten(space, sample)
+    assert flattened.shape == (flatdim(space),)
+    assert flattened.dtype == expected.dtype
+    assert np.all(flattened == expected)
+    assert_nested_equal(plan.unflatten(flattened), unflatten(space, expected))
+    assert_nested_equal(plan.unflatten(flattened), sample)
+
+    out = np.empty((flatdim(space),), dtype=plan.dtype)
+    assert plan.flatten(sample, out=out) is out
+
+
+@pytest.mark.parametrize("space", spaces)
+def test_flatten_plan_batch(space):
+    plan = FlattenPlan(space)
+    space.seed(0)
+    batch = space.sample(8)
+    flattened = plan.flatten_batch(batch)
+    assert flattened.shape == (8, flatdim(space))
+
+    out = np.zeros((8, flatdim(space)), dtype=plan.dtype)
+    assert plan.flatten_batch(batch, out=out) is out
+    assert np.all(out == flattened)
+
+    unflattened = plan.unflatten_batch(flattened)
+    assert_nested_equal(unflattened, batch)
+    for i in range(8):
+        assert np.all(flattened[i] == plan.flatten(plan.unflatten(flattened[i])))
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(500),
+    MultiDiscrete([2, 2, 100]),
+    MultiDiscrete([[3, 3], [3, 3]]),
+])
+def test_one_hot(space):
+    space.seed(0)
+    batch = space.sample(16)
+    encoded = one_hot_encode(space, batch)
+    assert encoded.shape == (16, one_hot_dim(space))
+    assert encoded.dtype == np.float32
+    nvec = [space.n] if isinstance(space, Discrete) else space.nvec.ravel()
+    assert np.all(encoded.sum(axis=1) == len(nvec))
+
+    # Same encoding as `flatten` for `Discrete` spaces
+    if isinstance(space, Discrete):
+        assert np.array_equal(encoded[3], flatten(space, batch[3]))
+
+    # Encode and decode into preallocated buffers
+    out = np.full((16, one_hot_dim(space)), 7, dtype=np.uint8)
+    assert one_hot_encode(space, batch, out=out) is out
+    assert np.array_equal(out, encoded)
+    decoded = np.empty_like(batch)
+    assert one_hot_decode(space, out, out=decoded) is decoded
+    assert np.array_equal(decoded, batch)
+    assert np.array_equal(one_hot_decode(space, encoded), batch)
@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _all_masks, _batch_size
 
 
 class Tuple(Space):
@@ -18,8 +18,8 @@ class Tuple(Space):
     def seed(self, seed=None):
         [space.seed(seed) for space in self.spaces]
 
-    def sample(self):
-        return tuple([space.sample() for space in self.spaces])
+    def sample(self, n=None):
+        return tuple([space.sample(n) for space in self.spaces])
 
     def contains(self, x):
         if isinstance(x, list):
@@ -27,6 +27,15 @@ class Tuple(Space):
         return isinstance(x, tuple) and len(x) == len(self.spaces) and all(
             space.contains(part) for (space,part) in zip(self.spaces,x))
 
+    def contains_batch(self, x):
+        if isinstance(x, list):
+            x = tuple(x)
+        n = _batch_size(x)
+        if not isinstance(x, tuple) or len(x) != len(self.spaces):
+            return np.zeros((n,), dtype=np.bool_)
+        return _all_masks([space.contains_batch(part)
+            for (space, part) in zip(self.spaces, x)], n)
+
     def __repr__(self):
         return "Tuple(" + ", ". join([str(s) for s in self.spaces]) + ")"
 
@@ -44,5 +53,10 @@ class Tuple(Space):
     def __len__(self):
         return len(self.spaces)
       
-    def __eq__(self, other):
-        return isinstance(other, Tuple) and self.spaces == other.spaces
+    def _update_content_hash(self, hasher):
+        hasher.update('Tuple({})'.format(len(self.spaces)).encode('ascii'))
+        for space in self.spaces:
+            content_hash = space.content_hash
+            if content_hash is None:
+                return NotImplemented
+            hasher.update(content_hash.encode('ascii'))
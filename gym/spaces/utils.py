@@ -1,4 +1,5 @@
 import numpy as np
+from collections import OrderedDict
 
 from gym.spaces import Box
 from gym.spaces import Discrete
@@ -67,3 +68,225 @@ def unflatten(space, x):
         return np.asarray(x).reshape(space.shape)
     else:
         raise NotImplementedError
+
+
+def one_hot_dim(space):
+    """Number of columns of the one-hot encoding of a `Discrete` or
+    `MultiDiscrete` space (`n`, or the sum of `nvec`)."""
+    if isinstance(space, Discrete):
+        return int(space.n)
+    elif isinstance(space, MultiDiscrete):
+        return int(np.sum(space.nvec))
+    else:
+        raise NotImplementedError
+
+
+def one_hot_encode(space, x, out=None):
+    """One-hot encode a batch of samples of a `Discrete` or `MultiDiscrete`
+    space, in a single vectorized pass.
+
+    Args:
+        space (Discrete or MultiDiscrete): the space of the samples
+        x (np.ndarray): batch of `n` samples, of shape `(n,) + space.shape`
+        out (Optional[np.ndarray]): preallocated output array, of shape
+            `(n, one_hot_dim(space))`. If `None`, a `np.float32` array is created.
+
+    Returns:
+        out (np.ndarray): the one-hot encoding of the batch. For `MultiDiscrete`
+            spaces, the one-hot encodings of the components are concatenated.
+    """
+    x = np.asarray(x)
+    n = x.shape[0]
+    if out is None:
+        out = np.zeros((n, one_hot_dim(space)), dtype=np.float32)
+    else:
+        out[...] = 0
+    if isinstance(space, Discrete):
+        out[np.arange(n), x] = 1
+    elif isinstance(space, MultiDiscrete):
+        nvec = space.nvec.ravel()
+        offsets = np.cumsum(nvec) - nvec
+        out[np.arange(n)[:, None], offsets + x.reshape((n, nvec.size))] = 1
+    else:
+        raise NotImplementedError
+    return out
+
+
+def one_hot_decode(space, x, out=None):
+    """Decode a batch of one-hot encodings (from `one_hot_encode`) back into a
+    batch of samples of a `Discrete` or `MultiDiscrete` space.
+
+    Args:
+        space (Discrete or MultiDiscrete): the space of the samples
+        x (np.ndarray): one-hot encodings, of shape `(n, one_hot_dim(space))`
+        out (Optional[np.ndarray]): preallocated output array, of shape
+            `(n,) + space.shape`. If `None`, an array is created.
+
+    Returns:
+        out (np.ndarray): the batch of samples
+    """
+    x = np.asarray(x)
+    n = x.shape[0]
+    if out is None:
+        out = np.empty((n,) + space.shape, dtype=space.dtype)
+    if isinstance(space, Discrete):
+        out[...] = np.argmax(x, axis=1)
+    elif isinstance(space, MultiDiscrete):
+        nvec = space.nvec.ravel()
+        flat_out = out.reshape((n, nvec.size))
+        if np.all(nvec == nvec[0]):
+            flat_out[...] = np.argmax(x.reshape((n, nvec.size, nvec[0])), axis=2)
+        else:
+            stops = np.cumsum(nvec)
+            for i, (start, stop) in enumerate(zip(stops - nvec, stops)):
+                flat_out[:, i] = np.argmax(x[:, start:stop], axis=1)
+        if not np.shares_memory(flat_out, out):
+            out[...] = flat_out.reshape(out.shape)
+    else:
+        raise NotImplementedError
+    return out
+
+
+# Instructions of the program rebuilding a nested sample from its leaves
+_LEAF, _TUPLE, _DICT = 0, 1, 2
+
+
+class FlattenPlan(object):
+    """Precompiled version of `flatten` and `unflatten` for a given space.
+
+    The offsets, sizes and types of the leaves of the space are computed once,
+    when the plan is created. The plan then flattens (and unflattens) samples
+    or whole batches of samples without walking the space again, writing into
+    a preallocated buffer if one is given. The flat representation is the same
+    as the one of `flatten`: `Box` leaves are raveled, `Discrete` leaves are
+    one-hot encoded, and `MultiBinary` / `MultiDiscrete` leaves are raveled.
+
+    Batches are nested structures of arrays with a leading batch dimension, as
+    sampled with `space.sample(n)`, or as returned by a vectorized environment.
+
+    Example::
+
+        >>> space = Dict({'position': Discrete(3),
+        ...     'velocity': Box(low=-1., high=1., shape=(2,), dtype=np.float32)})
+        >>> plan = FlattenPlan(space)
+        >>> plan.flatdim
+        5
+        >>> plan.flatten_batch(space.sample(32)).shape
+        (32, 5)
+
+    Args:
+        space (Space): the space to flatten
+        dtype (Optional[dtype]): data type of the flattened samples. If `None`,
+            this is the same data type as the one returned by `flatten`.
+    """
+    def __init__(self, space, dtype=None):
+        self.space = space
+        self._leaves = []
+        self._program = []
+        self._compile(space, ())
+        self.flatdim = sum(stop - start for (_, _, start, stop, _) in self._leaves)
+        if dtype is None:
+            dtypes = [np.float32 if kind in ('box', 'discrete') else leaf.dtype
+                for (_, kind, _, _, leaf) in self._leaves]
+            dtype = np.result_type(*dtypes) if dtypes else np.float32
+        self.dtype = np.dtype(dtype)
+        self._rows = np.arange(0)
+
+    def _compile(self, space, path):
+        if isinstance(space, Tuple):
+            for i, subspace in enumerate(space.spaces):
+                self._compile(subspace, path + (i,))
+            self._program.append((_TUPLE, len(space.spaces)))
+            return
+        elif isinstance(space, Dict):
+            for key, subspace in space.spaces.items():
+                self._compile(subspace, path + (key,))
+            self._program.append((_DICT, list(space.spaces.keys())))
+            return
+        elif isinstance(space, Box):
+            kind = 'box'
+        elif isinstance(space, Discrete):
+            kind = 'discrete'
+        elif isinstance(space, (MultiBinary, MultiDiscrete)):
+            kind = 'array'
+        else:
+            raise NotImplementedError
+        start = self._leaves[-1][3] if self._leaves else 0
+        self._program.append((_LEAF, len(self._leaves)))
+        self._leaves.append((path, kind, start, start + flatdim(space), space))
+
+    def flatten(self, x, out=None):
+        """Flatten a single sample of the space into a 1D array."""
+        if out is None:
+            out = np.empty((self.flatdim,), dtype=self.dtype)
+        for path, kind, start, stop, space in self._leaves:
+            value = _get_leaf(x, path)
+            if kind == 'discrete':
+                out[start:stop] = 0
+                out[start + int(value)] = 1
+            else:
+                out[start:stop] = np.ravel(value)
+        return out
+
+    def flatten_batch(self, batch, out=None):
+        """Flatten a batch of samples of the space into a 2D array of shape
+        `(n, flatdim)`."""
+        if out is None:
+            n = len(_get_leaf(batch, self._leaves[0][0])) if self._leaves else 0
+            out = np.empty((n, self.flatdim), dtype=self.dtype)
+        n = out.shape[0]
+        for path, kind, start, stop, space in self._leaves:
+            value = np.asarray(_get_leaf(batch, path))
+            if kind == 'discrete':
+                if self._rows.shape[0] != n:
+                    self._rows = np.arange(n)
+                out[:, start:stop] = 0
+                out[self._rows, start + value] = 1
+            else:
+                out[:, start:stop] = value.reshape((n, stop - start))
+        return out
+
+    def unflatten(self, x):
+        """Unflatten a 1D array into a sample of the space."""
+        leaves = []
+        for path, kind, start, stop, space in self._leaves:
+            if kind == 'box':
+                leaves.append(np.asarray(x[start:stop], dtype=np.float32).reshape(space.shape))
+            elif kind == 'discrete':
+                leaves.append(int(np.argmax(x[start:stop])))
+            else:
+                leaves.append(np.asarray(x[start:stop]).reshape(space.shape))
+        return self._nest(leaves)
+
+    def unflatten_batch(self, x):
+        """Unflatten a 2D array of shape `(n, flatdim)` into a batch of samples
+        of the space."""
+        n, leaves = x.shape[0], []
+        for path, kind, start, stop, space in self._leaves:
+            if kind == 'box':
+                leaves.append(np.asarray(x[:, start:stop],
+                    dtype=np.float32).reshape((n,) + space.shape))
+            elif kind == 'discrete':
+                leaves.append(np.argmax(x[:, start:stop], axis=1))
+            else:
+                leaves.append(np.asarray(x[:, start:stop]).reshape((n,) + space.shape))
+        return self._nest(leaves)
+
+    def _nest(self, leaves):
+        stack = []
+        for instruction, argument in self._program:
+            if instruction == _LEAF:
+                stack.append(leaves[argument])
+            else:
+                num_items = argument if instruction == _TUPLE else len(argument)
+                items = stack[len(stack) - num_items:]
+                del stack[len(stack) - num_items:]
+                stack.append(tuple(items) if instruction == _TUPLE
+                    else OrderedDict(zip(argument, items)))
+        return stack[0]
+
+
+def _get_leaf(x, path):
+    for key in path:
+        x = x[key]
+    return x
@@ -1,4 +1,6 @@
-from gym import core
+import pytest
+
+from gym import core, spaces
 
 class ArgumentEnv(core.Env):
     calls = 0
@@ -13,3 +15,31 @@ def test_env_instantiation():
     env = ArgumentEnv('arg')
     assert env.arg == 'arg'
     assert env.calls == 1
+
+
+class ActionValidationEnv(core.Env):
+    action_space = spaces.Discrete(2)
+
+    def step(self, action):
+        self.check_action(action)
+        return 0, 0., False, {}
+
+@pytest.mark.parametrize('level,num_errors', [
+    ('full', 10), ('sampling', 2), ('off', 0)])
+def test_action_validation(level, num_errors):
+    env = ActionValidationEnv()
+    env.action_validation = level
+    env.action_validation_interval = 5
+    errors = 0
+    for _ in range(10):
+        try:
+            env.step(3)
+        except AssertionError:
+            errors += 1
+    assert errors == num_errors
+
+def test_action_validation_invalid_level():
+    env = ActionValidationEnv()
+    env.action_validation = 'partial'
+    with pytest.raises(core.error.Error):
+        env.step(0)
@@ -0,0 +1,142 @@
+"""Deterministic fingerprints of environment rollouts, used to detect
+regressions in the dynamics of the environments (see `scripts/generate_json.py`
+and `gym/envs/tests/test_envs_semantics.py`).
+"""
+import hashlib
+import multiprocessing as mp
+import sys
+
+import numpy as np
+from six import integer_types, string_types
+
+ROLLOUT_KEYS = ('observations', 'actions', 'rewards', 'dones')
+
+
+def _hash_update(hasher, x):
+    # Canonical encoding of (possibly nested) values: the bytes of a value are
+    # prefixed with its type, dtype and shape, so that different values never
+    # share the same encoding (unlike their `str` representation).
+    if isinstance(x, dict):
+        hasher.update(b'{%d' % len(x))
+        for key in sorted(x.keys()):
+            _hash_update(hasher, key)
+            _hash_update(hasher, x[key])
+        hasher.update(b'}')
+    elif isinstance(x, (tuple, list)):
+        hasher.update(b'(%d' % len(x))
+        for item in x:
+            _hash_update(hasher, item)
+        hasher.update(b')')
+    elif isinstance(x, string_types):
+        hasher.update(b's' + x.encode('utf-8') + b'\0')
+    else:
+        if isinstance(x, bool):
+            array = np.asarray(x, dtype=np.bool_)
+        elif isinstance(x, integer_types):
+            array = np.asarray(x, dtype=np.int64)
+        elif isinstance(x, float):
+            array = np.asarray(x, dtype=np.float64)
+        else:
+            array = np.asarray(x)
+        if array.dtype == object:
+            hasher.update(b'o' + repr(x).encode('utf-8') + b'\0')
+            return
+        header = '{0}{1}'.format(array.dtype.str, array.shape)
+        hasher.update(b'a' + header.encode('ascii'))
+        hasher.update(np.ascontiguousarray(array).tobytes())
+
+
+class RolloutHash(object):
+    """Incremental hash of a rollout. The observations, actions, rewards and
+    dones are streamed into separate SHA-256 hashes, so that the rollout never
+    has to be kept in memory.
+
+    Example::
+
+        >>> rollout_hash = RolloutHash()
+        >>> rollout_hash.update(observation, action, reward, done)
+        >>> observations, actions, rewards, dones = rollout_hash.hexdigests()
+    """
+    def __init__(self):
+        self._hashers = tuple(hashlib.sha256() for _ in ROLLOUT_KEYS)
+        self.num_steps = 0
+
+    def update(self, observation, action, reward, done):
+        for hasher, value in zip(self._hashers, (observation, action, reward, done)):
+            _hash_update(hasher, value)
+        self.num_steps += 1
+
+    def hexdigests(self):
+        return tuple(hasher.hexdigest() for hasher in self._hashers)
+
+
+def generate_rollout_hash(spec, num_steps=100, seed=0):
+    """Hash a rollout of random actions in an environment.
+
+    Args:
+        spec (EnvSpec or str): spec (or id) of the environment
+        num_steps (int): total number of steps in the rollout, across episodes
+        seed (int): seed of the environment and of its action space
+
+    Returns:
+        hashes (tuple of str): hashes of the observations, actions, rewards and dones
+    """
+    if isinstance(spec, string_types):
+        from gym import envs
+        spec = envs.spec(spec)
+    env = spec.make()
+    try:
+        env.seed(seed)
+        env.action_space.seed(seed)
+        rollout_hash = RolloutHash()
+        while rollout_hash.num_steps < num_steps:
+            env.reset()
+            done = False
+            while not done and rollout_hash.num_steps < num_steps:
+                action = env.action_space.sample()
+                observation, reward, done, _ = env.step(action)
+                rollout_hash.update(observation, action, reward, done)
+    finally:
+        env.close()
+    return rollout_hash.hexdigests()
+
+
+def _rollout_hash_worker(args):
+    env_id, num_steps, seed = args
+    try:
+        return env_id, generate_rollout_hash(env_id, num_steps, seed), None
+    except Exception:
+        exc_type, exc_value = sys.exc_info()[:2]
+        return env_id, None, '{0}: {1}'.format(exc_type.__name__, exc_value)
+
+
+def generate_rollout_hashes(specs, num_steps=100, seed=0, processes=None):
+    """Hash rollouts of random actions in several environments, in parallel
+    worker processes.
+
+    Args:
+        specs (list of EnvSpec or str): specs (or ids) of registered environments
+        num_steps (int): total number of steps in each rollout
+        seed (int): seed of the environments and of their action spaces
+        processes (int): number of worker processes. If `None`, the number of
+            CPUs is used. If `1`, the rollouts are run in the current process.
+
+    Returns:
+        results (dict): maps the id of each environment to a pair `(hashes,
+            error)`, where `hashes` is the tuple of hashes returned by
+            `generate_rollout_hash` (`None` if the rollout raised an exception),
+            and `error` is the error message (`None` on success).
+    """
+    tasks = [(getattr(spec, 'id', spec), num_steps, seed) for spec in specs]
+    if processes == 1 or len(tasks) <= 1:
+        results = map(_rollout_hash_worker, tasks)
+        return dict((env_id, (hashes, error)) for (env_id, hashes, error) in results)
+
+    pool = mp.Pool(processes)
+    try:
+        results = list(pool.imap_unordered(_rollout_hash_worker, tasks,
+            chunksize=1))
+    finally:
+        pool.terminate()
+        pool.join()
+    return dict((env_id, (hashes, error)) for (env_id, hashes, error) in results)
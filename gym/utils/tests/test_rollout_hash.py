@@ -0,0 +1,49 @@
+import numpy as np
+
+from gym.utils.rollout_hash import (RolloutHash, generate_rollout_hash,
+    generate_rollout_hashes)
+
+def test_rollout_hash_incremental():
+    observations = [np.array([0.1, 0.2]), np.array([0.3, 0.4])]
+    lhs, rhs = RolloutHash(), RolloutHash()
+    for observation in observations:
+        lhs.update(observation, 1, 1., False)
+        rhs.update(observation.copy(), 1, 1., False)
+    assert lhs.hexdigests() == rhs.hexdigests()
+    assert lhs.num_steps == 2
+
+def test_rollout_hash_distinguishes_values():
+    # These observations have the same string representation
+    lhs, rhs = RolloutHash(), RolloutHash()
+    observation = np.array([0.1, 0.2])
+    lhs.update(observation, 0, 0., False)
+    rhs.update(observation + 1e-12, 0, 0., False)
+    assert str(observation) == str(observation + 1e-12)
+    assert lhs.hexdigests()[0] != rhs.hexdigests()[0]
+    assert lhs.hexdigests()[1:] == rhs.hexdigests()[1:]
+
+def test_rollout_hash_distinguishes_dtypes_and_shapes():
+    hashes = set()
+    for observation in [np.zeros((2, 2), dtype=np.float32),
+            np.zeros((4,), dtype=np.float32), np.zeros((2, 2), dtype=np.int32),
+            (np.zeros((2,), dtype=np.float32), np.zeros((2,), dtype=np.float32))]:
+        rollout_hash = RolloutHash()
+        rollout_hash.update(observation, 0, 0., False)
+        hashes.add(rollout_hash.hexdigests()[0])
+    assert len(hashes) == 4
+
+def test_generate_rollout_hashes_parallel():
+    env_ids = ['CartPole-v0', 'FrozenLake-v0', 'Copy-v0']
+    results = generate_rollout_hashes(env_ids, num_steps=50, processes=2)
+    assert set(results.keys()) == set(env_ids)
+    for env_id in env_ids:
+        hashes, error = results[env_id]
+        assert error is None
+        assert hashes == generate_rollout_hash(env_id, num_steps=50)
+
+def test_generate_rollout_hashes_error():
+    results = generate_rollout_hashes(['CartPole-v0'], num_steps=10,
+        seed=-1, processes=1)
+    hashes, error = results['CartPole-v0']
+    assert hashes is None
+    assert 'Error' in error
@@ -5,9 +5,12 @@ except ImportError:
 
 from gym.vector.async_vector_env import AsyncVectorEnv
 from gym.vector.sync_vector_env import SyncVectorEnv
-from gym.vector.vector_env import VectorEnv
+from gym.vector.vector_env import (VectorEnv, VectorWrapper,
+    VectorObservationWrapper, VectorRewardWrapper, VectorActionWrapper)
 
-__all__ = ['AsyncVectorEnv', 'SyncVectorEnv', 'VectorEnv', 'make']
+__all__ = ['AsyncVectorEnv', 'SyncVectorEnv', 'VectorEnv', 'VectorWrapper',
+    'VectorObservationWrapper', 'VectorRewardWrapper', 'VectorActionWrapper',
+    'make']
 
 def make(id, num_envs=1, asynchronous=True, wrappers=None, **kwargs):
     """Create a vectorized environment from multiple copies of an environment,
@@ -2,16 +2,20 @@ import numpy as np
 import multiprocessing as mp
 import time
 import sys
+import os
 from enum import Enum
 from copy import deepcopy
 
 from gym import logger
+from gym.spaces import Space
 from gym.vector.vector_env import VectorEnv
 from gym.error import (AlreadyPendingCallError, NoAsyncCallError,
                        ClosedEnvironmentError)
 from gym.vector.utils import (create_shared_memory, create_empty_array,
                               write_to_shared_memory, read_from_shared_memory,
-                              concatenate, CloudpickleWrapper, clear_mpi_env_vars)
+                              concatenate, CloudpickleWrapper, clear_mpi_env_vars,
+                              get_worker_affinities, ObservationEncoder,
+                              ObservationDecoder, SharedMemoryBuffer)
 
 __all__ = ['AsyncVectorEnv']
 
@@ -42,7 +46,9 @@ class AsyncVectorEnv(VectorEnv):
     shared_memory : bool (default: `True`)
         If `True`, then the observations from the worker processes are
         communicated back through shared variables. This can improve the
-        efficiency if the observations are large (e.g. images).
+        efficiency if the observations are large (e.g. images). In Python 3.8+,
+        all the observations are stored in a single contiguous segment of
+        shared memory (see `gym.vector.utils.SharedMemoryBuffer`).
 
     copy : bool (default: `True`)
         If `True`, then the `reset` and `step` methods return a copy of the
@@ -51,9 +57,73 @@ class AsyncVectorEnv(VectorEnv):
     context : str, optional
         Context for multiprocessing. If `None`, then the default context is used.
         Only available in Python 3.
+
+    worker_affinity : `'auto'`, or iterable of iterables of int, optional
+        CPUs on which the worker processes are pinned (see
+        `gym.vector.utils.get_worker_affinities`). If `'auto'`, each worker is
+        pinned to a single CPU. If a list of CPU sets, either one set per
+        worker, or one set per group of contiguous workers (e.g. one set per
+        NUMA node). If `shared_memory=True` and the `fork` start method is
+        used, the slice of shared memory of each worker is also allocated on
+        the NUMA node of that worker, by first touch. Only available on
+        platforms supporting `os.sched_setaffinity`.
+
+    auto_restart : bool (default: `False`)
+        If `True`, a worker raising an exception (or exiting unexpectedly)
+        during `reset` or `step` is restarted from its function in `env_fns`,
+        instead of shutting down the vectorized environment. The environment
+        of the new worker is reset. In `step`, this environment then returns
+        its initial observation, a reward of `0`, `done=True`, and the error
+        message in `info['worker_restarted']`.
+
+    worker_timeout : int or float, optional
+        Only used if `auto_restart=True`. Maximum number of seconds taken by a
+        worker for a call to `reset` or `step`. The workers exceeding this
+        duration are terminated, and restarted as if they had raised an
+        exception. If `None`, the workers never time out.
+
+    transport : str, optional (default: `'auto'`)
+        Only used if `shared_memory=False`. Codec of the observations sent
+        through the pipes by the worker processes (see
+        `gym.vector.utils.ObservationEncoder`): one of `'auto'`, `'raw'`,
+        `'lz4'` or `'delta'`. In `auto` mode, the codec of each leaf of the
+        observation is selected from its size: the small leaves are sent
+        uncompressed, and the large leaves are delta encoded (if lz4 is
+        installed). If `None`, the observations are pickled as they are.
+
+    max_episode_steps : int, optional
+        Maximum number of steps of an episode, counted by the vectorized
+        environment in `elapsed_steps`. An episode reaching this limit ends
+        with `done=True` and `truncations[i]=True` (unless it ended in a
+        terminal state at the same step), and the environment is reset, like
+        with `gym.wrappers.TimeLimit`. If `None`, the episodes are not limited.
+
+    Attributes
+    ----------
+    step_latencies : `np.ndarray` instance (dtype `np.float64`)
+        Duration (in seconds) of the last step inside each worker process,
+        including the automatic reset and the write to shared memory, and
+        excluding the communication with the main process.
+
+    observation_bytes : `np.ndarray` instance (dtype `np.int64`)
+        Only updated if `shared_memory=False` and `transport` is not `None`.
+        Number of bytes of observation data sent by each worker process in
+        the last call to `reset` or `step`.
+
+    truncations : `np.ndarray` instance (dtype `np.bool_`)
+        Whether the episode of each environment has ended in the last call to
+        `step` because of a time limit (`max_episode_steps`, or
+        `info['TimeLimit.truncated']` set by `gym.wrappers.TimeLimit`), rather
+        than in a terminal state. Gathered next to `dones`, so bootstrapping
+        does not have to loop over `infos`.
+
+    elapsed_steps : `np.ndarray` instance (dtype `np.int64`)
+        Number of steps taken in the current episode of each environment.
     """
     def __init__(self, env_fns, observation_space=None, action_space=None,
-                 shared_memory=True, copy=True, context=None):
+                 shared_memory=True, copy=True, context=None,
+                 worker_affinity=None, auto_restart=False, worker_timeout=None,
+                 transport='auto', max_episode_steps=None):
         try:
             ctx = mp.get_context(context)
         except AttributeError:
@@ -63,6 +133,10 @@ class AsyncVectorEnv(VectorEnv):
         self.env_fns = env_fns
         self.shared_memory = shared_memory
         self.copy = copy
+        self.auto_restart = auto_restart
+        self.worker_timeout = worker_timeout
+        self.max_episode_steps = max_episode_steps
+        self._call_start = None
 
         if (observation_space is None) or (action_space is None):
             dummy_env = env_fns[0]()
@@ -73,9 +147,33 @@ class AsyncVectorEnv(VectorEnv):
         super(AsyncVectorEnv, self).__init__(num_envs=len(env_fns),
             observation_space=observation_space, action_space=action_space)
 
+        if worker_affinity is None:
+            affinities = [None] * self.num_envs
+        elif not hasattr(os, 'sched_setaffinity'):
+            logger.warn('Pinning workers to CPUs is not available on this '
+                'platform. Ignoring `worker_affinity`.')
+            affinities, worker_affinity = [None] * self.num_envs, None
+        else:
+            affinities = get_worker_affinities(worker_affinity, self.num_envs)
+        self.worker_affinities = affinities
+        self.step_latencies = np.zeros((self.num_envs,), dtype=np.float64)
+        self._truncations = np.zeros((self.num_envs,), dtype=np.bool_)
+        self.truncations = self._truncations
+        self.elapsed_steps = np.zeros((self.num_envs,), dtype=np.int64)
+
         if self.shared_memory:
-            _obs_buffer = create_shared_memory(self.single_observation_space,
-                n=self.num_envs, ctx=ctx)
+            first_touch = (worker_affinity is not None) and (
+                getattr(ctx, 'get_start_method', lambda: None)() == 'fork')
+            _obs_buffer = None
+            if not first_touch:
+                try:
+                    _obs_buffer = SharedMemoryBuffer(
+                        self.single_observation_space, n=self.num_envs)
+                except ImportError:
+                    pass
+            if _obs_buffer is None:
+                _obs_buffer = create_shared_memory(self.single_observation_space,
+                    n=self.num_envs, ctx=ctx, first_touch=first_touch)
             self.observations = read_from_shared_memory(_obs_buffer,
                 self.single_observation_space, n=self.num_envs)
         else:
@@ -83,24 +181,29 @@ class AsyncVectorEnv(VectorEnv):
             self.observations = create_empty_array(
             	self.single_observation_space, n=self.num_envs, fn=np.zeros)
 
+        if self.shared_memory and (transport not in (None, 'auto')):
+            logger.warn('The observations are not sent through the pipes '
+                'with `shared_memory=True`. Ignoring `transport={0!r}`.'.format(
+                transport))
+        self.transport = None if self.shared_memory else transport
+        if self.transport is not None:
+            self._decoder = ObservationDecoder(self.single_observation_space,
+                n=self.num_envs, transport=self.transport)
+            self.observation_bytes = self._decoder.nbytes
+        else:
+            self._decoder = None
+            self.observation_bytes = np.zeros((self.num_envs,), dtype=np.int64)
+
+        self._ctx = ctx
+        self._obs_buffer = _obs_buffer
         self.parent_pipes, self.processes = [], []
         self.error_queue = ctx.Queue()
-        target = _worker_shared_memory if self.shared_memory else _worker
         with clear_mpi_env_vars():
-            for idx, env_fn in enumerate(self.env_fns):
-                parent_pipe, child_pipe = ctx.Pipe()
-                process = ctx.Process(target=target,
-                    name='Worker<{0}>-{1}'.format(type(self).__name__, idx),
-                    args=(idx, CloudpickleWrapper(env_fn), child_pipe,
-                    parent_pipe, _obs_buffer, self.error_queue))
-
+            for idx in range(self.num_envs):
+                parent_pipe, process = self._start_worker(idx)
                 self.parent_pipes.append(parent_pipe)
                 self.processes.append(process)
 
-                process.daemon = True
-                process.start()
-                child_pipe.close()
-
         self._state = AsyncState.DEFAULT
         self._check_observation_spaces()
 
@@ -139,6 +242,7 @@ class AsyncVectorEnv(VectorEnv):
                 'for a pending call to `{0}` to complete'.format(
                 self._state.value), self._state.value)
 
+        self._call_start = time.perf_counter()
         for pipe in self.parent_pipes:
             pipe.send(('reset', None))
         self._state = AsyncState.WAITING_RESET
@@ -166,11 +270,22 @@ class AsyncVectorEnv(VectorEnv):
             raise mp.TimeoutError('The call to `reset_wait` has timed out after '
                 '{0} second{1}.'.format(timeout, 's' if timeout > 1 else ''))
 
-        results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
-        self._raise_if_errors(successes)
+        if self.auto_restart:
+            results, errors = self._receive_supervised()
+            for index in errors:
+                results[index] = self._restart_worker(index)
+        else:
+            results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
+            self._raise_if_errors(successes)
         self._state = AsyncState.DEFAULT
+        self._truncations[:] = False
+        self.truncations = (np.copy(self._truncations) if self.copy
+            else self._truncations)
+        self.elapsed_steps[:] = 0
 
         if not self.shared_memory:
+            if self._decoder is not None:
+                results = self._decode(results)
             concatenate(results, self.observations, self.single_observation_space)
 
         return deepcopy(self.observations) if self.copy else self.observations
@@ -179,8 +294,10 @@ class AsyncVectorEnv(VectorEnv):
         """
         Parameters
         ----------
-        actions : iterable of samples from `action_space`
-            List of actions.
+        actions : iterable of samples from `single_action_space`, or batch
+            List of actions, or batch of actions (i.e. a sample from
+            `batch_space(single_action_space, num_envs)`, e.g. a dict of
+            arrays for a `Dict` action space).
         """
         self._assert_is_running()
         if self._state != AsyncState.DEFAULT:
@@ -188,8 +305,16 @@ class AsyncVectorEnv(VectorEnv):
                 'for a pending call to `{0}` to complete.'.format(
                 self._state.value), self._state.value)
 
-        for pipe, action in zip(self.parent_pipes, actions):
-            pipe.send(('step', action))
+        self._call_start = time.perf_counter()
+        actions = self._split_actions(actions)
+        # The episodes reaching `max_episode_steps` are truncated (and reset)
+        # by the workers
+        if self.max_episode_steps is None:
+            truncate = np.zeros((self.num_envs,), dtype=np.bool_)
+        else:
+            truncate = self.elapsed_steps + 1 >= self.max_episode_steps
+        for pipe, action, truncate_ in zip(self.parent_pipes, actions, truncate):
+            pipe.send(('step', (action, bool(truncate_))))
         self._state = AsyncState.WAITING_STEP
 
     def step_wait(self, timeout=None):
@@ -224,17 +349,34 @@ class AsyncVectorEnv(VectorEnv):
             raise mp.TimeoutError('The call to `step_wait` has timed out after '
                 '{0} second{1}.'.format(timeout, 's' if timeout > 1 else ''))
 
-        results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
-        self._raise_if_errors(successes)
+        if self.auto_restart:
+            results, errors = self._receive_supervised()
+            for index, message in errors.items():
+                observation = self._restart_worker(index)
+                results[index] = (observation, 0., True,
+                    {'worker_restarted': message}, False,
+                    time.perf_counter() - self._call_start)
+        else:
+            results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
+            self._raise_if_errors(successes)
         self._state = AsyncState.DEFAULT
-        observations_list, rewards, dones, infos = zip(*results)
+        observations_list, rewards, dones, infos, truncations, latencies = zip(*results)
+        self.step_latencies[:] = latencies
+        dones = np.array(dones, dtype=np.bool_)
+        self._truncations[:] = truncations
+        self.truncations = (np.copy(self._truncations) if self.copy
+            else self._truncations)
+        self.elapsed_steps += 1
+        self.elapsed_steps[dones] = 0
 
         if not self.shared_memory:
+            if self._decoder is not None:
+                observations_list = self._decode(observations_list)
             concatenate(observations_list, self.observations,
                 self.single_observation_space)
 
         return (deepcopy(self.observations) if self.copy else self.observations,
-                np.array(rewards), np.array(dones, dtype=np.bool_), infos)
+                np.array(rewards), dones, infos)
 
     def close(self, timeout=None, terminate=False):
         """
@@ -282,6 +424,8 @@ class AsyncVectorEnv(VectorEnv):
                 pipe.close()
         for process in self.processes:
             process.join()
+        if isinstance(self._obs_buffer, SharedMemoryBuffer):
+            self._obs_buffer.close()
 
         self.closed = True
 
@@ -289,20 +433,88 @@ class AsyncVectorEnv(VectorEnv):
         self._assert_is_running()
         if timeout is None:
             return True
-        end_time = time.time() + timeout
+        end_time = time.perf_counter() + timeout
         delta = None
         for pipe in self.parent_pipes:
-            delta = max(end_time - time.time(), 0)
+            delta = max(end_time - time.perf_counter(), 0)
             if pipe is None:
                 return False
             if pipe.closed or (not pipe.poll(delta)):
                 return False
         return True
 
+    def _decode(self, observations):
+        return [self._decoder.decode(index, observation)
+            for (index, observation) in enumerate(observations)]
+
+    def _start_worker(self, index):
+        if self.shared_memory:
+            target, kwargs = _worker_shared_memory, {}
+        else:
+            target, kwargs = _worker, {'transport': self.transport}
+        parent_pipe, child_pipe = self._ctx.Pipe()
+        process = self._ctx.Process(target=target,
+            name='Worker<{0}>-{1}'.format(type(self).__name__, index),
+            args=(index, CloudpickleWrapper(self.env_fns[index]), child_pipe,
+            parent_pipe, self._obs_buffer, self.error_queue,
+            self.worker_affinities[index]), kwargs=kwargs)
+        process.daemon = True
+        process.start()
+        child_pipe.close()
+        return parent_pipe, process
+
+    def _restart_worker(self, index):
+        process = self.processes[index]
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        self.parent_pipes[index].close()
+
+        with clear_mpi_env_vars():
+            self.parent_pipes[index], self.processes[index] = self._start_worker(index)
+        self.parent_pipes[index].send(('reset', None))
+        observation, success = self.parent_pipes[index].recv()
+        self._raise_if_errors([success])
+        return observation
+
+    def _receive_supervised(self):
+        deadline = None
+        if self.worker_timeout is not None:
+            deadline = self._call_start + self.worker_timeout
+
+        results, errors = [], {}
+        for index, pipe in enumerate(self.parent_pipes):
+            result = None
+            try:
+                if (deadline is not None) and (not pipe.poll(
+                        max(deadline - time.perf_counter(), 0))):
+                    errors[index] = 'TimeoutError: Worker-{0} did not respond ' \
+                        'within {1} seconds.'.format(index, self.worker_timeout)
+                else:
+                    result, success = pipe.recv()
+                    if not success:
+                        errors[index] = None
+            except (EOFError, OSError):
+                errors[index] = 'EOFError: Worker-{0} exited unexpectedly ' \
+                    '(exit code: {1}).'.format(index, self.processes[index].exitcode)
+            results.append(result)
+
+        for _ in range(list(errors.values()).count(None)):
+            index, exctype, value = self.error_queue.get()
+            errors[index] = '{0}: {1}'.format(exctype.__name__, value)
+        for index, message in errors.items():
+            logger.warn('Restarting Worker-{0} after the following error: '
+                '{1}'.format(index, message))
+        return results, errors
+
     def _check_observation_spaces(self):
         self._assert_is_running()
+        # Only send the content hash of the space, if available, instead of
+        # pickling the whole space for each worker
+        space = self.single_observation_space
+        data = space if (space.content_hash is None) else space.content_hash
         for pipe in self.parent_pipes:
-            pipe.send(('_check_observation_space', self.single_observation_space))
+            pipe.send(('_check_observation_space', data))
         same_spaces, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
         self._raise_if_errors(successes)
         if not all(same_spaces):
@@ -320,7 +532,7 @@ class AsyncVectorEnv(VectorEnv):
         if all(successes):
             return
 
-        num_errors = self.num_envs - sum(successes)
+        num_errors = len(successes) - sum(successes)
         assert num_errors > 0
         for _ in range(num_errors):
             index, exctype, value = self.error_queue.get()
@@ -339,21 +551,42 @@ class AsyncVectorEnv(VectorEnv):
                 self.close(terminate=True)
 
 
-def _worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
+def _is_same_space(data, space):
+    # `data` is either the content hash of a space, or a space
+    if isinstance(data, Space):
+        return data == space
+    return data == space.content_hash
+
+
+def _worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue,
+            affinity=None, transport=None):
     assert shared_memory is None
+    if affinity is not None:
+        os.sched_setaffinity(0, affinity)
     env = env_fn()
+    encode = (lambda observation: observation) if (transport is None) \
+        else ObservationEncoder(env.observation_space, transport).encode
     parent_pipe.close()
     try:
         while True:
             command, data = pipe.recv()
             if command == 'reset':
                 observation = env.reset()
-                pipe.send((observation, True))
+                pipe.send((encode(observation), True))
             elif command == 'step':
-                observation, reward, done, info = env.step(data)
+                start = time.perf_counter()
+                action, truncate = data
+                observation, reward, done, info = env.step(action)
+                if truncate:
+                    info['TimeLimit.truncated'] = (not done) or info.get(
+                        'TimeLimit.truncated', False)
+                    done = True
                 if done:
                     observation = env.reset()
-                pipe.send(((observation, reward, done, info), True))
+                latency = time.perf_counter() - start
+                truncated = info.get('TimeLimit.truncated', False)
+                pipe.send(((encode(observation), reward, done, info, truncated,
+                    latency), True))
             elif command == 'seed':
                 env.seed(data)
                 pipe.send((None, True))
@@ -361,7 +594,7 @@ def _worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
                 pipe.send((None, True))
                 break
             elif command == '_check_observation_space':
-                pipe.send((data == env.observation_space, True))
+                pipe.send((_is_same_space(data, env.observation_space), True))
             else:
                 raise RuntimeError('Received unknown command `{0}`. Must '
                     'be one of {`reset`, `step`, `seed`, `close`, '
@@ -373,8 +606,11 @@ def _worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
         env.close()
 
 
-def _worker_shared_memory(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
+def _worker_shared_memory(index, env_fn, pipe, parent_pipe, shared_memory,
+                          error_queue, affinity=None):
     assert shared_memory is not None
+    if affinity is not None:
+        os.sched_setaffinity(0, affinity)
     env = env_fn()
     observation_space = env.observation_space
     parent_pipe.close()
@@ -387,12 +623,20 @@ def _worker_shared_memory(index, env_fn, pipe, parent_pipe, shared_memory, error
                                        observation_space)
                 pipe.send((None, True))
             elif command == 'step':
-                observation, reward, done, info = env.step(data)
+                start = time.perf_counter()
+                action, truncate = data
+                observation, reward, done, info = env.step(action)
+                if truncate:
+                    info['TimeLimit.truncated'] = (not done) or info.get(
+                        'TimeLimit.truncated', False)
+                    done = True
                 if done:
                     observation = env.reset()
                 write_to_shared_memory(index, observation, shared_memory,
                                        observation_space)
-                pipe.send(((None, reward, done, info), True))
+                latency = time.perf_counter() - start
+                truncated = info.get('TimeLimit.truncated', False)
+                pipe.send(((None, reward, done, info, truncated, latency), True))
             elif command == 'seed':
                 env.seed(data)
                 pipe.send((None, True))
@@ -400,7 +644,7 @@ def _worker_shared_memory(index, env_fn, pipe, parent_pipe, shared_memory, error
                 pipe.send((None, True))
                 break
             elif command == '_check_observation_space':
-                pipe.send((data == observation_space, True))
+                pipe.send((_is_same_space(data, observation_space), True))
             else:
                 raise RuntimeError('Received unknown command `{0}`. Must '
                     'be one of {`reset`, `step`, `seed`, `close`, '
@@ -1,9 +1,8 @@
 import numpy as np
-from copy import deepcopy
 
 from gym import logger
 from gym.vector.vector_env import VectorEnv
-from gym.vector.utils import concatenate, create_empty_array
+from gym.vector.utils import write_to_batch, copy_batch, create_empty_array
 
 __all__ = ['SyncVectorEnv']
 
@@ -26,13 +25,35 @@ class SyncVectorEnv(VectorEnv):
 
     copy : bool (default: `True`)
         If `True`, then the `reset` and `step` methods return a copy of the
-        observations.
+        observations (and of the rewards and dones). If `False`, they return
+        the internal buffers, which are overwritten in place by the next call
+        to `reset` or `step`.
+
+    max_episode_steps : int, optional
+        Maximum number of steps of an episode, counted by the vectorized
+        environment in `elapsed_steps`. An episode reaching this limit ends
+        with `done=True` and `truncations[i]=True` (unless it ended in a
+        terminal state at the same step), and the environment is reset, like
+        with `gym.wrappers.TimeLimit`. If `None`, the episodes are not limited.
+
+    Attributes
+    ----------
+    truncations : `np.ndarray` instance (dtype `np.bool_`)
+        Whether the episode of each environment has ended in the last call to
+        `step` because of a time limit (`max_episode_steps`, or
+        `info['TimeLimit.truncated']` set by `gym.wrappers.TimeLimit`), rather
+        than in a terminal state. Gathered next to `dones`, so bootstrapping
+        does not have to loop over `infos`.
+
+    elapsed_steps : `np.ndarray` instance (dtype `np.int64`)
+        Number of steps taken in the current episode of each environment.
     """
     def __init__(self, env_fns, observation_space=None, action_space=None,
-                 copy=True):
+                 copy=True, max_episode_steps=None):
         self.env_fns = env_fns
         self.envs = [env_fn() for env_fn in env_fns]
         self.copy = copy
+        self.max_episode_steps = max_episode_steps
         
         if (observation_space is None) or (action_space is None):
             observation_space = observation_space or self.envs[0].observation_space
@@ -45,6 +66,10 @@ class SyncVectorEnv(VectorEnv):
             n=self.num_envs, fn=np.zeros)
         self._rewards = np.zeros((self.num_envs,), dtype=np.float64)
         self._dones = np.zeros((self.num_envs,), dtype=np.bool_)
+        self._truncations = np.zeros((self.num_envs,), dtype=np.bool_)
+        self.truncations = self._truncations
+        self.elapsed_steps = np.zeros((self.num_envs,), dtype=np.int64)
+        self._actions = None
 
     def seed(self, seeds=None):
         """
@@ -66,7 +91,7 @@ class SyncVectorEnv(VectorEnv):
         for env, seed in zip(self.envs, seeds):
             env.seed(seed)
 
-    def reset(self):
+    def reset_wait(self):
         """
         Returns
         -------
@@ -74,21 +99,30 @@ class SyncVectorEnv(VectorEnv):
             A batch of observations from the vectorized environment.
         """
         self._dones[:] = False
-        observations = []
-        for env in self.envs:
-            observation = env.reset()
-            observations.append(observation)
-        concatenate(observations, self.observations, self.single_observation_space)
-
-        return np.copy(self.observations) if self.copy else self.observations
-
-    def step(self, actions):
+        self._truncations[:] = False
+        self.elapsed_steps[:] = 0
+        for i, env in enumerate(self.envs):
+            write_to_batch(i, env.reset(), self.observations,
+                self.single_observation_space)
+        self.truncations = (np.copy(self._truncations) if self.copy
+            else self._truncations)
+
+        return (copy_batch(self.observations, self.single_observation_space)
+            if self.copy else self.observations)
+
+    def step_async(self, actions):
         """
         Parameters
         ----------
-        actions : iterable of samples from `action_space`
-            List of actions.
+        actions : iterable of samples from `single_action_space`, or batch
+            List of actions, or batch of actions (i.e. a sample from
+            `batch_space(single_action_space, num_envs)`, e.g. a dict of
+            arrays for a `Dict` action space).
+        """
+        self._actions = self._split_actions(actions)
 
+    def step_wait(self):
+        """
         Returns
         -------
         observations : sample from `observation_space`
@@ -103,16 +137,28 @@ class SyncVectorEnv(VectorEnv):
         infos : list of dict
             A list of auxiliary diagnostic informations.
         """
-        observations, infos = [], []
-        for i, (env, action) in enumerate(zip(self.envs, actions)):
+        infos = []
+        truncate = None if (self.max_episode_steps is None) \
+            else (self.elapsed_steps + 1 >= self.max_episode_steps)
+        for i, (env, action) in enumerate(zip(self.envs, self._actions)):
             observation, self._rewards[i], self._dones[i], info = env.step(action)
+            if (truncate is not None) and truncate[i]:
+                info['TimeLimit.truncated'] = (not self._dones[i]) or info.get(
+                    'TimeLimit.truncated', False)
+                self._dones[i] = True
+            self._truncations[i] = info.get('TimeLimit.truncated', False)
             if self._dones[i]:
                 observation = env.reset()
-            observations.append(observation)
+            write_to_batch(i, observation, self.observations,
+                self.single_observation_space)
             infos.append(info)
-        concatenate(observations, self.observations, self.single_observation_space)
+        self.elapsed_steps += 1
+        self.elapsed_steps[self._dones] = 0
 
-        return (deepcopy(self.observations) if self.copy else self.observations,
+        if not self.copy:
+            return self.observations, self._rewards, self._dones, infos
+        self.truncations = np.copy(self._truncations)
+        return (copy_batch(self.observations, self.single_observation_space),
             np.copy(self._rewards), np.copy(self._dones), infos)
 
     def close(self):
@@ -1,11 +1,13 @@
 import pytest
 import numpy as np
+import os
 
 from multiprocessing import TimeoutError
 from gym.spaces import Box
 from gym.error import (AlreadyPendingCallError, NoAsyncCallError,
                        ClosedEnvironmentError)
-from gym.vector.tests.utils import make_env, make_slow_env
+from gym.vector.tests.utils import make_env, make_slow_env, make_faulty_env
+from gym.vector.utils import get_worker_affinities
 
 from gym.vector.async_vector_env import AsyncVectorEnv
 
@@ -194,3 +196,110 @@ def test_check_observations_async_vector_env(shared_memory):
     with pytest.raises(RuntimeError):
         env = AsyncVectorEnv(env_fns, shared_memory=shared_memory)
         env.close(terminate=True)
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'),
+    reason='Requires `os.sched_setaffinity`')
+@pytest.mark.parametrize('shared_memory', [True, False])
+@pytest.mark.parametrize('worker_affinity', ['auto', 'groups'])
+def test_worker_affinity_async_vector_env(shared_memory, worker_affinity):
+    cpus = sorted(os.sched_getaffinity(0))
+    if worker_affinity == 'groups':
+        worker_affinity = [cpus]
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             worker_affinity=worker_affinity)
+        reference_env = AsyncVectorEnv(env_fns, shared_memory=shared_memory)
+        env.seed(0)
+        reference_env.seed(0)
+        observations = env.reset()
+        reference_observations = reference_env.reset()
+    finally:
+        env.close()
+        reference_env.close()
+
+    assert len(env.worker_affinities) == 4
+    assert all(affinity <= set(cpus) for affinity in env.worker_affinities)
+    assert np.all(observations == reference_observations)
+
+
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_step_latencies_async_vector_env(shared_memory):
+    env_fns = [make_slow_env(0., i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory)
+        observations = env.reset()
+        env.step([0., 0., 0.1, 0.])
+    finally:
+        env.close()
+
+    assert env.step_latencies.shape == (4,)
+    assert env.step_latencies[2] >= 0.1
+    assert np.all(env.step_latencies[[0, 1, 3]] < 0.1)
+
+
+@pytest.mark.filterwarnings('ignore::UserWarning')
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_auto_restart_async_vector_env(shared_memory):
+    env_fns = [make_faulty_env(i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             auto_restart=True)
+        env.reset()
+        old_pid = env.processes[1].pid
+        observations, rewards, dones, infos = env.step([0., -1., 0., 0.])
+        assert env.processes[1].pid != old_pid
+        observations, _, next_dones, next_infos = env.step([0., 0., 0., 0.])
+    finally:
+        env.close()
+
+    assert observations.shape == env.observation_space.shape
+    assert np.all(dones == [False, True, False, False])
+    assert rewards[1] == 0.
+    assert 'ValueError' in infos[1]['worker_restarted']
+    assert all('worker_restarted' not in info for info in infos[::2])
+    assert not np.any(next_dones)
+    assert all('worker_restarted' not in info for info in next_infos)
+
+
+@pytest.mark.filterwarnings('ignore::UserWarning')
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_worker_timeout_async_vector_env(shared_memory):
+    env_fns = [make_faulty_env(i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             auto_restart=True, worker_timeout=0.2)
+        env.reset()
+        observations, rewards, dones, infos = env.step([0., 0., 1., 0.])
+    finally:
+        env.close()
+
+    assert np.all(dones == [False, False, True, False])
+    assert 'TimeoutError' in infos[2]['worker_restarted']
+
+
+@pytest.mark.filterwarnings('ignore::UserWarning')
+def test_no_auto_restart_async_vector_env():
+    env_fns = [make_faulty_env(i) for i in range(4)]
+    with pytest.raises(ValueError):
+        try:
+            env = AsyncVectorEnv(env_fns)
+            env.reset()
+            env.step([0., -1., 0., 0.])
+        finally:
+            env.close(terminate=True)
+
+
+def test_get_worker_affinities():
+    groups = [{0, 1}, {2, 3}]
+    affinities = get_worker_affinities(groups, num_workers=4)
+    assert affinities == [{0, 1}, {0, 1}, {2, 3}, {2, 3}]
+
+    affinities = get_worker_affinities([{0}, {1}, {2}], num_workers=3)
+    assert affinities == [{0}, {1}, {2}]
+
+    with pytest.raises(ValueError):
+        get_worker_affinities([{0}, set()], num_workers=2)
+    with pytest.raises(ValueError):
+        get_worker_affinities([{0}, {1}, {2}], num_workers=2)
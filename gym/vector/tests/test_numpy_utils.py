@@ -7,7 +7,9 @@ from gym.spaces import Tuple, Dict
 from gym.vector.utils.spaces import _BaseGymSpaces
 from gym.vector.tests.utils import spaces
 
-from gym.vector.utils.numpy_utils import concatenate, create_empty_array
+from gym.vector.utils.numpy_utils import (concatenate, split, is_batch,
+    write_to_batch,
+    copy_batch, create_empty_array)
 
 @pytest.mark.parametrize('space', spaces,
     ids=[space.__class__.__name__ for space in spaces])
@@ -50,6 +52,70 @@ def test_concatenate(space):
     assert_nested_equal(array, samples, n=8)
 
 
+def assert_nested_equal(lhs, rhs, space):
+    if isinstance(space, _BaseGymSpaces):
+        assert np.all(lhs == rhs)
+    elif isinstance(space, Tuple):
+        assert isinstance(lhs, tuple)
+        for i, subspace in enumerate(space.spaces):
+            assert_nested_equal(lhs[i], rhs[i], subspace)
+    elif isinstance(space, Dict):
+        assert isinstance(lhs, OrderedDict)
+        for key, subspace in space.spaces.items():
+            assert_nested_equal(lhs[key], rhs[key], subspace)
+    else:
+        raise TypeError('Got unknown type `{0}`.'.format(type(space)))
+
+
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_split(space):
+    samples = [space.sample() for _ in range(8)]
+    batch = concatenate(samples, create_empty_array(space, n=8), space)
+    assert is_batch(batch, space, n=8)
+    assert not is_batch(samples, space, n=8)
+
+    items = split(batch, space, n=8)
+    assert len(items) == 8
+    for item, sample in zip(items, samples):
+        assert space.contains(item)
+        assert_nested_equal(item, sample, space)
+
+
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_write_to_batch(space):
+    samples = [space.sample() for _ in range(8)]
+    expected = concatenate(samples, create_empty_array(space, n=8), space)
+
+    array = create_empty_array(space, n=8)
+    for index, sample in enumerate(samples):
+        write_to_batch(index, sample, array, space)
+
+    assert_nested_equal(array, expected, space)
+
+
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_copy_batch(space):
+    samples = [space.sample() for _ in range(8)]
+    array = concatenate(samples, create_empty_array(space, n=8), space)
+    copied = copy_batch(array, space)
+    assert_nested_equal(copied, array, space)
+
+    def assert_no_shared_memory(lhs, rhs, space):
+        if isinstance(space, _BaseGymSpaces):
+            assert not np.shares_memory(lhs, rhs)
+        elif isinstance(space, Tuple):
+            for i, subspace in enumerate(space.spaces):
+                assert_no_shared_memory(lhs[i], rhs[i], subspace)
+        else:
+            for key, subspace in space.spaces.items():
+                assert_no_shared_memory(lhs[key], rhs[key], subspace)
+
+    assert_no_shared_memory(copied, array, space)
+
+
 @pytest.mark.parametrize('n', [1, 8])
 @pytest.mark.parametrize('space', spaces,
     ids=[space.__class__.__name__ for space in spaces])
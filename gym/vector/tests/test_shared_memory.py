@@ -1,5 +1,6 @@
 import pytest
 import sys
+import mmap
 import numpy as np
 
 import multiprocessing as mp
@@ -7,12 +8,15 @@ from multiprocessing.sharedctypes import SynchronizedArray
 from multiprocessing import Array, Process
 from collections import OrderedDict
 
-from gym.spaces import Tuple, Dict
+from gym.spaces import Box, Dict, MultiBinary, Tuple
 from gym.vector.utils.spaces import _BaseGymSpaces
 from gym.vector.tests.utils import spaces
+from gym.vector.tests.test_numpy_utils import assert_nested_equal
 
+from gym.vector.utils.numpy_utils import concatenate, create_empty_array
 from gym.vector.utils.shared_memory import (create_shared_memory,
-    read_from_shared_memory, write_to_shared_memory)
+    read_from_shared_memory, write_to_shared_memory, FirstTouchArray,
+    SharedMemoryBuffer)
 
 is_python_2 = (sys.version_info < (3, 0))
 
@@ -101,9 +105,10 @@ def test_write_to_shared_memory(space):
     assert_nested_equal(shared_memory_n8, samples)
 
 
+@pytest.mark.parametrize('first_touch', [False, True])
 @pytest.mark.parametrize('space', spaces,
     ids=[space.__class__.__name__ for space in spaces])
-def test_read_from_shared_memory(space):
+def test_read_from_shared_memory(space, first_touch):
 
     def assert_nested_equal(lhs, rhs, space, n):
         assert isinstance(rhs, list)
@@ -131,7 +136,7 @@ def test_read_from_shared_memory(space):
     def write(i, shared_memory, sample):
         write_to_shared_memory(i, sample, shared_memory, space)
 
-    shared_memory_n8 = create_shared_memory(space, n=8)
+    shared_memory_n8 = create_shared_memory(space, n=8, first_touch=first_touch)
     memory_view_n8 = read_from_shared_memory(shared_memory_n8, space, n=8)
     samples = [space.sample() for _ in range(8)]
 
@@ -144,3 +149,87 @@ def test_read_from_shared_memory(space):
         process.join()
 
     assert_nested_equal(memory_view_n8, samples, space, n=8)
+
+
+def _write_to_buffer(index, shared_memory, sample):
+    write_to_shared_memory(index, sample, shared_memory, shared_memory.space)
+
+# Spawning processes is slow: only the most nested space is tested with `spawn`
+buffer_params = [(space, 'fork') for space in spaces] + [(spaces[-1], 'spawn')]
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason='Requires Python 3.8+')
+@pytest.mark.parametrize('space,ctx', buffer_params, ids=['{0}-{1}'.format(
+    space.__class__.__name__, ctx) for (space, ctx) in buffer_params])
+def test_shared_memory_buffer(space, ctx):
+    ctx = mp.get_context(ctx)
+    shared_memory = SharedMemoryBuffer(space, n=4)
+    try:
+        observations = read_from_shared_memory(shared_memory, space, n=4)
+        samples = [space.sample() for _ in range(4)]
+
+        processes = [ctx.Process(target=_write_to_buffer, args=(i,
+            shared_memory, samples[i])) for i in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        expected = concatenate(samples, create_empty_array(space, n=4), space)
+        assert_nested_equal(observations, expected, space)
+    finally:
+        shared_memory.close()
+
+
+def test_shared_memory_buffer_layout():
+    space = Dict({
+        'image': Box(low=0, high=255, shape=(3, 5), dtype=np.uint8),
+        'flags': MultiBinary(3),
+        'half': Box(low=-1., high=1., shape=(2,), dtype=np.float16)
+    })
+    shared_memory = SharedMemoryBuffer(space, n=3, alignment=64)
+    try:
+        observations = shared_memory.observations
+        base_address = observations['image'].__array_interface__['data'][0]
+        for key in space.spaces:
+            batch = observations[key]
+            assert batch.shape == (3,) + space[key].shape
+            assert batch.dtype == space[key].dtype
+            assert (batch.__array_interface__['data'][0] - base_address) % 64 == 0
+            assert batch.strides[0] % 64 == 0
+
+        sample = space.sample()
+        shared_memory.write(1, sample)
+        for key in space.spaces:
+            assert np.all(observations[key][1] == sample[key])
+            assert not np.any(observations[key][0])
+    finally:
+        shared_memory.close()
+
+
+@pytest.mark.parametrize('first_touch', [False, True])
+def test_shared_memory_custom_dtype(first_touch):
+    # `np.float16` has no `ctypes` equivalent
+    space = Box(low=-1., high=1., shape=(3,), dtype=np.float16)
+    shared_memory = create_shared_memory(space, n=4, first_touch=first_touch)
+    observations = read_from_shared_memory(shared_memory, space, n=4)
+    sample = space.sample()
+    write_to_shared_memory(3, sample, shared_memory, space)
+    assert observations.dtype == np.float16
+    assert np.all(observations[3] == sample)
+    assert not np.any(observations[:3])
+
+
+def test_first_touch_array_page_aligned():
+    space = Box(low=-1., high=1., shape=(5, 3), dtype=np.float32)
+    shared_memory = create_shared_memory(space, n=4, first_touch=True)
+    assert isinstance(shared_memory, FirstTouchArray)
+    observations = read_from_shared_memory(shared_memory, space, n=4)
+    address = observations.__array_interface__['data'][0]
+    for index in range(4):
+        offset = observations[index].__array_interface__['data'][0] - address
+        assert offset % mmap.PAGESIZE == 0
+
+    sample = space.sample()
+    write_to_shared_memory(2, sample, shared_memory, space)
+    assert np.all(observations[2] == sample)
+    assert not np.any(observations[[0, 1, 3]])
@@ -1,10 +1,14 @@
 import pytest
 import numpy as np
+from copy import deepcopy
 
 from gym.spaces import Box, MultiDiscrete, Tuple, Dict
 from gym.vector.tests.utils import spaces
+from gym.vector.tests.test_numpy_utils import assert_nested_equal
 
-from gym.vector.utils.spaces import _BaseGymSpaces, batch_space
+from gym.vector.utils.numpy_utils import create_empty_array
+from gym.vector.utils.spaces import (_BaseGymSpaces, batch_space,
+    empty_array_factory)
 
 expected_batch_spaces_4 = [
     Box(low=-1., high=1., shape=(4,), dtype=np.float64),
@@ -37,3 +41,58 @@ expected_batch_spaces_4 = [
 def test_batch_space(space, expected_batch_space_4):
     batch_space_4 = batch_space(space, n=4)
     assert batch_space_4 == expected_batch_space_4
+
+
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_batch_space_memoized(space):
+    batch_space_1 = batch_space(space, n=4)
+    batch_space_2 = batch_space(deepcopy(space), n=4)
+    assert batch_space_1 == batch_space_2
+    assert batch_space_1 is not batch_space_2
+
+    # The copies have their own random number generator
+    batch_space_1.seed(0)
+    batch_space_2.seed(0)
+    batch_space_1.sample()
+    batch_space_2.sample()
+    assert_nested_equal(batch_space_1.sample(), batch_space_2.sample(),
+        batch_space_1)
+
+
+def test_batch_space_broadcast_bounds():
+    space = Box(low=np.array([-1., 0.]), high=np.array([1., 2.]), dtype=np.float32)
+    batched_space = batch_space(space, n=1000)
+    assert batched_space.low.shape == (1000, 2)
+    assert batched_space.low.strides[0] == 0
+    assert not batched_space.low.flags.writeable
+    assert np.all(batched_space.low == space.low)
+    assert np.all(batched_space.high == space.high)
+
+    # Modifying the original space (with bounds made writeable again) does
+    # not affect the batched space
+    space.low.flags.writeable = True
+    space.low[0] = -2.
+    assert np.all(batched_space.low[:, 0] == -1.)
+    assert np.all(batch_space(space, n=1000).low[:, 0] == -2.)
+
+
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_empty_array_factory(space):
+    factory = empty_array_factory(space, n=4)
+    assert factory == empty_array_factory(space, n=4)
+    lhs, rhs = factory(np.zeros), factory(np.zeros)
+    assert_nested_equal(lhs, create_empty_array(space, n=4, fn=np.zeros), space)
+    assert batch_space(space, n=4).contains(lhs)
+
+    def assert_not_shared(lhs, rhs):
+        if isinstance(lhs, tuple):
+            for lhs_, rhs_ in zip(lhs, rhs):
+                assert_not_shared(lhs_, rhs_)
+        elif isinstance(lhs, dict):
+            for key in lhs:
+                assert_not_shared(lhs[key], rhs[key])
+        else:
+            assert not np.shares_memory(lhs, rhs)
+    assert_not_shared(lhs, rhs)
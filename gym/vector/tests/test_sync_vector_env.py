@@ -62,6 +62,36 @@ def test_step_sync_vector_env(use_single_action_space):
     assert dones.size == 8
 
 
+def test_copy_sync_vector_env():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(8)]
+    try:
+        env = SyncVectorEnv(env_fns, copy=True)
+        observations = env.reset()
+        observations[0] = 128
+        assert not np.all(env.observations[0] == 128)
+        observations, rewards, dones, _ = env.step(env.action_space.sample())
+        observations[0] = 128
+        assert not np.all(env.observations[0] == 128)
+    finally:
+        env.close()
+
+
+def test_no_copy_sync_vector_env():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(8)]
+    try:
+        env = SyncVectorEnv(env_fns, copy=False)
+        observations = env.reset()
+        assert observations is env.observations
+        next_observations, rewards, dones, _ = env.step(
+            env.action_space.sample())
+        assert next_observations is observations
+        next_rewards, next_dones = env.step(env.action_space.sample())[1:3]
+        assert next_rewards is rewards
+        assert next_dones is dones
+    finally:
+        env.close()
+
+
 def test_check_observations_sync_vector_env():
     # CubeCrash-v0 - observation_space: Box(40, 32, 3)
     env_fns = [make_env('CubeCrash-v0', i) for i in range(8)]
@@ -0,0 +1,115 @@
+import pytest
+import numpy as np
+
+from collections import OrderedDict
+
+from gym.spaces import Tuple, Dict, Box
+from gym.vector.utils.spaces import _BaseGymSpaces
+from gym.vector.tests.utils import spaces, make_env
+
+from gym.vector.utils.transport import ObservationEncoder, ObservationDecoder
+from gym.vector.async_vector_env import AsyncVectorEnv
+from gym.vector.sync_vector_env import SyncVectorEnv
+try:
+    import lz4
+except ImportError:
+    lz4 = None
+
+transports = ['auto', 'raw',
+    pytest.param('lz4', marks=pytest.mark.skipif(lz4 is None,
+        reason='Need lz4 to run tests with compression')),
+    pytest.param('delta', marks=pytest.mark.skipif(lz4 is None,
+        reason='Need lz4 to run tests with compression'))]
+
+
+def assert_nested_equal(lhs, rhs, space):
+    if isinstance(space, _BaseGymSpaces):
+        assert isinstance(lhs, np.ndarray)
+        assert lhs.dtype == space.dtype
+        assert np.all(lhs == rhs)
+    elif isinstance(space, Tuple):
+        assert isinstance(lhs, tuple)
+        for i, subspace in enumerate(space.spaces):
+            assert_nested_equal(lhs[i], rhs[i], subspace)
+    elif isinstance(space, Dict):
+        assert isinstance(lhs, OrderedDict)
+        for key, subspace in space.spaces.items():
+            assert_nested_equal(lhs[key], rhs[key], subspace)
+    else:
+        raise TypeError('Got unknown type `{0}`'.format(type(space)))
+
+
+@pytest.mark.parametrize('transport', transports)
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_encode_decode(space, transport):
+    encoders = [ObservationEncoder(space, transport) for _ in range(2)]
+    decoder = ObservationDecoder(space, n=2, transport=transport)
+
+    samples = [space.sample() for _ in range(4)]
+    # Repeat some observations, to check that unchanged leaves are skipped
+    for sample in samples + samples[-1:]:
+        for index, encoder in enumerate(encoders):
+            observation = decoder.decode(index, encoder.encode(sample))
+            assert_nested_equal(observation, sample, space)
+
+    assert np.all(decoder.nbytes == 0)
+
+
+@pytest.mark.skipif(lz4 is None, reason='Need lz4 to run tests with compression')
+def test_delta_transport_nbytes():
+    space = Box(low=0, high=255, shape=(64, 64, 3), dtype=np.uint8)
+    encoder = ObservationEncoder(space, 'delta')
+    decoder = ObservationDecoder(space, n=1, transport='delta')
+
+    observation = np.zeros(space.shape, dtype=space.dtype)
+    decoder.decode(0, encoder.encode(observation))
+    observation[:4, :4] = 255
+    assert np.all(decoder.decode(0, encoder.encode(observation)) == observation)
+    assert 0 < decoder.nbytes[0] < observation.nbytes // 10
+
+
+def test_unknown_transport():
+    with pytest.raises(ValueError):
+        ObservationEncoder(spaces[0], 'unknown')
+
+
+@pytest.mark.parametrize('transport', transports)
+def test_transport_async_vector_env(transport):
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    try:
+        async_env = AsyncVectorEnv(env_fns, shared_memory=False,
+                                   transport=transport)
+        sync_env = SyncVectorEnv(env_fns)
+        async_env.seed(0)
+        sync_env.seed(0)
+
+        assert np.all(async_env.reset() == sync_env.reset())
+        for _ in range(20):
+            actions = async_env.action_space.sample()
+            async_observations, _, _, _ = async_env.step(actions)
+            sync_observations, _, _, _ = sync_env.step(actions)
+            assert np.all(async_observations == sync_observations)
+    finally:
+        async_env.close()
+        sync_env.close()
+
+    assert async_env.observation_bytes.shape == (4,)
+
+
+def test_transport_default():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(2)]
+    env = AsyncVectorEnv(env_fns, shared_memory=False)
+    try:
+        assert env.transport == 'auto'
+        env.reset()
+        assert np.all(env.observation_bytes > 0)
+    finally:
+        env.close()
+
+    with pytest.warns(UserWarning):
+        env = AsyncVectorEnv(env_fns, shared_memory=True, transport='lz4')
+    try:
+        assert env.transport is None
+    finally:
+        env.close()
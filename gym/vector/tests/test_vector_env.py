@@ -1,7 +1,10 @@
 import pytest
 import numpy as np
 
-from gym.vector.tests.utils import make_env
+from collections import OrderedDict
+
+from gym.vector.tests.utils import make_env, make_dict_action_env
+from gym.vector.utils import split
 
 from gym.vector.async_vector_env import AsyncVectorEnv
 from gym.vector.sync_vector_env import SyncVectorEnv
@@ -41,3 +44,90 @@ def test_vector_env_equal(shared_memory):
     finally:
         async_env.close()
         sync_env.close()
+
+
+@pytest.mark.parametrize('asynchronous', [True, False])
+def test_vector_env_batched_dict_actions(asynchronous):
+    env_fns = [make_dict_action_env(i) for i in range(4)]
+    env = AsyncVectorEnv(env_fns) if asynchronous else SyncVectorEnv(env_fns)
+    try:
+        env.reset()
+        batch = OrderedDict([
+            ('jump', np.array([0, 1, 1, 0])),
+            ('velocity', np.linspace(-1., 1., 8, dtype=np.float32).reshape(4, 2))
+        ])
+        observations, _, _, _ = env.step(batch)
+        list_observations, _, _, _ = env.step(split(batch,
+            env.single_action_space, n=4))
+    finally:
+        env.close()
+
+    assert np.all(observations[:, 0] == batch['jump'])
+    assert np.all(observations[:, 1:] == batch['velocity'])
+    assert np.all(observations == list_observations)
+
+
+def make_time_limit_env(max_episode_steps, seed):
+    def _make():
+        import gym
+        from gym.wrappers import TimeLimit
+        env = TimeLimit(gym.make('CartPole-v1').unwrapped,
+            max_episode_steps=max_episode_steps)
+        env.seed(seed)
+        return env
+    return _make
+
+
+@pytest.mark.parametrize('copy', [True, False])
+@pytest.mark.parametrize('asynchronous', [True, False])
+def test_vector_env_truncations(asynchronous, copy):
+    env_fns = [make_time_limit_env(max_episode_steps, i)
+        for (i, max_episode_steps) in enumerate([3, 5, 1000])]
+    env = (AsyncVectorEnv(env_fns, copy=copy) if asynchronous
+        else SyncVectorEnv(env_fns, copy=copy))
+    try:
+        env.reset()
+        assert not np.any(env.truncations)
+        reset_truncations = env.truncations
+        assert np.all(env.elapsed_steps == 0)
+        elapsed_steps = np.zeros(3, dtype=np.int64)
+        num_truncated, num_terminal = np.zeros(3), np.zeros(3)
+        for _ in range(20):
+            _, _, dones, infos = env.step(np.zeros(3, dtype=np.int64))
+            truncations = [info.get('TimeLimit.truncated', False) for info in infos]
+            assert np.array_equal(env.truncations, truncations)
+            assert (env.truncations is reset_truncations) != copy
+            assert not np.any(env.truncations & ~dones)
+            elapsed_steps = np.where(dones, 0, elapsed_steps + 1)
+            assert np.array_equal(env.elapsed_steps, elapsed_steps)
+            num_truncated += env.truncations
+            num_terminal += dones & ~env.truncations
+        # Always pushing left, the third environment ends in a terminal state
+        # before its time limit
+        assert np.all(num_truncated[:2] > 0) and (num_truncated[2] == 0)
+        assert num_terminal[2] > 0
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize('asynchronous', [True, False])
+def test_vector_env_max_episode_steps(asynchronous):
+    # The first environment has its own time limit, shorter than the time
+    # limit of the vectorized environment
+    env_fns = [make_time_limit_env(max_episode_steps, i)
+        for (i, max_episode_steps) in enumerate([3, 1000, 1000])]
+    env = (AsyncVectorEnv(env_fns, max_episode_steps=5) if asynchronous
+        else SyncVectorEnv(env_fns, max_episode_steps=5))
+    try:
+        env.reset()
+        for step in range(1, 11):
+            # Balancing the pole keeps the episodes alive for a few steps
+            _, _, dones, infos = env.step(np.array([step % 2] * 3))
+            expected = np.array([step % 3 == 0, step % 5 == 0, step % 5 == 0])
+            assert np.array_equal(dones, expected)
+            assert np.array_equal(env.truncations, expected)
+            assert np.array_equal(env.truncations,
+                [info.get('TimeLimit.truncated', False) for info in infos])
+            assert np.all(env.elapsed_steps < 5)
+    finally:
+        env.close()
@@ -0,0 +1,291 @@
+import pytest
+import numpy as np
+
+import gym
+from gym.spaces import Box, Dict, Discrete
+from gym.vector import SyncVectorEnv, AsyncVectorEnv, VectorWrapper
+from gym.vector.wrappers import (GrayScaleObservation, ResizeObservation,
+    TransformReward, ClipAction, FlattenObservation, FrameStack, ImagePreprocessing,
+    RecordEpisodeStatistics, NormalizeObservation, NormalizeReward,
+    OneHotObservation, _rgb_to_gray)
+from gym.vector.tests.utils import HEIGHT, WIDTH, make_env, make_slow_env
+
+
+def make_image_env(asynchronous, num_envs=3):
+    env_fns = [make_slow_env(0., i) for i in range(num_envs)]
+    return AsyncVectorEnv(env_fns) if asynchronous else SyncVectorEnv(env_fns)
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_vector_wrapper(asynchronous):
+    env = make_image_env(asynchronous)
+    wrapped_env = VectorWrapper(env)
+    try:
+        assert wrapped_env.num_envs == 3
+        assert wrapped_env.observation_space == env.observation_space
+        assert wrapped_env.unwrapped is env
+        observations = wrapped_env.reset()
+        assert observations.shape == (3, HEIGHT, WIDTH, 3)
+        observations, rewards, dones, _ = wrapped_env.step(np.zeros(3))
+        assert observations.shape == (3, HEIGHT, WIDTH, 3)
+        assert rewards.shape == (3,) and dones.shape == (3,)
+    finally:
+        wrapped_env.close()
+    assert env.closed
+
+
+@pytest.mark.parametrize('keep_dim', [True, False])
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_gray_scale_observation(asynchronous, keep_dim):
+    env = GrayScaleObservation(make_image_env(asynchronous), keep_dim=keep_dim)
+    try:
+        observations = env.reset()
+        assert env.observation_space.contains(observations)
+        assert env.single_observation_space.shape == ((HEIGHT, WIDTH, 1)
+            if keep_dim else (HEIGHT, WIDTH))
+    finally:
+        env.close()
+
+    cv2 = pytest.importorskip('cv2')
+    rgb = Box(low=0, high=255, shape=(3, HEIGHT, WIDTH, 3), dtype=np.uint8).sample()
+    expected = np.stack([cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) for image in rgb])
+    gray = env.observation(rgb)
+    assert np.array_equal(gray.squeeze(-1) if keep_dim else gray, expected)
+    assert np.array_equal(_rgb_to_gray(rgb), expected)
+
+
+@pytest.mark.parametrize('shape', [16, (8, 5), 48, (100, 90)])
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_resize_observation(asynchronous, shape):
+    cv2 = pytest.importorskip('cv2')
+    env = ResizeObservation(make_image_env(asynchronous), shape)
+    try:
+        observations = env.reset()
+        assert env.observation_space.contains(observations)
+    finally:
+        env.close()
+
+    shape = (shape, shape) if isinstance(shape, int) else shape
+    images = Box(low=0, high=255, shape=(3, HEIGHT, WIDTH, 3), dtype=np.uint8).sample()
+    expected = np.stack([cv2.resize(image, shape[::-1], interpolation=cv2.INTER_AREA)
+        for image in images])
+    assert np.array_equal(env.observation(images), expected)
+
+
+@pytest.mark.parametrize('copy', [True, False])
+def test_resize_observation_copy(copy):
+    pytest.importorskip('cv2')
+    env = ResizeObservation(make_image_env(False), 16, copy=copy)
+    observations = env.reset()
+    next_observations, _, _, _ = env.step(np.zeros(3))
+    assert next_observations.shape == (3, 16, 16, 3)
+    assert (next_observations is observations) == (not copy)
+    env.close()
+
+
+def test_transform_reward():
+    env = TransformReward(SyncVectorEnv([make_env('CartPole-v0', i)
+        for i in range(4)]), lambda r: 0.01 * r)
+    env.reset()
+    _, rewards, _, _ = env.step(np.zeros(4, dtype=np.int64))
+    assert np.allclose(rewards, 0.01)
+    env.close()
+
+
+def test_clip_action():
+    env = ClipAction(SyncVectorEnv([make_env('MountainCarContinuous-v0', i)
+        for i in range(3)]))
+    reference_env = SyncVectorEnv([make_env('MountainCarContinuous-v0', i)
+        for i in range(3)])
+    env.reset()
+    reference_env.reset()
+    actions = np.array([[1.2], [-2.5], [0.3]], dtype=np.float32)
+    observations, rewards, _, _ = env.step(actions)
+    expected, expected_rewards, _, _ = reference_env.step(np.clip(actions, -1., 1.))
+    assert np.allclose(observations, expected)
+    assert np.allclose(rewards, expected_rewards)
+    env.close()
+    reference_env.close()
+
+
+@pytest.mark.parametrize('copy', [True, False])
+def test_flatten_observation(copy):
+    env = FlattenObservation(SyncVectorEnv([make_env('Blackjack-v0', i)
+        for i in range(4)]), copy=copy)
+    assert env.observation_space.shape == (4, 32 + 11 + 2)
+    observations = env.reset()
+    assert observations.shape == (4, 45) and observations.dtype == np.float32
+    assert np.all(observations.sum(axis=1) == 3)
+    next_observations, _, _, _ = env.step(np.zeros(4, dtype=np.int64))
+    assert (next_observations is observations) == (not copy)
+    env.close()
+
+
+@pytest.mark.parametrize('copy', [True, False])
+def test_frame_stack(copy):
+    env_fns = [make_env('CartPole-v0', i) for i in range(3)]
+    env = FrameStack(SyncVectorEnv(env_fns), 4, copy=copy)
+    reference_env = SyncVectorEnv(env_fns)
+    assert env.observation_space.shape == (3, 4, 4)
+    assert env.single_observation_space.shape == (4, 4)
+
+    observations = env.reset()
+    reference = [reference_env.reset()] * 4
+    assert np.array_equal(observations, np.stack(reference, axis=1))
+    for _ in range(30):
+        actions = env.action_space.sample()
+        observations, _, dones, _ = env.step(actions)
+        reference_observations, _, _, _ = reference_env.step(actions)
+        reference = reference[1:] + [reference_observations]
+        for i in np.flatnonzero(dones):
+            for frames in reference:
+                frames[i] = reference_observations[i]
+        assert np.allclose(observations, np.stack(reference, axis=1))
+    env.close()
+    reference_env.close()
+
+
+@pytest.mark.parametrize('grayscale_obs', [True, False])
+def test_image_preprocessing(grayscale_obs):
+    cv2 = pytest.importorskip('cv2')
+    env = ImagePreprocessing(make_image_env(False), screen_size=16,
+        grayscale_obs=grayscale_obs)
+    assert env.single_observation_space.shape == ((16, 16) if grayscale_obs
+        else (16, 16, 3))
+    observations = env.reset()
+    assert env.observation_space.contains(observations)
+    env.close()
+
+    images = Box(low=0, high=255, shape=(3, HEIGHT, WIDTH, 3), dtype=np.uint8).sample()
+    expected = [cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if grayscale_obs else image
+        for image in images]
+    expected = np.stack([cv2.resize(image, (16, 16), interpolation=cv2.INTER_AREA)
+        for image in expected])
+    assert np.array_equal(env.observation(images), expected)
+
+
+def test_record_episode_statistics():
+    env_fns = [make_env('CartPole-v0', i) for i in range(3)]
+    env = RecordEpisodeStatistics(SyncVectorEnv(env_fns), window_size=4)
+    env.seed(0)
+    env.reset()
+    returns, lengths = np.zeros(3), np.zeros(3, dtype=np.int64)
+    episodes = []
+    for _ in range(100):
+        _, rewards, dones, infos = env.step(env.action_space.sample())
+        returns += rewards
+        lengths += 1
+        for i in range(3):
+            assert ('episode' in infos[i]) == dones[i]
+            if dones[i]:
+                assert infos[i]['episode'] == {'r': returns[i], 'l': lengths[i]}
+                episodes.append(returns[i])
+                returns[i], lengths[i] = 0., 0
+    env.close()
+
+    assert env.episode_window.count == len(episodes)
+    assert len(env.episode_window) == 4
+    assert np.isclose(env.episode_window.mean('r'), np.mean(episodes[-4:]))
+
+
+
+class BGEnv(gym.Env):
+    observation_space = Box(low=0., high=1., shape=(1,), dtype=np.float32)
+    action_space = Discrete(2)
+
+    def __init__(self, bg):
+        self.bg = bg
+
+    def reset(self):
+        return np.zeros(1, dtype=np.float32)
+
+    def step(self, action):
+        info = {} if self.bg is None else {'bg': np.full(5, self.bg)}
+        return np.zeros(1, dtype=np.float32), 0., bool(action), info
+
+
+def test_record_episode_statistics_missing_bg():
+    # The second environment has no blood glucose trace (e.g. a restarted
+    # worker of an `AsyncVectorEnv`)
+    env_fns = [lambda: BGEnv(100.), lambda: BGEnv(None), lambda: BGEnv(50.)]
+    env = RecordEpisodeStatistics(SyncVectorEnv(env_fns))
+    env.reset()
+    env.step(np.zeros(3, dtype=np.int64))
+    _, _, _, infos = env.step(np.ones(3, dtype=np.int64))
+    env.close()
+
+    assert infos[0]['episode']['time_in_range'] == 1.
+    assert infos[1]['episode'] == {'r': 0., 'l': 2}
+    assert infos[2]['episode']['hypo'] == 10
+
+@pytest.mark.parametrize('asynchronous', [True, False])
+def test_normalize_observation(asynchronous, tmpdir):
+    env_fns = [make_env('CartPole-v0', i) for i in range(4)]
+    env = NormalizeObservation(AsyncVectorEnv(env_fns) if asynchronous
+        else SyncVectorEnv(env_fns))
+    reference_env = SyncVectorEnv(env_fns)
+    assert env.single_observation_space.shape == (4,)
+    observations = [reference_env.reset()]
+    env.reset()
+    for _ in range(20):
+        actions = env.action_space.sample()
+        # The observations are normalized with `step_async` and `step_wait`
+        env.step_async(actions)
+        normalized, _, _, _ = env.step_wait()
+        observations.append(reference_env.step(actions)[0])
+    data = np.concatenate(observations)
+    # The statistics are shared by all the environments
+    assert env.obs_rms.count == 84
+    assert np.allclose(env.obs_rms.mean, data.mean(axis=0))
+    expected = (observations[-1] - data.mean(axis=0)) / np.sqrt(data.var(axis=0) + 1e-8)
+    assert np.allclose(normalized, expected, atol=1e-5)
+
+    # The statistics are compatible with `gym.wrappers.NormalizeObservation`
+    path = str(tmpdir.join('statistics.npz'))
+    env.save(path)
+    eval_env = gym.wrappers.NormalizeObservation(gym.make('CartPole-v0'),
+        update_stats=False)
+    eval_env.load(path)
+    assert eval_env.obs_rms.count == 84
+    env.close()
+    reference_env.close()
+
+
+def test_normalize_reward():
+    gamma = 0.9
+    env = NormalizeReward(SyncVectorEnv([make_env('CartPole-v0', i)
+        for i in range(3)]), gamma=gamma)
+    env.reset()
+    returns, all_returns = np.zeros(3), []
+    for _ in range(40):
+        env.step_async(env.action_space.sample())
+        _, rewards, dones, _ = env.step_wait()
+        returns = gamma * returns + 1.
+        all_returns.append(returns.copy())
+        assert np.allclose(rewards, 1. / np.sqrt(np.var(all_returns) + 1e-8))
+        returns[dones] = 0.
+    env.close()
+
+
+def test_one_hot_observation():
+    env = gym.vector.make('Taxi-v3', num_envs=4, asynchronous=False)
+    wrapped_env = OneHotObservation(gym.vector.make('Taxi-v3', num_envs=4,
+        asynchronous=False), copy=False)
+    assert wrapped_env.observation_space.shape == (4, 500)
+    assert wrapped_env.single_observation_space.shape == (500,)
+
+    env.seed(0)
+    wrapped_env.seed(0)
+    obs = env.reset()
+    wrapped_obs = wrapped_env.reset()
+    assert np.array_equal(np.argmax(wrapped_obs, axis=1), obs)
+
+    actions = np.array([0, 1, 2, 3])
+    obs, _, _, _ = env.step(actions)
+    wrapped_env.step_async(actions)
+    next_wrapped_obs, _, _, _ = wrapped_env.step_wait()
+    assert next_wrapped_obs is wrapped_obs
+    assert np.array_equal(np.argmax(next_wrapped_obs, axis=1), obs)
+    assert np.all(next_wrapped_obs.sum(axis=1) == 1)
+    env.close()
+    wrapped_env.close()
@@ -47,6 +47,30 @@ class UnittestSlowEnv(gym.Env):
         reward, done = 0., False
         return observation, reward, done, {}
 
+class UnittestFaultyEnv(UnittestSlowEnv):
+    def step(self, action):
+        if action < 0:
+            raise ValueError('Got a negative action: {0}.'.format(action))
+        return super(UnittestFaultyEnv, self).step(action)
+
+class UnittestDictActionEnv(gym.Env):
+    def __init__(self):
+        super(UnittestDictActionEnv, self).__init__()
+        self.observation_space = Box(low=-1., high=1., shape=(3,), dtype=np.float32)
+        self.action_space = Dict({
+            'jump': Discrete(2),
+            'velocity': Box(low=-1., high=1., shape=(2,), dtype=np.float32)
+        })
+
+    def reset(self):
+        return np.zeros(self.observation_space.shape, dtype=np.float32)
+
+    def step(self, action):
+        assert self.action_space.contains(action)
+        observation = np.array([action['jump']] + list(action['velocity']),
+            dtype=np.float32)
+        return observation, 0., False, {}
+
 def make_env(env_name, seed):
     def _make():
         env = gym.make(env_name)
@@ -60,3 +84,17 @@ def make_slow_env(slow_reset, seed):
         env.seed(seed)
         return env
     return _make
+
+def make_faulty_env(seed):
+    def _make():
+        env = UnittestFaultyEnv(slow_reset=0.)
+        env.seed(seed)
+        return env
+    return _make
+
+def make_dict_action_env(seed):
+    def _make():
+        env = UnittestDictActionEnv()
+        env.seed(seed)
+        return env
+    return _make
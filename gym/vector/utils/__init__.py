@@ -1,16 +1,28 @@
-from gym.vector.utils.misc import CloudpickleWrapper, clear_mpi_env_vars
-from gym.vector.utils.numpy_utils import concatenate, create_empty_array
-from gym.vector.utils.shared_memory import create_shared_memory, read_from_shared_memory, write_to_shared_memory
-from gym.vector.utils.spaces import _BaseGymSpaces, batch_space
+from gym.vector.utils.misc import CloudpickleWrapper, clear_mpi_env_vars, get_worker_affinities
+from gym.vector.utils.numpy_utils import (concatenate, split, is_batch,
+    write_to_batch, copy_batch, create_empty_array)
+from gym.vector.utils.shared_memory import (create_shared_memory,
+    read_from_shared_memory, write_to_shared_memory, SharedMemoryBuffer)
+from gym.vector.utils.spaces import _BaseGymSpaces, batch_space, empty_array_factory
+from gym.vector.utils.transport import ObservationEncoder, ObservationDecoder
 
 __all__ = [
     'CloudpickleWrapper',
     'clear_mpi_env_vars',
+    'get_worker_affinities',
     'concatenate',
+    'split',
+    'is_batch',
+    'write_to_batch',
+    'copy_batch',
     'create_empty_array',
     'create_shared_memory',
     'read_from_shared_memory',
     'write_to_shared_memory',
+    'SharedMemoryBuffer',
     '_BaseGymSpaces',
-    'batch_space'
+    'batch_space',
+    'empty_array_factory',
+    'ObservationEncoder',
+    'ObservationDecoder'
 ]
@@ -1,7 +1,7 @@
 import contextlib
 import os
 
-__all__ = ['CloudpickleWrapper', 'clear_mpi_env_vars']
+__all__ = ['CloudpickleWrapper', 'clear_mpi_env_vars', 'get_worker_affinities']
 
 class CloudpickleWrapper(object):
     def __init__(self, fn):
@@ -38,3 +38,46 @@ def clear_mpi_env_vars():
         yield
     finally:
         os.environ.update(removed_environment)
+
+
+def get_worker_affinities(affinity, num_workers):
+    """Assign a set of CPUs to each worker of a vectorized environment.
+
+    Parameters
+    ----------
+    affinity : `'auto'`, or iterable of iterables of int
+        If `'auto'`, each worker is pinned to a single CPU, spreading the
+        workers over the CPUs available to the current process. Otherwise, a
+        list of CPU sets: if it contains one set per worker, worker `i` is
+        pinned to `affinity[i]`; if it contains fewer sets, the workers are
+        split into contiguous groups, one group per CPU set (e.g. one group
+        per NUMA node).
+
+    num_workers : int
+        Number of workers (i.e. the number of environments).
+
+    Returns
+    -------
+    affinities : list of sets of int
+        The set of CPUs of each worker.
+
+    Example
+    -------
+    >>> get_worker_affinities([{0, 1, 2, 3}, {4, 5, 6, 7}], num_workers=4)
+    [{0, 1, 2, 3}, {0, 1, 2, 3}, {4, 5, 6, 7}, {4, 5, 6, 7}]
+    """
+    if affinity == 'auto':
+        cpus = sorted(os.sched_getaffinity(0))
+        return [{cpus[(index * len(cpus)) // num_workers]}
+            for index in range(num_workers)]
+
+    groups = [set(cpus) for cpus in affinity]
+    if not groups or not all(groups):
+        raise ValueError('`affinity` must be `auto` or a non-empty list of '
+            'non-empty CPU sets, got `{0}`.'.format(affinity))
+    if len(groups) > num_workers:
+        raise ValueError('Got {0} CPU sets for {1} workers. The number of CPU '
+            'sets must be at most the number of workers.'.format(len(groups),
+            num_workers))
+    return [groups[(index * len(groups)) // num_workers]
+        for index in range(num_workers)]
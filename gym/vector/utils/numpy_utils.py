@@ -1,10 +1,11 @@
 import numpy as np
 
 from gym.spaces import Tuple, Dict
-from gym.vector.utils.spaces import _BaseGymSpaces
+from gym.vector.utils.spaces import _BaseGymSpaces, empty_array_factory
 from collections import OrderedDict
 
-__all__ = ['concatenate', 'create_empty_array']
+__all__ = ['concatenate', 'split', 'is_batch', 'write_to_batch', 'copy_batch',
+    'create_empty_array']
 
 def concatenate(items, out, space):
     """Concatenate multiple samples from space into a single object.
@@ -57,6 +58,167 @@ def concatenate_dict(items, out, space):
         out[key], subspace)) for (key, subspace) in space.spaces.items()])
 
 
+def split(batch, space, n):
+    """Split a batch of samples from space into a list of samples. This is the
+    inverse of `concatenate`. The split is done once per leaf of the batch
+    (e.g. once per key for a `Dict` space), and the leaves of the samples are
+    views of the leaves of `batch`.
+
+    Parameters
+    ----------
+    batch : tuple, dict, or `np.ndarray`
+        Batch of samples, as a (possibly nested) numpy array. This is a sample
+        from `batch_space(space, n)`.
+
+    space : `gym.spaces.Space` instance
+        Space (e.g. the action space) of a single environment in the vectorized
+        environment.
+
+    n : int
+        Number of samples in the batch.
+
+    Returns
+    -------
+    items : list of samples of `space`
+        The `n` samples of the batch.
+
+    Example
+    -------
+    >>> from gym.spaces import Box, Dict, Discrete
+    >>> space = Dict({'jump': Discrete(2),
+    ... 'velocity': Box(low=0, high=1, shape=(2,), dtype=np.float32)})
+    >>> batch = OrderedDict([('jump', np.array([0, 1])),
+    ... ('velocity', np.array([[0.1, 0.2], [0.3, 0.4]], dtype=np.float32))])
+    >>> split(batch, space, n=2)
+    [OrderedDict([('jump', 0), ('velocity', array([0.1, 0.2], dtype=float32))]),
+     OrderedDict([('jump', 1), ('velocity', array([0.3, 0.4], dtype=float32))])]
+    """
+    if isinstance(space, _BaseGymSpaces):
+        return split_base(batch, space, n)
+    elif isinstance(space, Tuple):
+        return split_tuple(batch, space, n)
+    elif isinstance(space, Dict):
+        return split_dict(batch, space, n)
+    else:
+        raise NotImplementedError()
+
+def split_base(batch, space, n):
+    return list(np.asarray(batch))
+
+def split_tuple(batch, space, n):
+    return list(zip(*[split(subbatch, subspace, n)
+        for (subbatch, subspace) in zip(batch, space.spaces)]))
+
+def split_dict(batch, space, n):
+    keys = list(space.spaces.keys())
+    return [OrderedDict(zip(keys, values)) for values in zip(*[split(batch[key],
+        subspace, n) for (key, subspace) in space.spaces.items()])]
+
+
+def is_batch(x, space, n):
+    """Check if an object is a batch of samples from space (i.e. a sample from
+    `batch_space(space, n)`), as opposed to a list of `n` samples from space.
+
+    Parameters
+    ----------
+    x : object
+        A batch of samples, or an iterable of samples from `space`.
+
+    space : `gym.spaces.Space` instance
+        Space (e.g. the action space) of a single environment in the vectorized
+        environment.
+
+    n : int
+        Number of samples.
+
+    Returns
+    -------
+    is_batch : bool
+        `True` if `x` is a batch of samples from `space`.
+    """
+    if isinstance(space, _BaseGymSpaces):
+        return isinstance(x, np.ndarray) and (x.shape == (n,) + space.shape)
+    elif isinstance(space, Tuple):
+        return isinstance(x, tuple) and (len(x) == len(space.spaces)) and all(
+            is_batch(item, subspace, n) for (item, subspace) in zip(x, space.spaces))
+    elif isinstance(space, Dict):
+        return isinstance(x, dict)
+    else:
+        raise NotImplementedError()
+
+
+def write_to_batch(index, value, out, space):
+    """Write a single sample from space in place, in a row of a batch.
+
+    Parameters
+    ----------
+    index : int
+        Index of the row of the batch (must be in `[0, n)`).
+
+    value : sample from `space`
+        Sample to be written in the batch.
+
+    out : tuple, dict, or `np.ndarray`
+        The batch. This object is a (possibly nested) numpy array, e.g. created
+        with `create_empty_array`.
+
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment in the vectorized environment.
+
+    Returns
+    -------
+    `None`
+
+    Example
+    -------
+    >>> from gym.spaces import Box
+    >>> space = Box(low=0, high=1, shape=(3,), dtype=np.float32)
+    >>> out = np.zeros((2, 3), dtype=np.float32)
+    >>> write_to_batch(1, np.ones(3), out, space)
+    >>> out
+    array([[0., 0., 0.],
+           [1., 1., 1.]], dtype=float32)
+    """
+    if isinstance(space, _BaseGymSpaces):
+        out[index] = value
+    elif isinstance(space, Tuple):
+        for item, subout, subspace in zip(value, out, space.spaces):
+            write_to_batch(index, item, subout, subspace)
+    elif isinstance(space, Dict):
+        for key, subspace in space.spaces.items():
+            write_to_batch(index, value[key], out[key], subspace)
+    else:
+        raise NotImplementedError()
+
+
+def copy_batch(batch, space):
+    """Copy a (possibly nested) numpy array, e.g. a batch of observations.
+
+    Parameters
+    ----------
+    batch : tuple, dict, or `np.ndarray`
+        The object to copy. This object is a (possibly nested) numpy array.
+
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment in the vectorized environment.
+
+    Returns
+    -------
+    out : tuple, dict, or `np.ndarray`
+        A copy of `batch`, which does not share any memory with `batch`.
+    """
+    if isinstance(space, _BaseGymSpaces):
+        return np.copy(batch)
+    elif isinstance(space, Tuple):
+        return tuple(copy_batch(subbatch, subspace)
+            for (subbatch, subspace) in zip(batch, space.spaces))
+    elif isinstance(space, Dict):
+        return OrderedDict([(key, copy_batch(batch[key], subspace))
+            for (key, subspace) in space.spaces.items()])
+    else:
+        raise NotImplementedError()
+
+
 def create_empty_array(space, n=1, fn=np.zeros):
     """Create an empty (possibly nested) numpy array.
 
@@ -90,6 +252,8 @@ def create_empty_array(space, n=1, fn=np.zeros):
                  ('velocity', array([[0., 0.],
                                      [0., 0.]], dtype=float32))])
     """
+    if n is not None:
+        return empty_array_factory(space, n=n)(fn)
     if isinstance(space, _BaseGymSpaces):
         return create_empty_array_base(space, n=n, fn=fn)
     elif isinstance(space, Tuple):
@@ -1,6 +1,8 @@
 import numpy as np
 import multiprocessing as mp
+import mmap
 from ctypes import c_bool
+from multiprocessing.sharedctypes import typecode_to_type
 from collections import OrderedDict
 
 from gym import logger
@@ -8,12 +10,14 @@ from gym.spaces import Tuple, Dict
 from gym.vector.utils.spaces import _BaseGymSpaces
 
 __all__ = [
+    'FirstTouchArray',
+    'SharedMemoryBuffer',
     'create_shared_memory',
     'read_from_shared_memory',
     'write_to_shared_memory'
 ]
 
-def create_shared_memory(space, n=1, ctx=mp):
+def create_shared_memory(space, n=1, ctx=mp, first_touch=False):
     """Create a shared memory object, to be shared across processes. This
     eventually contains the observations from the vectorized environment.
 
@@ -29,33 +33,261 @@ def create_shared_memory(space, n=1, ctx=mp):
     ctx : `multiprocessing` context
         Context for multiprocessing.
 
+    first_touch : bool (default: `False`)
+        If `True`, the memory is an anonymous shared mapping which is never
+        written to by the parent process. Its pages are only allocated when
+        they are first written to, which places the slice of each worker on
+        the NUMA node of that worker (if it is pinned). Only available with
+        the `fork` start method.
+
     Returns
     -------
     shared_memory : dict, tuple, or `multiprocessing.Array` instance
         Shared object across processes.
     """
     if isinstance(space, _BaseGymSpaces):
-        return create_base_shared_memory(space, n=n, ctx=ctx)
+        return create_base_shared_memory(space, n=n, ctx=ctx,
+            first_touch=first_touch)
     elif isinstance(space, Tuple):
-        return create_tuple_shared_memory(space, n=n, ctx=ctx)
+        return create_tuple_shared_memory(space, n=n, ctx=ctx,
+            first_touch=first_touch)
     elif isinstance(space, Dict):
-        return create_dict_shared_memory(space, n=n, ctx=ctx)
+        return create_dict_shared_memory(space, n=n, ctx=ctx,
+            first_touch=first_touch)
     else:
         raise NotImplementedError()
 
-def create_base_shared_memory(space, n=1, ctx=mp):
+def create_base_shared_memory(space, n=1, ctx=mp, first_touch=False):
+    if first_touch:
+        return FirstTouchArray(space.dtype, int(np.prod(space.shape)), n=n)
     dtype = space.dtype.char
+    size = n * int(np.prod(space.shape))
     if dtype in '?':
         dtype = c_bool
-    return ctx.Array(dtype, n * int(np.prod(space.shape)))
+    elif dtype not in typecode_to_type:
+        # No ctypes equivalent (e.g. `np.float16`): allocate raw bytes
+        dtype, size = 'B', size * space.dtype.itemsize
+    return ctx.Array(dtype, size)
+
+def create_tuple_shared_memory(space, n=1, ctx=mp, first_touch=False):
+    return tuple(create_shared_memory(subspace, n=n, ctx=ctx,
+        first_touch=first_touch) for subspace in space.spaces)
+
+def create_dict_shared_memory(space, n=1, ctx=mp, first_touch=False):
+    return OrderedDict([(key, create_shared_memory(subspace, n=n, ctx=ctx,
+        first_touch=first_touch)) for (key, subspace) in space.spaces.items()])
+
+
+class FirstTouchArray(object):
+    """Lock-free array of shared memory, backed by an anonymous shared
+    mapping. Unlike `multiprocessing.Array`, which is zeroed by the process
+    creating it, the pages of this array are allocated lazily by the kernel on
+    the first write, on the NUMA node of the writing process. The slice of
+    each worker starts on a page boundary, so that no page is shared between
+    two workers (and the whole slice is placed on the node of its worker). It
+    exposes the same `get_obj` method as `multiprocessing.Array`, and is
+    shared with the workers by inheritance (`fork` start method only).
+
+    Parameters
+    ----------
+    dtype : `np.dtype` instance
+        Data type of the elements of the array.
+
+    size : int
+        Number of elements in the slice of each worker.
+
+    n : int
+        Number of workers (i.e. of slices).
+    """
+    def __init__(self, dtype, size, n=1):
+        self.dtype = np.dtype(dtype)
+        self.size = size
+        self.n = n
+        self.stride = _align(max(size * self.dtype.itemsize, 1), mmap.PAGESIZE)
+        self._buffer = mmap.mmap(-1, n * self.stride)
+
+    def get_obj(self):
+        return self._buffer
+
+    def view(self, shape):
+        r"""Array of shape `(n,) + shape` of the slices of all the workers
+        (without reading, nor writing to the shared mapping). """
+        assert int(np.prod(shape)) == self.size, (shape, self.size)
+        strides = (self.stride,) + np.empty(shape, dtype=self.dtype).strides
+        return np.ndarray((self.n,) + tuple(shape), dtype=self.dtype,
+            buffer=self._buffer, strides=strides)
+
+    def __len__(self):
+        return self.n * self.size
+
+    def __getstate__(self):
+        raise RuntimeError('`FirstTouchArray` objects can only be shared with '
+            'child processes through inheritance (`fork` start method).')
+
+
+class _SharedMemoryArray(np.ndarray):
+    # Raw view of a `SharedMemory` segment. Every view derived from it keeps
+    # the segment alive (and mapped) through the attribute `_shared_memory`.
+    pass
+
+_SharedMemorySegment = None
+
+def _shared_memory_segment(**kwargs):
+    # `SharedMemory` fails to close in `__del__` if there are still views on
+    # its buffer; the memory is then unmapped with the last view instead.
+    global _SharedMemorySegment
+    if _SharedMemorySegment is None:
+        from multiprocessing.shared_memory import SharedMemory
+
+        class _SharedMemorySegment(SharedMemory):
+            def __del__(self):
+                try:
+                    self.close()
+                except BufferError:
+                    pass
+    return _SharedMemorySegment(**kwargs)
+
+
+class SharedMemoryBuffer(object):
+    """Lock-free shared memory holding a batch of observations, backed by a
+    single contiguous `multiprocessing.shared_memory.SharedMemory` segment.
+    Every leaf of the (possibly nested) observation space is stored at an
+    offset aligned to `alignment` bytes, and the observation of each
+    environment starts on its own aligned row, so that workers never write
+    to the same cache line. Any numpy data type is supported.
+
+    The views on the memory are precomputed: `observations` is the batch of
+    observations as a (possibly nested) numpy array, and writing the
+    observation of a single environment with `write` only copies data. Only
+    available in Python 3.8+.
+
+    Parameters
+    ----------
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment in the vectorized environment.
+
+    n : int
+        Number of environments in the vectorized environment (i.e. the number
+        of processes).
+
+    alignment : int (default: 64)
+        Alignment (in bytes) of the leaves and of the rows of each leaf.
+
+    Notes
+    -----
+    The process creating the buffer owns the segment, and must call `close` to
+    release it. The buffer is sent to the worker processes either by
+    inheritance (`fork` start method) or by pickling, in which case the
+    workers attach to the same segment by name.
+    """
+    def __init__(self, space, n=1, alignment=64):
+        self.space = space
+        self.n = n
+        self.alignment = alignment
+        self._paths, self._layout, nbytes = self._compute_layout(space, n,
+            alignment)
+        self._shared_memory = _shared_memory_segment(create=True,
+            size=max(nbytes, 1))
+        self._owner = True
+        self._create_views()
+
+    @staticmethod
+    def _compute_layout(space, n, alignment):
+        paths, layout, offset = [], [], 0
+        for path, leaf in _leaf_paths(space):
+            offset = _align(offset, alignment)
+            stride = _align(int(np.prod(leaf.shape)) * leaf.dtype.itemsize,
+                alignment)
+            paths.append(path)
+            layout.append((leaf, offset, stride))
+            offset += n * stride
+        return paths, layout, offset
+
+    def _create_views(self):
+        raw = np.frombuffer(self._shared_memory.buf,
+            dtype=np.uint8).view(_SharedMemoryArray)
+        raw._shared_memory = self._shared_memory
+        self._leaves = []
+        for leaf, offset, stride in self._layout:
+            strides = (stride,) + np.empty(leaf.shape, dtype=leaf.dtype).strides
+            self._leaves.append(np.ndarray((self.n,) + leaf.shape,
+                dtype=leaf.dtype, buffer=raw, offset=offset,
+                strides=strides).view(np.ndarray))
+        self._slots = [[batch[index, ...] for batch in self._leaves]
+            for index in range(self.n)]
+        self.observations = _nest_leaves(self.space, iter(self._leaves))
+
+    @property
+    def name(self):
+        return self._shared_memory.name
+
+    @property
+    def nbytes(self):
+        return self._shared_memory.size
+
+    def write(self, index, value):
+        """Write the observation of a single environment.
+
+        Parameters
+        ----------
+        index : int
+            Index of the environment (must be in `[0, n)`).
+
+        value : sample from `space`
+            Observation of the single environment.
+        """
+        for path, slot in zip(self._paths, self._slots[index]):
+            leaf = value
+            for key in path:
+                leaf = leaf[key]
+            slot[...] = leaf
+
+    def close(self):
+        """Release the shared memory segment. The views on the memory remain
+        valid until they are garbage collected."""
+        if self._owner:
+            self._owner = False
+            self._shared_memory.unlink()
+
+    def __getstate__(self):
+        return {'space': self.space, 'n': self.n, 'alignment': self.alignment,
+            'name': self.name}
 
-def create_tuple_shared_memory(space, n=1, ctx=mp):
-    return tuple(create_shared_memory(subspace, n=n, ctx=ctx)
-        for subspace in space.spaces)
+    def __setstate__(self, state):
+        self.space, self.n = state['space'], state['n']
+        self.alignment = state['alignment']
+        self._paths, self._layout, _ = self._compute_layout(self.space, self.n,
+            self.alignment)
+        self._shared_memory = _shared_memory_segment(name=state['name'])
+        self._owner = False
+        self._create_views()
 
-def create_dict_shared_memory(space, n=1, ctx=mp):
-    return OrderedDict([(key, create_shared_memory(subspace, n=n, ctx=ctx))
-        for (key, subspace) in space.spaces.items()])
+
+def _align(offset, alignment):
+    return -(-offset // alignment) * alignment
+
+def _leaf_paths(space, path=()):
+    if isinstance(space, _BaseGymSpaces):
+        return [(path, space)]
+    elif isinstance(space, Tuple):
+        return [item for (i, subspace) in enumerate(space.spaces)
+            for item in _leaf_paths(subspace, path + (i,))]
+    elif isinstance(space, Dict):
+        return [item for (key, subspace) in space.spaces.items()
+            for item in _leaf_paths(subspace, path + (key,))]
+    else:
+        raise NotImplementedError()
+
+def _nest_leaves(space, leaves):
+    if isinstance(space, _BaseGymSpaces):
+        return next(leaves)
+    elif isinstance(space, Tuple):
+        return tuple(_nest_leaves(subspace, leaves) for subspace in space.spaces)
+    elif isinstance(space, Dict):
+        return OrderedDict([(key, _nest_leaves(subspace, leaves))
+            for (key, subspace) in space.spaces.items()])
+    else:
+        raise NotImplementedError()
 
 
 def read_from_shared_memory(shared_memory, space, n=1):
@@ -63,9 +295,10 @@ def read_from_shared_memory(shared_memory, space, n=1):
 
     Parameters
     ----------
-    shared_memory : dict, tuple, or `multiprocessing.Array` instance
+    shared_memory : dict, tuple, `multiprocessing.Array` or `SharedMemoryBuffer` instance
         Shared object across processes. This contains the observations from the
-        vectorized environment. This object is created with `create_shared_memory`.
+        vectorized environment. This object is created with `create_shared_memory`,
+        or is a `SharedMemoryBuffer`.
 
     space : `gym.spaces.Space` instance
         Observation space of a single environment in the vectorized environment.
@@ -85,6 +318,8 @@ def read_from_shared_memory(shared_memory, space, n=1):
     memory of `shared_memory`. Any changes to `shared_memory` are forwarded
     to `observations`, and vice-versa. To avoid any side-effect, use `np.copy`.
     """
+    if isinstance(shared_memory, SharedMemoryBuffer):
+        return shared_memory.observations
     if isinstance(space, _BaseGymSpaces):
         return read_base_from_shared_memory(shared_memory, space, n=n)
     elif isinstance(space, Tuple):
@@ -95,8 +330,10 @@ def read_from_shared_memory(shared_memory, space, n=1):
         raise NotImplementedError()
 
 def read_base_from_shared_memory(shared_memory, space, n=1):
-    return np.frombuffer(shared_memory.get_obj(),
-        dtype=space.dtype).reshape((n,) + space.shape)
+    if isinstance(shared_memory, FirstTouchArray):
+        return shared_memory.view(space.shape)[:n]
+    return np.frombuffer(shared_memory.get_obj(), dtype=space.dtype,
+        count=n * int(np.prod(space.shape))).reshape((n,) + space.shape)
 
 def read_tuple_from_shared_memory(shared_memory, space, n=1):
     return tuple(read_from_shared_memory(memory, subspace, n=n)
@@ -118,9 +355,10 @@ def write_to_shared_memory(index, value, shared_memory, space):
     value : sample from `space`
         Observation of the single environment to write to shared memory.
 
-    shared_memory : dict, tuple, or `multiprocessing.Array` instance
+    shared_memory : dict, tuple, `multiprocessing.Array` or `SharedMemoryBuffer` instance
         Shared object across processes. This contains the observations from the
-        vectorized environment. This object is created with `create_shared_memory`.
+        vectorized environment. This object is created with `create_shared_memory`,
+        or is a `SharedMemoryBuffer`.
 
     space : `gym.spaces.Space` instance
         Observation space of a single environment in the vectorized environment.
@@ -129,6 +367,9 @@ def write_to_shared_memory(index, value, shared_memory, space):
     -------
     `None`
     """
+    if isinstance(shared_memory, SharedMemoryBuffer):
+        shared_memory.write(index, value)
+        return
     if isinstance(space, _BaseGymSpaces):
         write_base_to_shared_memory(index, value, shared_memory, space)
     elif isinstance(space, Tuple):
@@ -139,8 +380,13 @@ def write_to_shared_memory(index, value, shared_memory, space):
         raise NotImplementedError()
 
 def write_base_to_shared_memory(index, value, shared_memory, space):
+    if isinstance(shared_memory, FirstTouchArray):
+        np.copyto(shared_memory.view(space.shape)[index:index + 1],
+            np.asarray(value, dtype=space.dtype).reshape((1,) + space.shape))
+        return
     size = int(np.prod(space.shape))
-    destination = np.frombuffer(shared_memory.get_obj(), dtype=space.dtype)
+    destination = np.frombuffer(shared_memory.get_obj(), dtype=space.dtype,
+        count=(index + 1) * size)
     np.copyto(destination[index * size:(index + 1) * size], np.asarray(
         value, dtype=space.dtype).flatten())
 
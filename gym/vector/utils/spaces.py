@@ -1,10 +1,15 @@
 import numpy as np
+from copy import copy
 from collections import OrderedDict
 
 from gym.spaces import Box, Discrete, MultiDiscrete, MultiBinary, Tuple, Dict
 
 _BaseGymSpaces = (Box, Discrete, MultiDiscrete, MultiBinary)
-__all__ = ['_BaseGymSpaces', 'batch_space']
+__all__ = ['_BaseGymSpaces', 'batch_space', 'empty_array_factory']
+
+# Maximum number of (space, n) pairs in the cache of batched spaces
+_BATCH_CACHE_SIZE = 256
+_batch_cache = OrderedDict()
 
 def batch_space(space, n=1):
     """Create a (batched) space, containing multiple copies of a single space.
@@ -32,7 +37,114 @@ def batch_space(space, n=1):
     ... 'velocity': Box(low=0, high=1, shape=(2,), dtype=np.float32)})
     >>> batch_space(space, n=5)
     Dict(position:Box(5, 3), velocity:Box(5, 2))
+
+    Notes
+    -----
+    The batched spaces are memoized by the current content of `space` (see
+    `gym.spaces.Space.content_hash`) and `n`. Each call returns a new space
+    (with its own random number generator), but the bounds of the `Box`
+    spaces are shared read-only broadcast views.
+    """
+    return _copy_space(_get_batch_entry(space, n).batched_space)
+
+def empty_array_factory(space, n=1):
+    """Create a function allocating (possibly nested) numpy arrays for a
+    batch of `n` elements of `space`, as in `create_empty_array`. The shapes
+    and data types of the arrays are precomputed, and memoized with the
+    batched space (see `batch_space`).
+
+    Parameters
+    ----------
+    space : `gym.spaces.Space` instance
+        Space (e.g. the observation space) for a single environment in the
+        vectorized environment.
+
+    n : int
+        Number of environments in the vectorized environment.
+
+    Returns
+    -------
+    factory : callable
+        Function taking the function creating the arrays (e.g. `np.empty` or
+        `np.zeros`, by default `np.zeros`), and returning the (possibly
+        nested) numpy array.
+
+    Example
+    -------
+    >>> factory = empty_array_factory(Box(low=0, high=1, shape=(3,)), n=2)
+    >>> factory(np.zeros)
+    array([[0., 0., 0.],
+           [0., 0., 0.]], dtype=float32)
     """
+    return _get_batch_entry(space, n).create_empty_array
+
+
+class _BatchEntry(object):
+    def __init__(self, space, n):
+        self.batched_space = _batch_space(space, n=n)
+        self._leaves = _leaf_specs(space, n)
+        self._space = space
+
+    def create_empty_array(self, fn=np.zeros):
+        arrays = iter([fn(shape, dtype=dtype) for (shape, dtype) in self._leaves])
+        return _nest(self._space, arrays)
+
+
+def _get_batch_entry(space, n):
+    # Keyed by the current content of `space`, which may be modified in place
+    content_hash = space.content_hash
+    key = (space if content_hash is None else content_hash, n)
+    entry = _batch_cache.pop(key, None)
+    if entry is None:
+        entry = _BatchEntry(space, n)
+        while len(_batch_cache) >= _BATCH_CACHE_SIZE:
+            _batch_cache.popitem(last=False)
+    _batch_cache[key] = entry
+    return entry
+
+def _copy_space(space):
+    # Shallow copy of a space, with a new (lazy) random number generator
+    space_copy = copy(space)
+    space_copy.np_random = None
+    if isinstance(space, Tuple):
+        space_copy.spaces = tuple(_copy_space(subspace)
+            for subspace in space.spaces)
+    elif isinstance(space, Dict):
+        space_copy.spaces = OrderedDict([(key, _copy_space(subspace))
+            for (key, subspace) in space.spaces.items()])
+    return space_copy
+
+def _leaf_specs(space, n):
+    if isinstance(space, _BaseGymSpaces):
+        return [((n,) + space.shape, space.dtype)]
+    elif isinstance(space, Tuple):
+        return [leaf for subspace in space.spaces
+            for leaf in _leaf_specs(subspace, n)]
+    elif isinstance(space, Dict):
+        return [leaf for subspace in space.spaces.values()
+            for leaf in _leaf_specs(subspace, n)]
+    else:
+        raise NotImplementedError()
+
+def _nest(space, leaves):
+    if isinstance(space, _BaseGymSpaces):
+        return next(leaves)
+    elif isinstance(space, Tuple):
+        return tuple(_nest(subspace, leaves) for subspace in space.spaces)
+    elif isinstance(space, Dict):
+        return OrderedDict([(key, _nest(subspace, leaves))
+            for (key, subspace) in space.spaces.items()])
+    else:
+        raise NotImplementedError()
+
+def _broadcast(array, n):
+    # Read-only view of `n` copies of `array`, without materializing them
+    array = np.array(array)
+    array.flags.writeable = False
+    return np.broadcast_to(array, (n,) + array.shape)
+
+
+def _batch_space(space, n=1):
     if isinstance(space, _BaseGymSpaces):
         return batch_space_base(space, n=n)
     elif isinstance(space, Tuple):
@@ -44,27 +156,28 @@ def batch_space(space, n=1):
 
 def batch_space_base(space, n=1):
     if isinstance(space, Box):
-        repeats = tuple([n] + [1] * space.low.ndim)
-        low, high = np.tile(space.low, repeats), np.tile(space.high, repeats)
+        low, high = _broadcast(space.low, n), _broadcast(space.high, n)
         return Box(low=low, high=high, dtype=space.dtype)
 
     elif isinstance(space, Discrete):
         return MultiDiscrete(np.full((n,), space.n, dtype=space.dtype))
 
     elif isinstance(space, MultiDiscrete):
-        repeats = tuple([n] + [1] * space.nvec.ndim)
-        high = np.tile(space.nvec, repeats) - 1
-        return Box(low=np.zeros_like(high), high=high, dtype=space.dtype)
+        high = _broadcast(space.nvec - 1, n)
+        low = _broadcast(np.zeros_like(space.nvec), n)
+        return Box(low=low, high=high, dtype=space.dtype)
 
     elif isinstance(space, MultiBinary):
-        return Box(low=0, high=1, shape=(n,) + space.shape, dtype=space.dtype)
+        low = _broadcast(np.zeros(space.shape, dtype=space.dtype), n)
+        high = _broadcast(np.ones(space.shape, dtype=space.dtype), n)
+        return Box(low=low, high=high, dtype=space.dtype)
 
     else:
         raise NotImplementedError()
 
 def batch_space_tuple(space, n=1):
-    return Tuple(tuple(batch_space(subspace, n=n) for subspace in space.spaces))
+    return Tuple(tuple(_batch_space(subspace, n=n) for subspace in space.spaces))
 
 def batch_space_dict(space, n=1):
-    return Dict(OrderedDict([(key, batch_space(subspace, n=n))
+    return Dict(OrderedDict([(key, _batch_space(subspace, n=n))
         for (key, subspace) in space.spaces.items()]))
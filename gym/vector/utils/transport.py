@@ -0,0 +1,188 @@
+import numpy as np
+from collections import OrderedDict
+
+from gym.spaces import Tuple, Dict
+from gym.vector.utils.spaces import _BaseGymSpaces
+
+__all__ = ['ObservationEncoder', 'ObservationDecoder', 'TRANSPORT_MODES']
+
+TRANSPORT_MODES = ('auto', 'raw', 'lz4', 'delta')
+
+# Leaves smaller than this (in bytes) are sent uncompressed in `auto` mode
+_MIN_COMPRESSED_NBYTES = 1024
+
+
+def _leaf_spaces(space):
+    if isinstance(space, _BaseGymSpaces):
+        return [space]
+    elif isinstance(space, Tuple):
+        return [leaf for subspace in space.spaces
+            for leaf in _leaf_spaces(subspace)]
+    elif isinstance(space, Dict):
+        return [leaf for subspace in space.spaces.values()
+            for leaf in _leaf_spaces(subspace)]
+    else:
+        raise NotImplementedError()
+
+def _leaves(space, x):
+    if isinstance(space, _BaseGymSpaces):
+        return [x]
+    elif isinstance(space, Tuple):
+        return [leaf for (subspace, item) in zip(space.spaces, x)
+            for leaf in _leaves(subspace, item)]
+    elif isinstance(space, Dict):
+        return [leaf for (key, subspace) in space.spaces.items()
+            for leaf in _leaves(subspace, x[key])]
+    else:
+        raise NotImplementedError()
+
+def _nest(space, leaves):
+    if isinstance(space, _BaseGymSpaces):
+        return next(leaves)
+    elif isinstance(space, Tuple):
+        return tuple(_nest(subspace, leaves) for subspace in space.spaces)
+    elif isinstance(space, Dict):
+        return OrderedDict([(key, _nest(subspace, leaves))
+            for (key, subspace) in space.spaces.items()])
+    else:
+        raise NotImplementedError()
+
+
+def _select_modes(space, transport):
+    if transport not in TRANSPORT_MODES:
+        raise ValueError('Unknown transport `{0}`. Must be one of '
+            '{1}.'.format(transport, TRANSPORT_MODES))
+    leaf_spaces = _leaf_spaces(space)
+    if transport != 'auto':
+        return [transport] * len(leaf_spaces)
+
+    try:
+        import lz4.block
+        compressed = 'delta'
+    except ImportError:
+        compressed = 'raw'
+    return [compressed if (int(np.prod(leaf.shape)) * leaf.dtype.itemsize
+        >= _MIN_COMPRESSED_NBYTES) else 'raw' for leaf in leaf_spaces]
+
+
+class ObservationEncoder(object):
+    """Encode the observations of a single environment before they are sent
+    through a pipe. The encoder is used by the worker processes of
+    `AsyncVectorEnv` (with `shared_memory=False`), and is paired with an
+    `ObservationDecoder` in the main process.
+
+    Each leaf of the (possibly nested) observation is encoded as either
+
+    * `None`, if the leaf is unchanged since the previous observation,
+    * a numpy array, in `raw` mode,
+    * a pair `(payload, is_delta)`, where `payload` is the lz4-compressed leaf
+      (in `lz4` mode), or the lz4-compressed bitwise XOR between the leaf and
+      the previous observation of the same leaf (in `delta` mode).
+
+    Parameters
+    ----------
+    space : `gym.spaces.Space` instance
+        Observation space of the environment.
+
+    transport : str (default: `'auto'`)
+        One of `'auto'`, `'raw'`, `'lz4'` or `'delta'`. In `auto` mode, the
+        small leaves are sent uncompressed, and the large leaves are delta
+        encoded (if lz4 is installed).
+    """
+    def __init__(self, space, transport='auto'):
+        self.space = space
+        self._spaces = _leaf_spaces(space)
+        self._modes = _select_modes(space, transport)
+        self._previous = [None] * len(self._spaces)
+        self._scratch = [None] * len(self._spaces)
+        self._compress = None
+        if any(mode in ('lz4', 'delta') for mode in self._modes):
+            from lz4.block import compress
+            self._compress = compress
+
+    def encode(self, observation):
+        leaves = _leaves(self.space, observation)
+        return [self._encode_leaf(i, np.asarray(leaf, dtype=space.dtype), mode)
+            for (i, (leaf, space, mode)) in enumerate(zip(leaves,
+            self._spaces, self._modes))]
+
+    def _encode_leaf(self, i, leaf, mode):
+        previous = self._previous[i]
+        if previous is None:
+            self._previous[i] = previous = np.empty_like(leaf)
+            self._scratch[i] = np.empty(leaf.nbytes, dtype=np.uint8)
+        elif mode == 'delta':
+            delta = self._scratch[i]
+            np.bitwise_xor(_as_bytes(leaf), _as_bytes(previous), out=delta)
+            if not delta.any():
+                return None
+            np.copyto(previous, leaf)
+            return (self._compress(delta), True)
+        elif np.array_equal(leaf, previous):
+            return None
+
+        np.copyto(previous, leaf)
+        if mode == 'raw':
+            return leaf
+        return (self._compress(_as_bytes(previous)), False)
+
+
+class ObservationDecoder(object):
+    """Decode the observations encoded by `ObservationEncoder`, for all the
+    environments of a vectorized environment. The decoded leaves are written
+    in place in buffers preallocated for each environment, so the observation
+    returned by `decode` is only valid until the next call to `decode` for the
+    same environment.
+
+    Parameters
+    ----------
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment.
+
+    n : int
+        Number of environments in the vectorized environment.
+
+    transport : str (default: `'auto'`)
+        One of `'auto'`, `'raw'`, `'lz4'` or `'delta'`. This must be the same
+        as the one given to the encoders.
+
+    Attributes
+    ----------
+    nbytes : `np.ndarray` instance (dtype `np.int64`)
+        Number of bytes of observation data in the last message decoded for
+        each environment.
+    """
+    def __init__(self, space, n=1, transport='auto'):
+        self.space = space
+        self._spaces = _leaf_spaces(space)
+        # Fail early, in the main process, if lz4 is required but not installed
+        self._decompress = None
+        if any(mode in ('lz4', 'delta') for mode in _select_modes(space, transport)):
+            from lz4.block import decompress
+            self._decompress = decompress
+        self._buffers = [[np.zeros(leaf.shape, dtype=leaf.dtype)
+            for leaf in self._spaces] for _ in range(n)]
+        self.nbytes = np.zeros((n,), dtype=np.int64)
+
+    def decode(self, index, message):
+        buffers, nbytes = self._buffers[index], 0
+        for buffer, leaf in zip(buffers, message):
+            if leaf is None:
+                continue
+            elif isinstance(leaf, np.ndarray):
+                np.copyto(buffer, leaf)
+                nbytes += leaf.nbytes
+            else:
+                payload, is_delta = leaf
+                decoded = np.frombuffer(self._decompress(payload), dtype=np.uint8)
+                if is_delta:
+                    np.bitwise_xor(_as_bytes(buffer), decoded, out=_as_bytes(buffer))
+                else:
+                    np.copyto(_as_bytes(buffer), decoded)
+                nbytes += len(payload)
+        self.nbytes[index] = nbytes
+        return _nest(self.space, iter(buffers))
+
+
+def _as_bytes(array):
+    return np.ascontiguousarray(array).reshape(-1).view(np.uint8)
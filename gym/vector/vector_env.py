@@ -1,8 +1,10 @@
 import gym
 from gym.spaces import Tuple
 from gym.vector.utils.spaces import batch_space
+from gym.vector.utils.numpy_utils import split, is_batch
 
-__all__ = ['VectorEnv']
+__all__ = ['VectorEnv', 'VectorWrapper', 'VectorObservationWrapper',
+    'VectorRewardWrapper', 'VectorActionWrapper']
 
 
 class VectorEnv(gym.Env):
@@ -53,7 +55,115 @@ class VectorEnv(gym.Env):
         self.step_async(actions)
         return self.step_wait()
 
+    def _split_actions(self, actions):
+        # Actions may be given as a batch (e.g. a dict of arrays for a `Dict`
+        # action space, as returned by a policy), or as a list of actions
+        if is_batch(actions, self.single_action_space, self.num_envs):
+            return split(actions, self.single_action_space, self.num_envs)
+        return actions
+
     def __del__(self):
         if hasattr(self, 'closed'):
             if not self.closed:
                 self.close()
+
+
+class VectorWrapper(VectorEnv):
+    """Wraps a vectorized environment to allow a modular transformation of
+    its batches of observations, rewards and actions, in the main process.
+
+    This is the vectorized counterpart of `gym.Wrapper`: a transformation is
+    applied once to the whole batch, instead of once per environment inside
+    each worker. The subclasses `VectorObservationWrapper`,
+    `VectorRewardWrapper` and `VectorActionWrapper` only need to implement
+    `observation`, `reward` or `action` respectively.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment to wrap.
+    """
+    def __init__(self, env):
+        assert isinstance(env, VectorEnv)
+        self.env = env
+        self.num_envs = env.num_envs
+        self.observation_space = env.observation_space
+        self.action_space = env.action_space
+        self.single_observation_space = env.single_observation_space
+        self.single_action_space = env.single_action_space
+        self.reward_range = env.reward_range
+        self.metadata = env.metadata
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError("attempted to get missing private attribute '{}'".format(name))
+        return getattr(self.env, name)
+
+    @property
+    def unwrapped(self):
+        return self.env.unwrapped
+
+    def reset_async(self):
+        return self.env.reset_async()
+
+    def reset_wait(self, **kwargs):
+        return self.env.reset_wait(**kwargs)
+
+    def step_async(self, actions):
+        return self.env.step_async(actions)
+
+    def step_wait(self, **kwargs):
+        return self.env.step_wait(**kwargs)
+
+    def seed(self, seeds=None):
+        return self.env.seed(seeds)
+
+    def render(self, mode='human', **kwargs):
+        return self.env.render(mode, **kwargs)
+
+    def close(self, **kwargs):
+        return self.env.close(**kwargs)
+
+    def __del__(self):
+        # The wrapped environment is closed when it is garbage collected
+        pass
+
+    def __str__(self):
+        return '<{}{}>'.format(type(self).__name__, self.env)
+
+    def __repr__(self):
+        return str(self)
+
+
+class VectorObservationWrapper(VectorWrapper):
+    """Transforms the batch of observations with `observation`. """
+    def reset_wait(self, **kwargs):
+        observations = self.env.reset_wait(**kwargs)
+        return self.observation(observations)
+
+    def step_wait(self, **kwargs):
+        observations, rewards, dones, infos = self.env.step_wait(**kwargs)
+        return self.observation(observations), rewards, dones, infos
+
+    def observation(self, observations):
+        raise NotImplementedError()
+
+
+class VectorRewardWrapper(VectorWrapper):
+    """Transforms the array of rewards with `reward`. """
+    def step_wait(self, **kwargs):
+        observations, rewards, dones, infos = self.env.step_wait(**kwargs)
+        return observations, self.reward(rewards), dones, infos
+
+    def reward(self, rewards):
+        raise NotImplementedError()
+
+
+class VectorActionWrapper(VectorWrapper):
+    """Transforms the batch of actions with `action`, before sending them to
+    the wrapped environment. """
+    def step_async(self, actions):
+        return self.env.step_async(self.action(actions))
+
+    def action(self, actions):
+        raise NotImplementedError()
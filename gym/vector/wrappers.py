@@ -0,0 +1,471 @@
+"""Batched versions of some of the wrappers of `gym.wrappers`. They operate on
+the outputs of a vectorized environment (`SyncVectorEnv` or `AsyncVectorEnv`)
+in the main process, and transform the whole batch at once (in a single
+vectorized call where possible), instead of once per environment inside each
+worker.
+"""
+import numpy as np
+
+from gym import spaces
+from gym.spaces import one_hot_dim, one_hot_encode
+from gym.vector.vector_env import (VectorWrapper, VectorObservationWrapper,
+    VectorRewardWrapper, VectorActionWrapper)
+from gym.wrappers.frame_stack import FrameBuffer
+from gym.wrappers.image_preprocessing import ImagePreprocessor
+from gym.wrappers.normalize import RunningMeanStd
+from gym.wrappers.record_episode_statistics import (EpisodeWindow, BGCounter,
+    BG_RANGE)
+
+__all__ = ['GrayScaleObservation', 'ResizeObservation', 'ImagePreprocessing',
+    'TransformReward', 'ClipAction', 'FlattenObservation', 'FrameStack',
+    'RecordEpisodeStatistics', 'NormalizeObservation', 'NormalizeReward',
+    'OneHotObservation']
+
+# Fixed-point coefficients of the RGB to gray scale conversion of OpenCV
+# (`cv2.cvtColor(..., cv2.COLOR_RGB2GRAY)`), for identical results without it
+_GRAY_COEFFICIENTS = np.array([9798, 19235, 3735], dtype=np.uint32)
+_GRAY_SHIFT = 15
+
+
+class GrayScaleObservation(VectorObservationWrapper):
+    """Convert a batch of RGB image observations, of shape `(n, h, w, 3)`, to
+    gray scale, with the same results as `gym.wrappers.GrayScaleObservation`.
+    The whole batch is converted in a single call to OpenCV, as one tall
+    image, or with numpy if OpenCV is not installed.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with RGB image observations (`np.uint8`).
+
+    keep_dim : bool (default: `False`)
+        If `True`, the observations have shape `(n, h, w, 1)`, otherwise
+        `(n, h, w)`.
+    """
+    def __init__(self, env, keep_dim=False):
+        super(GrayScaleObservation, self).__init__(env)
+        self.keep_dim = keep_dim
+        shape = self.single_observation_space.shape
+        assert len(shape) == 3 and shape[-1] == 3
+        shape = shape[:2] + ((1,) if keep_dim else ())
+        try:
+            self._preprocessor = ImagePreprocessor(
+                self.single_observation_space.shape, grayscale=True, n=self.num_envs)
+        except ImportError:
+            self._preprocessor = _rgb_to_gray
+        self.single_observation_space = spaces.Box(low=0, high=255,
+            shape=shape, dtype=np.uint8)
+        self.observation_space = spaces.Box(low=0, high=255,
+            shape=(self.num_envs,) + shape, dtype=np.uint8)
+
+    def observation(self, observations):
+        gray = self._preprocessor(observations)
+        return gray[..., None] if self.keep_dim else gray
+
+
+def _rgb_to_gray(images):
+    gray = np.tensordot(images, _GRAY_COEFFICIENTS, axes=([-1], [0]))
+    gray += 1 << (_GRAY_SHIFT - 1)
+    gray >>= _GRAY_SHIFT
+    return gray.astype(np.uint8)
+
+
+class ResizeObservation(VectorObservationWrapper):
+    """Downsample a batch of image observations, of shape `(n, h, w, c)` or
+    `(n, h, w)`, with the same results as `gym.wrappers.ResizeObservation`.
+    The images are resized with OpenCV directly into a preallocated batch (see
+    `gym.wrappers.image_preprocessing.ImagePreprocessor`).
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with image observations.
+
+    shape : int, or tuple of int
+        Shape `(height, width)` of the resized images (square if an int).
+
+    copy : bool (default: `True`)
+        If `True`, a copy of the batch is returned. Otherwise the batch itself
+        is returned, and is overwritten by the next call to `reset` or `step`.
+    """
+    def __init__(self, env, shape, copy=True):
+        super(ResizeObservation, self).__init__(env)
+        if isinstance(shape, int):
+            shape = (shape, shape)
+        assert all(x > 0 for x in shape), shape
+        self.shape = tuple(shape)
+        self.copy = copy
+
+        # Resizing the images one at a time is faster than stacking them along
+        # the channel axis (which requires two transposed copies of the batch)
+        self._preprocessor = ImagePreprocessor(self.single_observation_space.shape,
+            resize=self.shape, n=self.num_envs, copy=copy)
+        obs_shape = self.shape + self.single_observation_space.shape[2:]
+        self.single_observation_space = spaces.Box(low=0, high=255,
+            shape=obs_shape, dtype=np.uint8)
+        self.observation_space = spaces.Box(low=0, high=255,
+            shape=(self.num_envs,) + obs_shape, dtype=np.uint8)
+
+    def observation(self, observations):
+        return self._preprocessor(observations)
+
+
+class ImagePreprocessing(VectorObservationWrapper):
+    """Convert a batch of RGB image observations, of shape `(n, h, w, 3)`, to
+    gray scale (optionally) and resize them to square images, in a single
+    stage over preallocated buffers (see
+    `gym.wrappers.image_preprocessing.ImagePreprocessor`). This is the
+    observation processing of `gym.wrappers.AtariPreprocessing`, on frames
+    converted to gray scale by OpenCV instead of the emulator.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with RGB image observations (`np.uint8`).
+
+    screen_size : int (default: 84)
+        Size of the square output images.
+
+    grayscale_obs : bool (default: `True`)
+        If `True`, the observations are converted to gray scale, and have shape
+        `(n, screen_size, screen_size)`. Otherwise they have shape
+        `(n, screen_size, screen_size, 3)`.
+
+    copy : bool (default: `True`)
+        If `True`, a copy of the batch is returned. Otherwise the batch itself
+        is returned, and is overwritten by the next call to `reset` or `step`.
+    """
+    def __init__(self, env, screen_size=84, grayscale_obs=True, copy=True):
+        super(ImagePreprocessing, self).__init__(env)
+        self._preprocessor = ImagePreprocessor(self.single_observation_space.shape,
+            grayscale=grayscale_obs, resize=(screen_size, screen_size),
+            n=self.num_envs, copy=copy)
+        obs_shape = self._preprocessor.output_shape
+        self.single_observation_space = spaces.Box(low=0, high=255,
+            shape=obs_shape, dtype=np.uint8)
+        self.observation_space = spaces.Box(low=0, high=255,
+            shape=(self.num_envs,) + obs_shape, dtype=np.uint8)
+
+    def observation(self, observations):
+        return self._preprocessor(observations)
+
+
+class TransformReward(VectorRewardWrapper):
+    """Transform the array of rewards via an arbitrary function.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment.
+
+    f : callable
+        Function transforming the array of rewards, of shape `(n,)`. It must
+        operate on whole arrays (e.g. `np.sign`, or `lambda r: 0.01 * r`).
+    """
+    def __init__(self, env, f):
+        super(TransformReward, self).__init__(env)
+        assert callable(f)
+        self.f = f
+
+    def reward(self, rewards):
+        return self.f(rewards)
+
+
+class ClipAction(VectorActionWrapper):
+    """Clip the batch of continuous actions within the bounds of the action
+    space of a single environment.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with a `Box` action space.
+    """
+    def __init__(self, env):
+        assert isinstance(env.single_action_space, spaces.Box)
+        super(ClipAction, self).__init__(env)
+
+    def action(self, actions):
+        return np.clip(np.asarray(actions), self.single_action_space.low,
+            self.single_action_space.high)
+
+
+class FlattenObservation(VectorObservationWrapper):
+    """Flatten the batch of observations into an array of shape
+    `(n, flatdim)`, with a precompiled `gym.spaces.FlattenPlan`.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment.
+
+    copy : bool (default: `True`)
+        If `True`, a new array is returned. Otherwise the observations are
+        written into a buffer, which is overwritten by the next call to
+        `reset` or `step`.
+    """
+    def __init__(self, env, copy=True):
+        super(FlattenObservation, self).__init__(env)
+        self.copy = copy
+        self.flatten_plan = spaces.FlattenPlan(self.single_observation_space,
+            dtype=np.float32)
+        flatdim = self.flatten_plan.flatdim
+        self.single_observation_space = spaces.Box(low=-float('inf'),
+            high=float('inf'), shape=(flatdim,), dtype=np.float32)
+        self.observation_space = spaces.Box(low=-float('inf'),
+            high=float('inf'), shape=(self.num_envs, flatdim), dtype=np.float32)
+        self._buffer = np.empty((self.num_envs, flatdim), dtype=np.float32)
+
+    def observation(self, observations):
+        if self.copy:
+            return self.flatten_plan.flatten_batch(observations)
+        return self.flatten_plan.flatten_batch(observations, out=self._buffer)
+
+
+class FrameStack(VectorWrapper):
+    """Stack the last `num_stack` observations of each environment, into a
+    batch of shape `(n, num_stack) + shape`. The frames are kept in a single
+    preallocated circular `gym.wrappers.frame_stack.FrameBuffer`, so the
+    stacked batch is a view of the buffer, and is never stacked again.
+
+    When an environment is done (and is automatically reset by the vectorized
+    environment), its stack is filled with the first observation of the new
+    episode, like `gym.wrappers.FrameStack` does on `reset`.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with a `Box` observation space.
+
+    num_stack : int
+        Number of stacked observations.
+
+    copy : bool (default: `True`)
+        If `True`, a copy of the stacked batch is returned. Otherwise a view
+        of the buffer is returned, which is overwritten by the next call to
+        `reset` or `step`.
+    """
+    def __init__(self, env, num_stack, copy=True):
+        super(FrameStack, self).__init__(env)
+        assert isinstance(self.single_observation_space, spaces.Box)
+        self.num_stack = num_stack
+        self.copy = copy
+
+        space = self.single_observation_space
+        self.frame_buffer = FrameBuffer(space.shape, space.dtype, num_stack,
+            n=self.num_envs)
+        low = np.repeat(space.low[np.newaxis, ...], num_stack, axis=0)
+        high = np.repeat(space.high[np.newaxis, ...], num_stack, axis=0)
+        self.single_observation_space = spaces.Box(low=low, high=high,
+            dtype=space.dtype)
+        self.observation_space = spaces.Box(
+            low=np.repeat(low[np.newaxis, ...], self.num_envs, axis=0),
+            high=np.repeat(high[np.newaxis, ...], self.num_envs, axis=0),
+            dtype=space.dtype)
+
+    def _get_observations(self):
+        observations = self.frame_buffer.stack()
+        return observations.copy() if self.copy else observations
+
+    def reset_wait(self, **kwargs):
+        observations = self.env.reset_wait(**kwargs)
+        self.frame_buffer.reset(observations)
+        return self._get_observations()
+
+    def step_wait(self, **kwargs):
+        observations, rewards, dones, infos = self.env.step_wait(**kwargs)
+        self.frame_buffer.append(observations)
+        if np.any(dones):
+            self.frame_buffer.reset(observations, mask=np.asarray(dones, dtype=np.bool_))
+        return self._get_observations(), rewards, dones, infos
+
+
+class RecordEpisodeStatistics(VectorWrapper):
+    """Record the return and the length of the episodes of each environment,
+    like `gym.wrappers.RecordEpisodeStatistics`. The running returns and
+    lengths are arrays of shape `(n,)`, updated for the whole batch at once;
+    only the environments which are done are visited, to add the statistics
+    of their episode to their `info['episode']`, and to the window of the
+    most recent episodes (shared by all the environments).
+
+    For the diabetes environments, the time in range and the minutes in hypo-
+    and hyperglycemia are also counted, from the blood glucose trace of each
+    step (`info['bg']`). The traces of all the environments are gathered and
+    counted at once, at every step (the environments without a trace in their
+    `info` are skipped).
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment.
+
+    window_size : int (default: 100)
+        Number of episodes kept in the window.
+
+    bg_range : tuple (default: `(70, 180)`)
+        Target range `(low, high)` of blood glucose, in mg/dL.
+    """
+    def __init__(self, env, window_size=100, bg_range=BG_RANGE):
+        super(RecordEpisodeStatistics, self).__init__(env)
+        self.episode_window = EpisodeWindow(window_size)
+        self.bg_counter = BGCounter(self.num_envs, bg_range)
+        self.episode_returns = np.zeros(self.num_envs, dtype=np.float64)
+        self.episode_lengths = np.zeros(self.num_envs, dtype=np.int64)
+
+    def reset_wait(self, **kwargs):
+        self.episode_returns[:] = 0.
+        self.episode_lengths[:] = 0
+        self.bg_counter.reset()
+        return self.env.reset_wait(**kwargs)
+
+    def step_wait(self, **kwargs):
+        observations, rewards, dones, infos = self.env.step_wait(**kwargs)
+        self.episode_returns += rewards
+        self.episode_lengths += 1
+        # Some environments may have no trace, e.g. a worker of an
+        # `AsyncVectorEnv` restarted with `auto_restart=True`
+        self.bg_counter.update_batch([info.get('bg') for info in infos])
+
+        for i in np.flatnonzero(dones):
+            episode = {'r': float(self.episode_returns[i]),
+                'l': int(self.episode_lengths[i])}
+            if self.bg_counter.minutes[i]:
+                episode.update(self.bg_counter.episode(i))
+            infos[i]['episode'] = episode
+            self.episode_window.add(episode)
+        if np.any(dones):
+            dones = np.asarray(dones, dtype=np.bool_)
+            self.episode_returns[dones] = 0.
+            self.episode_lengths[dones] = 0
+            self.bg_counter.reset(dones)
+        return observations, rewards, dones, infos
+
+
+class NormalizeObservation(VectorObservationWrapper):
+    """Normalize the batch of observations to zero mean and unit variance,
+    like `gym.wrappers.NormalizeObservation`. The running statistics (a
+    `gym.wrappers.normalize.RunningMeanStd`) are shared by all the
+    environments, and are updated once per batch.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with a `Box` observation space.
+
+    epsilon : float (default: `1e-8`)
+        Added to the variance, to avoid divisions by zero.
+
+    update_stats : bool (default: `True`)
+        If `False`, the statistics are not updated (e.g. for evaluation, with
+        statistics loaded with `load`).
+    """
+    def __init__(self, env, epsilon=1e-8, update_stats=True):
+        super(NormalizeObservation, self).__init__(env)
+        self.epsilon = epsilon
+        self.update_stats = update_stats
+        shape = self.single_observation_space.shape
+        self.obs_rms = RunningMeanStd(shape=shape)
+        self.single_observation_space = spaces.Box(low=-np.inf, high=np.inf,
+            shape=shape, dtype=np.float32)
+        self.observation_space = spaces.Box(low=-np.inf, high=np.inf,
+            shape=(self.num_envs,) + shape, dtype=np.float32)
+
+    def observation(self, observations):
+        observations = np.asarray(observations)
+        if self.update_stats:
+            self.obs_rms.update(observations)
+        normalized = (observations - self.obs_rms.mean) / np.sqrt(self.obs_rms.var + self.epsilon)
+        return normalized.astype(np.float32)
+
+    def save(self, path):
+        """Save the observation statistics to a `.npz` file. """
+        self.obs_rms.save(path)
+
+    def load(self, path):
+        """Load observation statistics saved with `save`. """
+        self.obs_rms.load(path)
+
+
+class NormalizeReward(VectorWrapper):
+    """Scale the array of rewards by the standard deviation of the discounted
+    return, like `gym.wrappers.NormalizeReward`. The discounted returns are
+    tracked per environment (and reset when the environment is done), and the
+    statistics are shared by all the environments.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment.
+
+    gamma : float (default: `0.99`)
+        Discount factor of the returns.
+
+    epsilon : float (default: `1e-8`)
+        Added to the variance, to avoid divisions by zero.
+
+    update_stats : bool (default: `True`)
+        If `False`, the statistics are not updated.
+    """
+    def __init__(self, env, gamma=0.99, epsilon=1e-8, update_stats=True):
+        super(NormalizeReward, self).__init__(env)
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.update_stats = update_stats
+        self.return_rms = RunningMeanStd(shape=())
+        self.returns = np.zeros((self.num_envs,), dtype=np.float64)
+
+    def reset_wait(self, **kwargs):
+        self.returns[:] = 0.
+        return self.env.reset_wait(**kwargs)
+
+    def step_wait(self, **kwargs):
+        observations, rewards, dones, infos = self.env.step_wait(**kwargs)
+        self.returns = self.returns * self.gamma + rewards
+        if self.update_stats:
+            self.return_rms.update(self.returns)
+        rewards = rewards / np.sqrt(self.return_rms.var + self.epsilon)
+        self.returns[np.asarray(dones, dtype=np.bool_)] = 0.
+        return observations, rewards, dones, infos
+
+    def save(self, path):
+        """Save the return statistics to a `.npz` file. """
+        self.return_rms.save(path)
+
+    def load(self, path):
+        """Load return statistics saved with `save`. """
+        self.return_rms.load(path)
+
+
+class OneHotObservation(VectorObservationWrapper):
+    """One-hot encode the batch of observations of a `Discrete` or
+    `MultiDiscrete` observation space, at once, into a preallocated buffer of
+    shape `(n, dim)`, like `gym.wrappers.OneHotObservation`.
+
+    Parameters
+    ----------
+    env : `gym.vector.VectorEnv` instance
+        Vectorized environment, with a `Discrete` or `MultiDiscrete`
+        observation space.
+
+    dtype : data-type (default: `np.float32`)
+        Data type of the one-hot encoded observations.
+
+    copy : bool (default: `True`)
+        If `True`, a copy of the buffer is returned. Otherwise the buffer
+        itself is returned, and is overwritten by the next call to `reset` or
+        `step`.
+    """
+    def __init__(self, env, dtype=np.float32, copy=True):
+        super(OneHotObservation, self).__init__(env)
+        self.copy = copy
+        self._space = self.single_observation_space
+        assert isinstance(self._space, (spaces.Discrete, spaces.MultiDiscrete))
+        dim = one_hot_dim(self._space)
+        self.single_observation_space = spaces.Box(low=0, high=1, shape=(dim,),
+            dtype=dtype)
+        self.observation_space = spaces.Box(low=0, high=1,
+            shape=(self.num_envs, dim), dtype=dtype)
+        self._buffer = np.zeros((self.num_envs, dim), dtype=dtype)
+
+    def observation(self, observations):
+        one_hot_encode(self._space, observations, out=self._buffer)
+        return self._buffer.copy() if self.copy else self._buffer
@@ -8,6 +8,13 @@ from gym.wrappers.flatten_observation import FlattenObservation
 from gym.wrappers.gray_scale_observation import GrayScaleObservation
 from gym.wrappers.frame_stack import LazyFrames
 from gym.wrappers.frame_stack import FrameStack
+from gym.wrappers.frame_store import FrameStore
 from gym.wrappers.transform_reward import TransformReward
 from gym.wrappers.resize_observation import ResizeObservation
 from gym.wrappers.clip_action import ClipAction
+from gym.wrappers.quantize_observation import QuantizeObservation
+from gym.wrappers.one_hot_observation import OneHotObservation
+from gym.wrappers.fused_wrapper import FusedWrapper
+from gym.wrappers.normalize import NormalizeObservation, NormalizeReward
+from gym.wrappers.action_repeat import ActionRepeat
+from gym.wrappers.record_episode_statistics import RecordEpisodeStatistics
@@ -0,0 +1,95 @@
+import numpy as np
+
+from gym import Wrapper
+
+
+def _has_step_n(env):
+    # `step_n` is looked up on the class: through `Wrapper.__getattr__`, the
+    # `step_n` of a wrapped environment would bypass the wrappers in between
+    return callable(getattr(type(env), 'step_n', None))
+
+
+def repeat_step(env, action, n):
+    r"""Take the same action `n` times in `env`, stopping early if the
+    episode is done. Calls `env.step_n(action, n)` if the environment
+    implements it (e.g. the diabetes environments, which simulate the `n`
+    intervals in a single integration), and `env.step` `n` times otherwise.
+
+    Returns the last observation, the sum of the rewards, done and the last
+    info, with the number of steps taken in `info['num_steps']`.
+    """
+    if _has_step_n(env):
+        return env.step_n(action, n)
+    total_reward = 0.
+    for num_steps in range(1, n + 1):
+        observation, reward, done, info = env.step(action)
+        total_reward += reward
+        if done:
+            break
+    info['num_steps'] = num_steps
+    return observation, total_reward, done, info
+
+
+class ActionRepeat(Wrapper):
+    r"""Repeat each action for `num_repeats` steps, and sum the rewards (the
+    episode stops at the first step which is done).
+
+    If the wrapped environment implements `step_n(action, n)`, the repeated
+    steps are taken with a single call to it: e.g. the diabetes environments
+    integrate the `num_repeats` intervals at once, and :class:`TimeLimit`
+    forwards the call to the environment it wraps (without going past the
+    time limit). Otherwise `step` is called in a loop.
+
+    With `observation_reduce='max'`, the observation is the pixel-wise maximum
+    of the last two observations (as in :class:`AtariPreprocessing`), computed
+    into buffers preallocated once. The repeated steps are then always taken
+    with `step`, since `step_n` only returns the last observation.
+
+    Example::
+
+        >>> env = ActionRepeat(gym.make('HovorkaCambridge-v0'), num_repeats=4)
+        >>> env.reset()
+        >>> observation, reward, done, info = env.step(env.action_space.sample())
+        >>> info['num_steps']
+        4
+
+    Args:
+        env (Env): environment
+        num_repeats (int): number of steps each action is repeated for
+        observation_reduce (str): `'last'` to return the last observation, or
+            `'max'` for the maximum of the last two observations
+        copy (bool): if True (with `observation_reduce='max'`), a copy of the
+            observation buffer is returned. Otherwise the buffer itself is
+            returned, and is overwritten by the next step
+    """
+    def __init__(self, env, num_repeats, observation_reduce='last', copy=True):
+        super(ActionRepeat, self).__init__(env)
+        assert num_repeats >= 1, num_repeats
+        assert observation_reduce in ('last', 'max'), observation_reduce
+        self.num_repeats = num_repeats
+        self.observation_reduce = observation_reduce
+        self.copy = copy
+        if observation_reduce == 'max':
+            space = env.observation_space
+            self._obs_buffer = np.empty((2,) + space.shape, dtype=space.dtype)
+
+    def step(self, action):
+        if self.observation_reduce == 'last':
+            return repeat_step(self.env, action, self.num_repeats)
+
+        total_reward = 0.
+        for num_steps in range(1, self.num_repeats + 1):
+            observation, reward, done, info = self.env.step(action)
+            total_reward += reward
+            self._obs_buffer[num_steps % 2] = observation
+            if done:
+                break
+        info['num_steps'] = num_steps
+        if num_steps > 1:
+            observation = np.maximum(self._obs_buffer[0], self._obs_buffer[1],
+                out=self._obs_buffer[num_steps % 2])
+        else:
+            observation = self._obs_buffer[1]
+        if self.copy:
+            observation = observation.copy()
+        return observation, total_reward, done, info
@@ -3,6 +3,7 @@ import numpy as np
 import gym
 from gym.spaces import Box
 from gym.wrappers import TimeLimit
+from gym.wrappers.image_preprocessing import ImagePreprocessor
 
 
 
@@ -55,6 +56,10 @@ class AtariPreprocessing(gym.Wrapper):
             self.obs_buffer = [np.empty(env.observation_space.shape, dtype=np.uint8),
                                np.empty(env.observation_space.shape, dtype=np.uint8)]
 
+        # max-pooling and resizing, over preallocated buffers
+        self._preprocessor = ImagePreprocessor(self.obs_buffer[0].shape,
+            resize=(screen_size, screen_size), max_pool=frame_skip > 1)
+
         self.ale = env.unwrapped.ale
         self.lives = 0
         self.game_over = False
@@ -115,9 +120,4 @@ class AtariPreprocessing(gym.Wrapper):
         return self._get_obs()
 
     def _get_obs(self):
-        import cv2
-        if self.frame_skip > 1:  # more efficient in-place pooling
-            np.maximum(self.obs_buffer[0], self.obs_buffer[1], out=self.obs_buffer[0])
-        obs = cv2.resize(self.obs_buffer[0], (self.screen_size, self.screen_size), interpolation=cv2.INTER_AREA)
-        obs = np.asarray(obs, dtype=np.uint8)
-        return obs
+        return self._preprocessor(self.obs_buffer[0], self.obs_buffer[1])
@@ -4,12 +4,17 @@ from gym import ObservationWrapper
 
 
 class FlattenObservation(ObservationWrapper):
-    r"""Observation wrapper that flattens the observation."""
+    r"""Observation wrapper that flattens the observation.
+
+    The flattening plan of the observation space (offsets of the leaves, sizes
+    of the one-hot encodings) is compiled once, at construction.
+    """
     def __init__(self, env):
         super(FlattenObservation, self).__init__(env)
 
-        flatdim = spaces.flatdim(env.observation_space)
+        self.flatten_plan = spaces.FlattenPlan(env.observation_space, dtype=np.float32)
+        flatdim = self.flatten_plan.flatdim
         self.observation_space = spaces.Box(low=-float('inf'), high=float('inf'), shape=(flatdim,), dtype=np.float32)
 
     def observation(self, observation):
-        return spaces.flatten(self.observation_space, observation)
+        return self.flatten_plan.flatten(observation)
@@ -1,64 +1,177 @@
-from collections import deque
+from collections import deque, OrderedDict
 import numpy as np
 
 from gym.spaces import Box
 from gym import ObservationWrapper
 
 
+class FrameBuffer(object):
+    r"""Circular buffer of the last `num_stack` frames, preallocated once.
+
+    Each frame is written twice, at positions `i` and `i + num_stack` of a
+    buffer of `2 * num_stack` frames, so the last `num_stack` frames are always
+    contiguous, and are available as a view of the buffer (see `stack`),
+    without stacking them again at every step.
+
+    With `n` set, the buffer holds the frames of a batch of `n` environments,
+    and the stacked frames have shape `(n, num_stack) + shape`.
+
+    Args:
+        shape (tuple): shape of a single frame
+        dtype (data-type): data type of the frames
+        num_stack (int): number of stacked frames
+        n (int): number of environments, or `None` for a single environment
+    """
+    def __init__(self, shape, dtype, num_stack, n=None):
+        self.num_stack = num_stack
+        self.n = n
+        self._axis = 0 if n is None else 1
+        batch_shape = (2 * num_stack,) if n is None else (n, 2 * num_stack)
+        self._frames = np.zeros(batch_shape + tuple(shape), dtype=dtype)
+        self._start = 0
+
+    def _index(self, i):
+        return (slice(None),) * self._axis + (i,)
+
+    def reset(self, frame, mask=None):
+        r"""Fill the whole buffer with `frame`. With a batch of environments,
+        only the environments selected by the boolean array `mask` are reset
+        (all of them if `mask` is `None`). """
+        if mask is None:
+            self._frames[...] = np.expand_dims(frame, self._axis)
+        else:
+            self._frames[mask] = np.expand_dims(np.asarray(frame)[mask], 1)
+
+    def append(self, frame):
+        r"""Push a new frame (or a batch of frames), replacing the oldest one. """
+        self._frames[self._index(self._start)] = frame
+        self._frames[self._index(self._start + self.num_stack)] = frame
+        self._start = (self._start + 1) % self.num_stack
+
+    def stack(self):
+        r"""View of the last `num_stack` frames, from the oldest to the most
+        recent one. The view is overwritten by the next call to `reset` or
+        `append`. """
+        return self._frames[self._index(slice(self._start,
+            self._start + self.num_stack))]
+
+
+class _DecompressionCache(object):
+    # Least recently used decompressed frames, keyed by their compressed
+    # payload (`bytes` objects cache their hash, so lookups are cheap)
+    def __init__(self, maxsize):
+        from lz4.block import decompress
+        self._decompress = decompress
+        self.maxsize = maxsize
+        self._frames = OrderedDict()
+
+    def decompress(self, payload, shape, dtype):
+        try:
+            frame = self._frames.pop(payload)
+        except KeyError:
+            frame = np.frombuffer(self._decompress(payload), dtype=dtype).reshape(shape)
+            if len(self._frames) >= self.maxsize:
+                self._frames.popitem(last=False)
+        self._frames[payload] = frame
+        return frame
+
+
 class LazyFrames(object):
-    r"""Ensures common frames are only stored once to optimize memory use. 
+    r"""Ensures common frames are only stored once to optimize memory use.
 
-    To further reduce the memory use, it is optionally to turn on lz4 to 
-    compress the observations.
+    To further reduce the memory use, it is optionally to turn on lz4 to
+    compress the observations. Each frame is then decompressed on demand, and
+    the decompressed frames are cached, so frames shared by consecutive
+    observations are only decompressed once.
+
+    The length and the individual frames (e.g. `frames[-1]`) are accessed
+    without stacking all the frames. When pickled, only the (compressed)
+    frames are serialized, without the decompression cache.
 
     .. note::
 
-        This object should only be converted to numpy array just before forward pass. 
+        This object should only be converted to numpy array just before forward pass.
 
     """
     def __init__(self, frames, lz4_compress=False):
+        self.shape = frames[0].shape
+        self.dtype = frames[0].dtype
         if lz4_compress:
             from lz4.block import compress
-            self.shape = frames[0].shape
-            self.dtype = frames[0].dtype
             frames = [compress(frame) for frame in frames]
         self._frames = frames
         self.lz4_compress = lz4_compress
+        self._cache = _DecompressionCache(len(frames)) if lz4_compress else None
+
+    @classmethod
+    def _from_frame_stack(cls, frames, lz4_compress, shape, dtype, cache):
+        # The frames are already compressed (if needed) by `FrameStack`, which
+        # also shares its decompression cache
+        self = cls.__new__(cls)
+        self.shape, self.dtype = shape, dtype
+        self._frames = frames
+        self.lz4_compress = lz4_compress
+        self._cache = cache
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_cache']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache = _DecompressionCache(len(self._frames)) \
+            if self.lz4_compress else None
+
+    def frame(self, i):
+        r"""Return the `i`-th frame, as a read-only array. """
+        frame = self._frames[i]
+        if self.lz4_compress:
+            return self._cache.decompress(frame, self.shape, self.dtype)
+        frame = np.asarray(frame).view()
+        frame.flags.writeable = False
+        return frame
 
     def __array__(self, dtype=None):
-        if self.lz4_compress:
-            from lz4.block import decompress
-            frames = [np.frombuffer(decompress(frame), dtype=self.dtype).reshape(self.shape) for frame in self._frames]
-        else:
-            frames = self._frames
-        out = np.stack(frames, axis=0)
-        if dtype is not None:
-            out = out.astype(dtype)
+        if not self.lz4_compress:
+            return np.array(self._frames, dtype=dtype)
+        out = np.empty((len(self._frames),) + tuple(self.shape),
+            dtype=self.dtype if dtype is None else dtype)
+        for i in range(len(self._frames)):
+            out[i] = self.frame(i)
         return out
 
     def __len__(self):
-        return len(self.__array__())
+        return len(self._frames)
 
     def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return self.frame(i)
         return self.__array__()[i]
 
 
 class FrameStack(ObservationWrapper):
-    r"""Observation wrapper that stacks the observations in a rolling manner. 
+    r"""Observation wrapper that stacks the observations in a rolling manner.
 
     For example, if the number of stacks is 4, then the returned observation contains
     the most recent 4 observations. For environment 'Pendulum-v0', the original observation
     is an array with shape [3], so if we stack 4 observations, the processed observation
-    has shape [3, 4]. 
+    has shape [4, 3].
 
     .. note::
 
         To be memory efficient, the stacked observations are wrapped by :class:`LazyFrame`.
 
+    .. note::
+
+        For replay buffers, a shared :class:`FrameStore` stores each frame only once,
+        and the observations can be stored as tuples of frame IDs (see `frame_ids`).
+
     .. note::
 
         The observation space must be `Box` type. If one uses `Dict`
-        as observation space, it should apply `FlattenDictWrapper` at first. 
+        as observation space, it should apply `FlattenDictWrapper` at first.
 
     Example::
 
@@ -71,29 +184,71 @@ class FrameStack(ObservationWrapper):
     Args:
         env (Env): environment object
         num_stack (int): number of stacks
+        lz4_compress (bool): use lz4 to compress the frames. Each frame is only
+            compressed once, when it is observed
+        frame_store (FrameStore): if given, each new frame is also added to this
+            :class:`FrameStore`, and the frame IDs of the current observation
+            are available in `frame_ids`
 
     """
-    def __init__(self, env, num_stack, lz4_compress=False):
+    def __init__(self, env, num_stack, lz4_compress=False, frame_store=None):
         super(FrameStack, self).__init__(env)
         self.num_stack = num_stack
         self.lz4_compress = lz4_compress
 
         self.frames = deque(maxlen=num_stack)
+        self._shape = self.observation_space.shape
+        self._dtype = self.observation_space.dtype
+        if frame_store is not None:
+            assert frame_store.shape == self._shape, (frame_store.shape, self._shape)
+            assert frame_store.dtype == self._dtype, (frame_store.dtype, self._dtype)
+        self.frame_store = frame_store
+        self._frame_ids = deque(maxlen=num_stack)
+        if lz4_compress:
+            from lz4.block import compress
+            self._compress = compress
+            self._cache = _DecompressionCache(num_stack + 1)
+        else:
+            self._cache = None
 
         low = np.repeat(self.observation_space.low[np.newaxis, ...], num_stack, axis=0)
         high = np.repeat(self.observation_space.high[np.newaxis, ...], num_stack, axis=0)
         self.observation_space = Box(low=low, high=high, dtype=self.observation_space.dtype)
 
+    def _frame(self, observation):
+        # The frames are stored with the data type of the observation space,
+        # like the frame buffer
+        frame = np.asarray(observation, dtype=self._dtype)
+        if self.lz4_compress:
+            return self._compress(np.ascontiguousarray(frame))
+        return frame
+
+    @property
+    def frame_ids(self):
+        r"""Tuple of the IDs, in `frame_store`, of the frames of the current
+        observation (from the oldest to the most recent frame), or `None`
+        without a `frame_store`. """
+        if self.frame_store is None:
+            return None
+        return tuple(self._frame_ids)
+
     def _get_observation(self):
         assert len(self.frames) == self.num_stack, (len(self.frames), self.num_stack)
-        return LazyFrames(list(self.frames), self.lz4_compress)
+        return LazyFrames._from_frame_stack(list(self.frames), self.lz4_compress,
+            self._shape, self._dtype, self._cache)
 
     def step(self, action):
         observation, reward, done, info = self.env.step(action)
-        self.frames.append(observation)
+        self.frames.append(self._frame(observation))
+        if self.frame_store is not None:
+            self._frame_ids.append(self.frame_store.add(observation))
         return self._get_observation(), reward, done, info
 
     def reset(self, **kwargs):
         observation = self.env.reset(**kwargs)
-        [self.frames.append(observation) for _ in range(self.num_stack)]
+        frame = self._frame(observation)
+        [self.frames.append(frame) for _ in range(self.num_stack)]
+        if self.frame_store is not None:
+            frame_id = self.frame_store.add(observation)
+            [self._frame_ids.append(frame_id) for _ in range(self.num_stack)]
         return self._get_observation()
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+class FrameStore(object):
+    r"""Table of the frames observed by one or several :class:`FrameStack`
+    wrappers, for replay buffers. Each frame is stored once, and is identified
+    by an integer frame ID, so a stacked observation can be stored as a tuple
+    of `num_stack` frame IDs (see `FrameStack.frame_ids`) instead of
+    `num_stack` frames, also when it is pickled or written to disk.
+
+    The table is circular: frame IDs are increasing, and once `capacity` frames
+    are stored, each new frame replaces the oldest one. The frames are either
+    stored in a numpy array, memory-mapped to `filename` if given, or
+    compressed with lz4.
+
+    Example::
+
+        >>> frame_store = FrameStore((84, 84), np.uint8, capacity=1000000)
+        >>> env = FrameStack(AtariPreprocessing(env), 4, frame_store=frame_store)
+        >>> env.reset()
+        >>> ids = env.frame_ids
+        >>> observation = frame_store.stack(ids)
+
+    Args:
+        shape (tuple): shape of a single frame
+        dtype (data-type): data type of the frames
+        capacity (int): maximum number of frames in the table
+        filename (str): if given, the table is a `np.memmap` backed by this file
+        lz4_compress (bool): compress the frames with lz4 (not compatible with
+            `filename`)
+    """
+    def __init__(self, shape, dtype, capacity, filename=None, lz4_compress=False):
+        if lz4_compress and (filename is not None):
+            raise ValueError('A frame store cannot be both memory-mapped '
+                'and compressed with lz4.')
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.filename = filename
+        self.lz4_compress = lz4_compress
+        self.next_id = 0
+
+        if lz4_compress:
+            from lz4.block import compress, decompress
+            self._compress, self._decompress = compress, decompress
+            self._frames = [None] * capacity
+        elif filename is not None:
+            self._memmap = np.memmap(filename, dtype=self.dtype, mode='w+',
+                shape=(capacity,) + self.shape)
+            self._frames = self._memmap.view(np.ndarray)
+        else:
+            self._frames = np.zeros((capacity,) + self.shape, dtype=self.dtype)
+
+    def __len__(self):
+        return min(self.next_id, self.capacity)
+
+    @property
+    def nbytes(self):
+        r"""Number of bytes used by the stored frames. """
+        if self.lz4_compress:
+            return sum(len(frame) for frame in self._frames if frame is not None)
+        return self._frames.nbytes
+
+    def add(self, frame):
+        r"""Store a frame, and return its frame ID. """
+        frame_id = self.next_id
+        frame = np.asarray(frame, dtype=self.dtype)
+        assert frame.shape == self.shape, (frame.shape, self.shape)
+        if self.lz4_compress:
+            self._frames[frame_id % self.capacity] = self._compress(
+                np.ascontiguousarray(frame))
+        else:
+            self._frames[frame_id % self.capacity] = frame
+        self.next_id += 1
+        return frame_id
+
+    def _slots(self, frame_ids):
+        frame_ids = np.asarray(frame_ids, dtype=np.int64)
+        if np.any(frame_ids >= self.next_id) or np.any(frame_ids < 0):
+            raise KeyError('Unknown frame IDs in {}.'.format(frame_ids))
+        if np.any(frame_ids < self.next_id - self.capacity):
+            raise KeyError('Some frames of {} were overwritten (only the last '
+                '{} frames are stored).'.format(frame_ids, self.capacity))
+        return frame_ids % self.capacity
+
+    def get(self, frame_id):
+        r"""Return the frame with ID `frame_id` (a view of the table, if the
+        frames are not compressed). """
+        slot = int(self._slots(frame_id))
+        if self.lz4_compress:
+            return np.frombuffer(self._decompress(self._frames[slot]),
+                dtype=self.dtype).reshape(self.shape)
+        return self._frames[slot]
+
+    def stack(self, frame_ids, out=None):
+        r"""Stack the frames with the given IDs, e.g. a tuple of frame IDs of
+        shape `(num_stack,)`, or a batch of them, of shape `(batch_size,
+        num_stack)`. The stacked frames have shape `frame_ids.shape + shape`.
+        """
+        slots = self._slots(frame_ids)
+        if not self.lz4_compress:
+            # A single gather from the table, for a whole batch of observations
+            return np.take(self._frames, slots, axis=0, out=out)
+        if out is None:
+            out = np.empty(slots.shape + self.shape, dtype=self.dtype)
+        for index in np.ndindex(*slots.shape):
+            out[index] = np.frombuffer(self._decompress(self._frames[slots[index]]),
+                dtype=self.dtype).reshape(self.shape)
+        return out
+
+    def flush(self):
+        r"""Write the memory-mapped table to disk. """
+        if self.filename is not None:
+            self._memmap.flush()
@@ -0,0 +1,135 @@
+from gym import Wrapper, ObservationWrapper, RewardWrapper, ActionWrapper
+from gym.wrappers.time_limit import TimeLimit
+
+
+def _overrides(env, base, names=('step', 'reset')):
+    return any(getattr(type(env), name) is not getattr(base, name) for name in names)
+
+
+def _layer_kind(env):
+    # Kind of a wrapper whose `step` and `reset` can be fused, or `None`
+    if isinstance(env, ObservationWrapper) and not _overrides(env, ObservationWrapper):
+        return 'observation'
+    elif isinstance(env, RewardWrapper) and not _overrides(env, RewardWrapper):
+        return 'reward'
+    elif isinstance(env, ActionWrapper) and not _overrides(env, ActionWrapper):
+        return 'action'
+    elif isinstance(env, TimeLimit) and not _overrides(env, TimeLimit):
+        return 'time_limit'
+    elif isinstance(env, Wrapper) and not _overrides(env, Wrapper):
+        return 'identity'
+    return None
+
+
+def _compile(layers, inner):
+    # `layers` are ordered from the outermost to the innermost wrapper
+    action_fns = [env.action for (kind, env) in layers if kind == 'action']
+    observation_fns = [env.observation for (kind, env) in reversed(layers)
+        if kind == 'observation']
+    reward_fns = [env.reward for (kind, env) in reversed(layers) if kind == 'reward']
+    time_limits = [env for (kind, env) in reversed(layers) if kind == 'time_limit']
+    inner_step, inner_reset = inner.step, inner.reset
+
+    def step(action):
+        for fn in action_fns:
+            action = fn(action)
+        observation, reward, done, info = inner_step(action)
+        for fn in observation_fns:
+            observation = fn(observation)
+        for fn in reward_fns:
+            reward = fn(reward)
+        for time_limit in time_limits:
+            assert time_limit._elapsed_steps is not None, "Cannot call env.step() before calling reset()"
+            time_limit._elapsed_steps += 1
+            if time_limit._elapsed_steps >= time_limit._max_episode_steps:
+                info['TimeLimit.truncated'] = not done
+                done = True
+        return observation, reward, done, info
+
+    def reset(**kwargs):
+        for time_limit in time_limits:
+            time_limit._elapsed_steps = 0
+        observation = inner_reset(**kwargs)
+        for fn in observation_fns:
+            observation = fn(observation)
+        return observation
+
+    return step, reset
+
+
+class FusedWrapper(Wrapper):
+    r"""Compile a stack of wrappers into a single `step` and a single `reset`
+    function, to remove the overhead of calling each wrapper in turn (which
+    can be as large as the simulation itself for cheap environments like
+    CartPole).
+
+    The wrappers which do not override `step` and `reset` (observation, reward
+    and action wrappers, e.g. :class:`TransformReward` or :class:`ClipAction`),
+    and :class:`TimeLimit`, are fused: their `observation`, `reward` and
+    `action` methods are called directly, from a single Python frame. The
+    first wrapper of the stack with a custom `step` (e.g. :class:`Monitor`)
+    is called as is, together with the wrappers it wraps. The stack is
+    compiled at construction, so it should not be modified afterwards.
+
+    The attributes forwarded to the wrapped environments (like `unwrapped`,
+    `spec`, or the attributes of the base environment) are resolved directly
+    in the layer defining them, instead of through each layer in turn.
+
+    Example::
+
+        >>> env = gym.make('CartPole-v1')
+        >>> env = FusedWrapper(TransformReward(env, lambda r: 0.01 * r))
+        >>> env.layers
+        ['TransformReward', 'TimeLimit']
+
+    Args:
+        env (Env): stack of wrappers to fuse
+
+    Attributes:
+        layers (list of str): names of the fused wrappers, from the outermost
+            to the innermost one
+    """
+    def __init__(self, env):
+        super(FusedWrapper, self).__init__(env)
+        layers, inner = [], env
+        while isinstance(inner, Wrapper):
+            kind = _layer_kind(inner)
+            if kind is None:
+                break
+            layers.append((kind, inner))
+            inner = inner.env
+        self.layers = [type(layer).__name__ for (_, layer) in layers]
+        self._chain = [layer for (_, layer) in layers] + [inner]
+        self._owners = {}
+        self._unwrapped = env.unwrapped
+        self._spec = env.spec
+        # Instance attributes, so that `env.step(action)` directly calls the
+        # compiled function
+        self.step, self.reset = _compile(layers, inner)
+
+    @property
+    def unwrapped(self):
+        return self._unwrapped
+
+    @property
+    def spec(self):
+        return self._spec
+
+    def _owner(self, name):
+        # The layer defining the attribute `name` (the layers below a wrapper
+        # which is not fused are only reached through it)
+        for layer in self._chain:
+            if (name in vars(layer)) or any(name in vars(cls) for cls in type(layer).__mro__):
+                return layer
+        return None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError("attempted to get missing private attribute '{}'".format(name))
+        owner = self._owners.get(name)
+        if owner is None:
+            owner = self._owner(name)
+            if owner is None:
+                return getattr(self.env, name)
+            self._owners[name] = owner
+        return getattr(owner, name)
@@ -2,6 +2,7 @@ import numpy as np
 
 from gym.spaces import Box
 from gym import ObservationWrapper
+from gym.wrappers.image_preprocessing import ImagePreprocessor
 
 
 class GrayScaleObservation(ObservationWrapper):
@@ -16,10 +17,10 @@ class GrayScaleObservation(ObservationWrapper):
             self.observation_space = Box(low=0, high=255, shape=(obs_shape[0], obs_shape[1], 1), dtype=np.uint8)
         else:
             self.observation_space = Box(low=0, high=255, shape=obs_shape, dtype=np.uint8)
+        self._preprocessor = ImagePreprocessor(env.observation_space.shape, grayscale=True)
 
     def observation(self, observation):
-        import cv2
-        observation = cv2.cvtColor(observation, cv2.COLOR_RGB2GRAY)
+        observation = self._preprocessor(observation)
         if self.keep_dim:
             observation = np.expand_dims(observation, -1)
         return observation
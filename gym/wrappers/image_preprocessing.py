@@ -0,0 +1,123 @@
+import numpy as np
+
+
+class ImagePreprocessor(object):
+    r"""Image preprocessing stage shared by the image wrappers (e.g.
+    :class:`AtariPreprocessing`, :class:`GrayScaleObservation`,
+    :class:`ResizeObservation`, and their vectorized versions in
+    `gym.vector.wrappers`).
+
+    The max-pooling of two frames, the conversion to gray scale, and the area
+    resize are chained over buffers preallocated once, so no intermediate
+    image is allocated. The stage runs either on a single frame, or on a whole
+    batch of `n` frames (of shape `(n, H, W, C)`): the gray scale conversion
+    of the batch is then a single OpenCV call (on the batch viewed as one tall
+    image), and each frame is resized in place into the output batch.
+
+    The stages are only run when needed: the resize is skipped if the frames
+    already have the requested resolution. OpenCV is imported at construction.
+    The buffers are preallocated for `np.uint8` frames: frames of any other
+    data type (e.g. `np.float32`) are preprocessed in new arrays allocated by
+    OpenCV, and keep their data type.
+
+    Args:
+        shape (tuple): shape of a single input frame, `(H, W)` or `(H, W, C)`
+        grayscale (bool): convert RGB frames (`C = 3`) to gray scale
+        resize (tuple): resolution `(height, width)` of the output frames, or
+            `None` to keep the input resolution
+        max_pool (bool): if True, the frames are the pixel-wise maximum of two
+            frames (see `__call__`)
+        n (int): batch size, or `None` for a single frame
+        copy (bool): if True, a copy of the output buffer is returned.
+            Otherwise the buffer itself is returned, and is overwritten by the
+            next call
+
+    Attributes:
+        output_shape (tuple): shape of the output (without the batch size)
+    """
+    def __init__(self, shape, grayscale=False, resize=None, max_pool=False,
+                 n=None, copy=True):
+        import cv2
+        self._cv2 = cv2
+        shape = tuple(shape)
+        if grayscale:
+            assert len(shape) == 3 and shape[-1] == 3, shape
+        self.shape = shape
+        self.grayscale = grayscale
+        self.resize = None if (resize is None or tuple(resize) == shape[:2]) \
+            else tuple(resize)
+        self.max_pool = max_pool
+        self.n = n
+        self.copy = copy
+
+        batch_shape = () if n is None else (n,)
+        gray_shape = shape[:2] if grayscale else shape
+        self.output_shape = (self.resize or shape[:2]) + gray_shape[2:]
+        self._pooled = np.empty(batch_shape + shape, dtype=np.uint8) \
+            if max_pool else None
+        self._gray = np.empty(batch_shape + gray_shape, dtype=np.uint8) \
+            if (grayscale and self.resize) else None
+        self._out = np.empty(batch_shape + self.output_shape, dtype=np.uint8)
+
+    def __call__(self, frames, previous_frames=None):
+        r"""Preprocess a frame (or a batch of frames). With `max_pool`, the
+        pixel-wise maximum of `frames` and `previous_frames` is preprocessed.
+        """
+        frames = np.asarray(frames)
+        if (frames.dtype != np.uint8) or (self.max_pool
+                and np.asarray(previous_frames).dtype != np.uint8):
+            return self._preprocess(frames, previous_frames)
+
+        cv2 = self._cv2
+        if self.max_pool:
+            frames = np.maximum(frames, previous_frames, out=self._pooled)
+
+        if self.grayscale:
+            dst = self._gray if self.resize else self._out
+            cv2.cvtColor(self._as_image(frames, 3), cv2.COLOR_RGB2GRAY,
+                dst=self._as_image(dst, 1))
+            frames = dst
+
+        if self.resize:
+            size = self.resize[::-1]
+            if self.n is None:
+                cv2.resize(frames, size, dst=self._out, interpolation=cv2.INTER_AREA)
+            else:
+                for frame, out in zip(frames, self._out):
+                    cv2.resize(frame, size, dst=out, interpolation=cv2.INTER_AREA)
+        elif not self.grayscale:
+            np.copyto(self._out, frames)
+
+        return self._out.copy() if self.copy else self._out
+
+    def _preprocess(self, frames, previous_frames=None):
+        # Same stages as `__call__`, without the preallocated buffers, for
+        # frames which are not `np.uint8`
+        cv2 = self._cv2
+        batch_shape = () if self.n is None else (self.n,)
+        if self.max_pool:
+            frames = np.maximum(frames, previous_frames)
+
+        if self.grayscale:
+            frames = cv2.cvtColor(self._as_image(frames, 3), cv2.COLOR_RGB2GRAY)
+            frames = frames.reshape(batch_shape + self.shape[:2])
+
+        if self.resize:
+            size = self.resize[::-1]
+            if self.n is None:
+                frames = cv2.resize(frames, size, interpolation=cv2.INTER_AREA)
+            else:
+                frames = np.stack([cv2.resize(frame, size,
+                    interpolation=cv2.INTER_AREA) for frame in frames])
+        elif self.copy and not (self.max_pool or self.grayscale):
+            frames = frames.copy()
+
+        return frames.reshape(batch_shape + self.output_shape)
+
+    def _as_image(self, frames, channels):
+        # View a batch of frames as a single tall image, of shape (n * H, W, C)
+        frames = np.ascontiguousarray(frames)
+        if self.n is None:
+            return frames
+        shape = (-1, self.shape[1]) + ((channels,) if channels > 1 else ())
+        return frames.reshape(shape)
@@ -0,0 +1,181 @@
+import numpy as np
+
+from gym import Wrapper, ObservationWrapper
+from gym.spaces import Box
+
+
+class RunningMeanStd(object):
+    r"""Running mean and variance of a stream of arrays, updated with whole
+    batches at once.
+
+    Each batch is reduced to its mean, its sum of squared deviations and its
+    size, which are merged into the running statistics with the parallel
+    algorithm of Chan et al. (a numerically stable generalization of
+    Welford's algorithm). The same merge combines the statistics computed in
+    different processes (see `merge`).
+
+    Example::
+
+        >>> rms = RunningMeanStd(shape=(3,))
+        >>> rms.update(np.random.randn(32, 3))
+        >>> rms.mean, rms.var, rms.count
+
+    Args:
+        shape (tuple): shape of a single sample
+
+    Attributes:
+        mean (np.ndarray): mean of the samples
+        var (np.ndarray): (population) variance of the samples
+        count (int): number of samples
+    """
+    def __init__(self, shape=()):
+        self.shape = tuple(shape)
+        self.mean = np.zeros(self.shape, dtype=np.float64)
+        self._m2 = np.zeros(self.shape, dtype=np.float64)
+        self.count = 0
+
+    @property
+    def var(self):
+        if self.count == 0:
+            return np.ones(self.shape, dtype=np.float64)
+        return self._m2 / self.count
+
+    def update(self, batch):
+        r"""Update the statistics with a batch of samples, of shape
+        `(batch_size,) + shape`. """
+        batch = np.asarray(batch, dtype=np.float64).reshape((-1,) + self.shape)
+        if batch.shape[0] == 0:
+            return
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = np.square(batch - batch_mean).sum(axis=0)
+        self._merge(batch_mean, batch_m2, batch.shape[0])
+
+    def merge(self, other):
+        r"""Merge the statistics of another `RunningMeanStd` (e.g. from
+        another process) into these statistics. """
+        assert other.shape == self.shape, (other.shape, self.shape)
+        self._merge(other.mean, other._m2, other.count)
+
+    def _merge(self, mean, m2, count):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (float(count) / total)
+        self._m2 = self._m2 + m2 + np.square(delta) * (float(self.count) * count / total)
+        self.count = total
+
+    def get_state(self):
+        r"""Return the statistics, as a dictionary of numpy arrays. """
+        return {'mean': self.mean.copy(), 'm2': self._m2.copy(),
+            'count': np.asarray(self.count, dtype=np.int64)}
+
+    def set_state(self, state):
+        r"""Restore the statistics returned by `get_state`. """
+        mean = np.asarray(state['mean'], dtype=np.float64)
+        assert mean.shape == self.shape, (mean.shape, self.shape)
+        self.mean = mean.copy()
+        self._m2 = np.asarray(state['m2'], dtype=np.float64).copy()
+        self.count = int(state['count'])
+
+    def save(self, path):
+        r"""Save the statistics to a `.npz` file. """
+        np.savez(path, **self.get_state())
+
+    def load(self, path):
+        r"""Load the statistics saved with `save`. """
+        with np.load(path) as state:
+            self.set_state(state)
+
+
+class NormalizeObservation(ObservationWrapper):
+    r"""Normalize the observations to zero mean and unit variance, with the
+    running statistics of all the observations seen so far.
+
+    To evaluate a policy with the statistics of training, `save` them from the
+    training environment, and `load` them in the evaluation environment
+    (created with `update_stats=False` to freeze them). For a vectorized
+    environment, use `gym.vector.wrappers.NormalizeObservation` (the
+    statistics files are compatible).
+
+    Example::
+
+        >>> env = NormalizeObservation(gym.make('HovorkaCambridge-v0'))
+        >>> env.reset()
+        >>> env.save('observation_statistics.npz')
+
+    Args:
+        env (Env): environment with a `Box` observation space
+        epsilon (float): added to the variance, to avoid divisions by zero
+        update_stats (bool): if `False`, the statistics are not updated
+    """
+    def __init__(self, env, epsilon=1e-8, update_stats=True):
+        assert not hasattr(env, 'num_envs'), 'Use `gym.vector.wrappers.' \
+            'NormalizeObservation` for vectorized environments.'
+        super(NormalizeObservation, self).__init__(env)
+        self.epsilon = epsilon
+        self.update_stats = update_stats
+        shape = env.observation_space.shape
+        self.obs_rms = RunningMeanStd(shape=shape)
+        self.observation_space = Box(low=-np.inf, high=np.inf, shape=shape,
+            dtype=np.float32)
+
+    def observation(self, observation):
+        observation = np.asarray(observation)
+        if self.update_stats:
+            self.obs_rms.update(observation[None])
+        normalized = (observation - self.obs_rms.mean) / np.sqrt(self.obs_rms.var + self.epsilon)
+        return normalized.astype(np.float32)
+
+    def save(self, path):
+        r"""Save the observation statistics to a `.npz` file. """
+        self.obs_rms.save(path)
+
+    def load(self, path):
+        r"""Load observation statistics saved with `save`. """
+        self.obs_rms.load(path)
+
+
+class NormalizeReward(Wrapper):
+    r"""Scale the rewards by the standard deviation of the discounted return,
+    with running statistics updated at each step. The rewards are not
+    centered, so their sign is preserved. For a vectorized environment, use
+    `gym.vector.wrappers.NormalizeReward`.
+
+    Args:
+        env (Env): environment
+        gamma (float): discount factor of the returns
+        epsilon (float): added to the variance, to avoid divisions by zero
+        update_stats (bool): if `False`, the statistics are not updated
+    """
+    def __init__(self, env, gamma=0.99, epsilon=1e-8, update_stats=True):
+        assert not hasattr(env, 'num_envs'), 'Use `gym.vector.wrappers.' \
+            'NormalizeReward` for vectorized environments.'
+        super(NormalizeReward, self).__init__(env)
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.update_stats = update_stats
+        self.return_rms = RunningMeanStd(shape=())
+        self.returns = 0.
+
+    def reset(self, **kwargs):
+        self.returns = 0.
+        return self.env.reset(**kwargs)
+
+    def step(self, action):
+        observation, reward, done, info = self.env.step(action)
+        self.returns = self.returns * self.gamma + reward
+        if self.update_stats:
+            self.return_rms.update(self.returns)
+        reward = float(reward / np.sqrt(self.return_rms.var + self.epsilon))
+        if done:
+            self.returns = 0.
+        return observation, reward, done, info
+
+    def save(self, path):
+        r"""Save the return statistics to a `.npz` file. """
+        self.return_rms.save(path)
+
+    def load(self, path):
+        r"""Load return statistics saved with `save`. """
+        self.return_rms.load(path)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from gym.spaces import Box, Discrete, MultiDiscrete, one_hot_dim, one_hot_encode
+from gym import ObservationWrapper
+
+
+class OneHotObservation(ObservationWrapper):
+    r"""One-hot encode the observations of a `Discrete` or `MultiDiscrete`
+    observation space (e.g. the states of the toy_text environments). For a
+    vectorized environment, use `gym.vector.wrappers.OneHotObservation`.
+
+    Example::
+
+        >>> env = OneHotObservation(gym.make('Taxi-v3'))
+        >>> env.reset().shape
+        (500,)
+
+    Args:
+        env (Env): environment with a `Discrete` or `MultiDiscrete`
+            observation space
+        dtype (data-type): data type of the one-hot encoded observations
+    """
+    def __init__(self, env, dtype=np.float32):
+        assert not hasattr(env, 'num_envs'), 'Use `gym.vector.wrappers.' \
+            'OneHotObservation` for vectorized environments.'
+        super(OneHotObservation, self).__init__(env)
+        self._space = env.observation_space
+        assert isinstance(self._space, (Discrete, MultiDiscrete))
+
+        dim = one_hot_dim(self._space)
+        self.observation_space = Box(low=0, high=1, shape=(dim,), dtype=dtype)
+        self._buffer = np.zeros((1, dim), dtype=dtype)
+
+    def observation(self, observation):
+        one_hot_encode(self._space, np.asarray(observation)[None], out=self._buffer)
+        return self._buffer[0].copy()
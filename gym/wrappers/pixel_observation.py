@@ -1,7 +1,11 @@
 """An observation wrapper that augments observations by pixel values."""
 
 import collections
-import copy
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+from copy import deepcopy
 
 import numpy as np
 
@@ -11,14 +15,24 @@ from gym import ObservationWrapper
 STATE_KEY = 'state'
 
 
+def _render_key(render_kwargs):
+    return repr(sorted(render_kwargs.items()))
+
+
 class PixelObservationWrapper(ObservationWrapper):
-    """Augment observations by pixel values."""
+    """Augment observations by pixel values.
+
+    The frames are rendered at most once per step of the environment: pixel
+    keys with identical render kwargs share the same frame, and calls to
+    `render` (e.g. by a video recorder) with the same kwargs reuse it.
+    """
 
     def __init__(self,
                  env,
                  pixels_only=True,
                  render_kwargs=None,
-                 pixel_keys=('pixels', )):
+                 pixel_keys=('pixels', ),
+                 copy=True):
         """Initializes a new pixel Wrapper.
 
         Args:
@@ -33,6 +47,11 @@ class PixelObservationWrapper(ObservationWrapper):
             pixel_keys: Optional custom string specifying the pixel
                 observation's key in the `OrderedDict` of observations.
                 Defaults to 'pixels'.
+            copy: If `True` (default), each pixel observation is a new array.
+                Otherwise the frames are copied into readback buffers
+                allocated once (one per distinct render kwargs), which are
+                returned in the observation, and are overwritten by the next
+                call to `reset` or `step`.
 
         Raises:
             ValueError: If `env`'s observation spec is not compatible with the
@@ -60,7 +79,7 @@ class PixelObservationWrapper(ObservationWrapper):
             self._observation_is_dict = False
             invalid_keys = set([STATE_KEY])
         elif isinstance(wrapped_observation_space,
-                        (spaces.Dict, collections.MutableMapping)):
+                        (spaces.Dict, MutableMapping)):
             self._observation_is_dict = True
             invalid_keys = set(wrapped_observation_space.spaces.keys())
         else:
@@ -77,20 +96,26 @@ class PixelObservationWrapper(ObservationWrapper):
         if pixels_only:
             self.observation_space = spaces.Dict()
         elif self._observation_is_dict:
-            self.observation_space = copy.deepcopy(wrapped_observation_space)
+            self.observation_space = deepcopy(wrapped_observation_space)
         else:
             self.observation_space = spaces.Dict()
             self.observation_space.spaces[STATE_KEY] = wrapped_observation_space
 
+        self._copy = copy
+        # Frames rendered since the last step, and readback buffers, indexed
+        # by render kwargs
+        self._frames = {}
+        self._buffers = {}
+
         # Extend observation space with pixels.
 
         pixels_spaces = {}
         for pixel_key in pixel_keys:
-            pixels = self.env.render(**render_kwargs)
+            pixels = self._render(render_kwargs[pixel_key])
 
             if np.issubdtype(pixels.dtype, np.integer):
                 low, high = (0, 255)
-            elif np.issubdtype(pixels.dtype, np.float):
+            elif np.issubdtype(pixels.dtype, np.floating):
                 low, high = (-float('inf'), float('inf'))
             else:
                 raise TypeError(pixels.dtype)
@@ -106,6 +131,37 @@ class PixelObservationWrapper(ObservationWrapper):
         self._render_kwargs = render_kwargs
         self._pixel_keys = pixel_keys
 
+    def reset(self, **kwargs):
+        self._frames.clear()
+        return super(PixelObservationWrapper, self).reset(**kwargs)
+
+    def step(self, action):
+        self._frames.clear()
+        return super(PixelObservationWrapper, self).step(action)
+
+    def render(self, mode='human', **kwargs):
+        if mode != 'rgb_array':
+            return self.env.render(mode, **kwargs)
+        kwargs['mode'] = mode
+        cached = _render_key(kwargs) in self._frames
+        frame = self._render(kwargs)
+        return frame.copy() if (cached or not self._copy) else frame
+
+    def _render(self, render_kwargs):
+        key = _render_key(render_kwargs)
+        if key in self._frames:
+            return self._frames[key]
+        pixels = self.env.render(**render_kwargs)
+        if not self._copy:
+            buffer = self._buffers.get(key)
+            if (buffer is None or buffer.shape != pixels.shape
+                    or buffer.dtype != pixels.dtype):
+                buffer = self._buffers[key] = np.empty_like(pixels, order='C')
+            np.copyto(buffer, pixels)
+            pixels = buffer
+        self._frames[key] = pixels
+        return pixels
+
     def observation(self, observation):
         pixel_observation = self._add_pixel_observation(observation)
         return pixel_observation
@@ -116,14 +172,16 @@ class PixelObservationWrapper(ObservationWrapper):
         elif self._observation_is_dict:
             observation = type(observation)(observation)
         else:
-            observation = collections.OrderedDict()
-            observation[STATE_KEY] = observation
-
-        pixel_observations = {
-            pixel_key: self.env.render(**self._render_kwargs[pixel_key])
-            for pixel_key in self._pixel_keys
-        }
-
-        observation.update(pixel_observations)
+            observation = collections.OrderedDict([(STATE_KEY, observation)])
+
+        rendered = set()
+        for pixel_key in self._pixel_keys:
+            key = _render_key(self._render_kwargs[pixel_key])
+            pixels = self._render(self._render_kwargs[pixel_key])
+            if self._copy and key in rendered:
+                # Distinct arrays for the keys sharing the same frame
+                pixels = pixels.copy()
+            rendered.add(key)
+            observation[pixel_key] = pixels
 
         return observation
@@ -0,0 +1,76 @@
+import numpy as np
+
+from gym.spaces import Box
+from gym import ObservationWrapper
+
+
+class QuantizeObservation(ObservationWrapper):
+    r"""Store the observations in a compact data type, using the bounds of the
+    observation space.
+
+    With an integer data type (e.g. `np.uint8` or `np.uint16`), the bounds
+    `[low, high]` of the observation space are mapped linearly onto
+    `[0, np.iinfo(dtype).max]`, and each observation is clipped to the bounds
+    and rounded to the nearest level. The observation can be recovered with
+    `dequantize`, within `scale / 2` of the original value. With a floating
+    point data type (e.g. `np.float16`), the observations are only cast.
+
+    The observation space is updated to the new data type, so the observations
+    can be stored in shared memory by the vectorized environments.
+
+    Example::
+
+        >>> env = gym.make('HovorkaCambridge-v0')
+        >>> env = QuantizeObservation(env, dtype=np.uint16)
+        >>> observation = env.dequantize(env.reset())
+
+    Args:
+        env (Env): environment with a `Box` observation space
+        dtype (data-type): data type of the quantized observations
+
+    Attributes:
+        scale (np.ndarray): difference between two consecutive levels, per coordinate
+        offset (np.ndarray): value of the level `0`, per coordinate
+    """
+    def __init__(self, env, dtype=np.uint8):
+        super(QuantizeObservation, self).__init__(env)
+        assert isinstance(env.observation_space, Box)
+        self.dtype = np.dtype(dtype)
+        low = env.observation_space.low.astype(np.float64)
+        high = env.observation_space.high.astype(np.float64)
+
+        if self.dtype.kind == 'f':
+            self.scale = np.ones_like(low)
+            self.offset = np.zeros_like(low)
+            self.observation_space = Box(low=low.astype(self.dtype),
+                high=high.astype(self.dtype), dtype=self.dtype)
+        elif self.dtype.kind in 'ui':
+            if not (np.all(np.isfinite(low)) and np.all(np.isfinite(high))):
+                raise ValueError('Quantizing observations to an integer type '
+                    'requires a bounded observation space, got {}.'.format(
+                    env.observation_space))
+            info = np.iinfo(self.dtype)
+            num_levels = float(info.max) - float(info.min)
+            self.scale = (high - low) / num_levels
+            self.scale[self.scale == 0] = 1.
+            self.offset = low - info.min * self.scale
+            self._low, self._high = low, high
+            self._inv_scale = 1. / self.scale
+            self.observation_space = Box(low=info.min, high=info.max,
+                shape=low.shape, dtype=self.dtype)
+        else:
+            raise ValueError('Unsupported data type {}. Must be an integer or a '
+                'floating point type.'.format(self.dtype))
+
+    def observation(self, observation):
+        if self.dtype.kind == 'f':
+            return np.asarray(observation).astype(self.dtype)
+        levels = np.clip(observation, self._low, self._high)
+        levels -= self.offset
+        levels *= self._inv_scale
+        return np.rint(levels, out=levels).astype(self.dtype)
+
+    def dequantize(self, observation):
+        r"""Recover the original observation (as `np.float64`) from a quantized
+        observation, or a batch of quantized observations. """
+        return np.asarray(observation, dtype=np.float64) * self.scale + self.offset
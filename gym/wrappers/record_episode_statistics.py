@@ -0,0 +1,182 @@
+import numpy as np
+
+from gym import Wrapper
+
+# Blood glucose range (in mg/dL) of the diabetes statistics: below is
+# hypoglycemia, above is hyperglycemia
+BG_RANGE = (70., 180.)
+
+
+class EpisodeWindow(object):
+    r"""Statistics of the most recent episodes, in a circular buffer of
+    `size` episodes preallocated per statistic (so recording an episode does
+    not grow any list).
+
+    Example::
+
+        >>> window = EpisodeWindow(size=100)
+        >>> window.add({'r': 10., 'l': 20})
+        >>> window.mean('r'), window.percentile('l', 90)
+
+    Args:
+        size (int): maximum number of episodes kept
+
+    Attributes:
+        count (int): total number of episodes recorded
+    """
+    def __init__(self, size=100):
+        assert size >= 1, size
+        self.size = size
+        self.count = 0
+        self._index = 0
+        self._data = {}
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def add(self, episode):
+        r"""Record the statistics of an episode, a dictionary of numbers. """
+        for key, value in episode.items():
+            values = self._data.get(key)
+            if values is None:
+                values = self._data[key] = np.full(self.size, np.nan, dtype=np.float64)
+            values[self._index] = value
+        self._index = (self._index + 1) % self.size
+        self.count += 1
+
+    def values(self, key):
+        r"""Values of the statistic `key` over the window (in no particular
+        order, and `nan` for the episodes without it). """
+        values = self._data.get(key)
+        if values is None:
+            return np.empty(0, dtype=np.float64)
+        return values[:len(self)]
+
+    def mean(self, key='r'):
+        r"""Mean of the statistic `key` over the window. """
+        values = self.values(key)
+        return float(np.nanmean(values)) if values.size else float('nan')
+
+    def percentile(self, key='r', q=50):
+        r"""Percentile(s) `q` (between 0 and 100) of the statistic `key` over
+        the window. """
+        values = self.values(key)
+        if not values.size:
+            return np.full(np.shape(q), np.nan)
+        return np.nanpercentile(values, q)
+
+
+class BGCounter(object):
+    r"""Incremental blood glucose statistics of `n` episodes, updated with the
+    blood glucose trace of each step (`info['bg']` in the diabetes
+    environments, one value per minute).
+
+    Args:
+        n (int): number of episodes (environments)
+        bg_range (tuple): target range `(low, high)` of blood glucose, in mg/dL
+    """
+    def __init__(self, n=1, bg_range=BG_RANGE):
+        self.low, self.high = bg_range
+        self.minutes = np.zeros(n, dtype=np.int64)
+        self.in_range = np.zeros(n, dtype=np.int64)
+        self.hypo = np.zeros(n, dtype=np.int64)
+        self.hyper = np.zeros(n, dtype=np.int64)
+
+    def update(self, i, bg):
+        bg = np.asarray(bg)
+        hypo = np.count_nonzero(bg < self.low)
+        hyper = np.count_nonzero(bg > self.high)
+        self.minutes[i] += bg.size
+        self.hypo[i] += hypo
+        self.hyper[i] += hyper
+        self.in_range[i] += bg.size - hypo - hyper
+
+    def update_batch(self, bgs):
+        r"""Update all the `n` episodes at once, with the list of the blood
+        glucose traces of the `n` environments (counted along the stacked
+        traces when they all have the same length). The episodes whose trace
+        is `None` are not updated. """
+        indices = [i for (i, bg) in enumerate(bgs) if bg is not None]
+        bgs = [bgs[i] for i in indices]
+        if not bgs:
+            return
+        if len(set(np.shape(bg) for bg in bgs)) > 1:
+            for i, bg in zip(indices, bgs):
+                self.update(i, bg)
+            return
+        bg = np.reshape(bgs, (len(bgs), -1))
+        hypo = np.count_nonzero(bg < self.low, axis=1)
+        hyper = np.count_nonzero(bg > self.high, axis=1)
+        self.minutes[indices] += bg.shape[1]
+        self.hypo[indices] += hypo
+        self.hyper[indices] += hyper
+        self.in_range[indices] += bg.shape[1] - hypo - hyper
+
+    def episode(self, i):
+        r"""Statistics of the episode `i`: the fraction of time in range, and
+        the number of minutes in hypo- and hyperglycemia. """
+        minutes = max(self.minutes[i], 1)
+        return {'time_in_range': float(self.in_range[i]) / minutes,
+            'hypo': int(self.hypo[i]), 'hyper': int(self.hyper[i])}
+
+    def reset(self, i=slice(None)):
+        for counts in (self.minutes, self.in_range, self.hypo, self.hyper):
+            counts[i] = 0
+
+
+class RecordEpisodeStatistics(Wrapper):
+    r"""Record the return and the length of each episode, without any file
+    I/O (unlike :class:`Monitor`). At the end of an episode, its statistics
+    are added to `info['episode']` (with keys `'r'` and `'l'`), and to a
+    bounded window of the most recent episodes (see :class:`EpisodeWindow`),
+    which gives their rolling mean and percentiles.
+
+    For the diabetes environments (which report the blood glucose trace of
+    each step in `info['bg']`), the episode statistics also include the
+    fraction of time in range (`'time_in_range'`) and the number of minutes
+    in hypo- and hyperglycemia (`'hypo'` and `'hyper'`), counted at each step.
+
+    Example::
+
+        >>> env = RecordEpisodeStatistics(gym.make('HovorkaCambridge-v0'))
+        >>> env.reset()
+        >>> done = False
+        >>> while not done:
+        ...     _, _, done, info = env.step(env.action_space.sample())
+        >>> info['episode']['time_in_range'], env.episode_window.mean('r')
+
+    Args:
+        env (Env): environment
+        window_size (int): number of episodes kept in the window
+        bg_range (tuple): target range `(low, high)` of blood glucose, in mg/dL
+
+    Attributes:
+        episode_window (EpisodeWindow): statistics of the most recent episodes
+    """
+    def __init__(self, env, window_size=100, bg_range=BG_RANGE):
+        super(RecordEpisodeStatistics, self).__init__(env)
+        self.episode_window = EpisodeWindow(window_size)
+        self.bg_counter = BGCounter(1, bg_range)
+        self.episode_return = 0.
+        self.episode_length = 0
+
+    def reset(self, **kwargs):
+        self.episode_return = 0.
+        self.episode_length = 0
+        self.bg_counter.reset()
+        return self.env.reset(**kwargs)
+
+    def step(self, action):
+        observation, reward, done, info = self.env.step(action)
+        self.episode_return += reward
+        self.episode_length += 1
+        bg = info.get('bg')
+        if bg is not None:
+            self.bg_counter.update(0, bg)
+        if done:
+            episode = {'r': self.episode_return, 'l': self.episode_length}
+            if bg is not None:
+                episode.update(self.bg_counter.episode(0))
+            info['episode'] = episode
+            self.episode_window.add(episode)
+        return observation, reward, done, info
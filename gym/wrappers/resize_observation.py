@@ -2,6 +2,7 @@ import numpy as np
 
 from gym.spaces import Box
 from gym import ObservationWrapper
+from gym.wrappers.image_preprocessing import ImagePreprocessor
 
 
 class ResizeObservation(ObservationWrapper):
@@ -13,12 +14,12 @@ class ResizeObservation(ObservationWrapper):
         assert all(x > 0 for x in shape), shape
         self.shape = tuple(shape)
 
+        self._preprocessor = ImagePreprocessor(self.observation_space.shape, resize=self.shape)
         obs_shape = self.shape + self.observation_space.shape[2:]
         self.observation_space = Box(low=0, high=255, shape=obs_shape, dtype=np.uint8)
 
     def observation(self, observation):
-        import cv2
-        observation = cv2.resize(observation, self.shape[::-1], interpolation=cv2.INTER_AREA)
+        observation = self._preprocessor(observation)
         if observation.ndim == 2:
             observation = np.expand_dims(observation, -1)
         return observation
@@ -0,0 +1,94 @@
+import pytest
+
+import numpy as np
+
+import gym
+from gym.wrappers import ActionRepeat, TimeLimit
+
+
+def test_action_repeat_step():
+    env = gym.make('CartPole-v1')
+    wrapped_env = ActionRepeat(gym.make('CartPole-v1'), num_repeats=3)
+    env.seed(0)
+    wrapped_env.seed(0)
+    env.reset()
+    wrapped_env.reset()
+
+    for _ in range(5):
+        total_reward = 0.
+        for num_steps in range(1, 4):
+            observation, reward, done, _ = env.step(1)
+            total_reward += reward
+            if done:
+                break
+        wrapped_observation, wrapped_reward, wrapped_done, info = wrapped_env.step(1)
+        assert np.allclose(wrapped_observation, observation)
+        assert wrapped_reward == total_reward
+        assert wrapped_done == done
+        assert info['num_steps'] == num_steps
+        if done:
+            break
+    assert done
+
+
+def test_action_repeat_max_observation():
+    env = ActionRepeat(gym.make('CartPole-v1'), num_repeats=2,
+        observation_reduce='max')
+    reference_env = gym.make('CartPole-v1')
+    env.seed(0)
+    reference_env.seed(0)
+    env.reset()
+    reference_env.reset()
+
+    observation, reward, _, info = env.step(0)
+    first = reference_env.step(0)[0]
+    second = reference_env.step(0)[0]
+    assert np.allclose(observation, np.maximum(first, second))
+    assert reward == 2.
+    assert info['num_steps'] == 2
+
+
+def test_time_limit_step_n():
+    env = TimeLimit(gym.make('CartPole-v1').unwrapped, max_episode_steps=5)
+    env.seed(0)
+    env.reset()
+    _, reward, done, info = env.step_n(0, 3)
+    assert (reward, done, info['num_steps']) == (3., False, 3)
+    _, reward, done, info = env.step_n(0, 3)
+    assert (reward, done, info['num_steps']) == (2., True, 2)
+    assert info['TimeLimit.truncated']
+
+
+def test_time_limit_step_n_unlimited():
+    from gym.envs.classic_control import CartPoleEnv
+    env = TimeLimit(CartPoleEnv(), max_episode_steps=None)
+    env.seed(0)
+    env.reset()
+    _, reward, done, info = env.step_n(0, 3)
+    assert (reward, done, info['num_steps']) == (3., False, 3)
+    assert 'TimeLimit.truncated' not in info
+
+
+@pytest.mark.parametrize('env_id', ['HovorkaCambridge-v0', 'HovorkaDiscrete-v0'])
+def test_action_repeat_step_n(env_id):
+    env = gym.make(env_id)
+    wrapped_env = ActionRepeat(gym.make(env_id), num_repeats=4)
+    # The initial state is drawn with the global random number generator
+    np.random.seed(0)
+    env.reset()
+    np.random.seed(0)
+    wrapped_env.reset()
+    action = env.action_space.sample()
+
+    total_reward = 0.
+    for _ in range(4):
+        observation, reward, done, _ = env.step(action)
+        total_reward += reward
+    wrapped_observation, wrapped_reward, wrapped_done, info = wrapped_env.step(action)
+
+    assert info['num_steps'] == 4
+    assert wrapped_done == done
+    # The intervals are integrated without restarting the solver
+    assert np.allclose(wrapped_observation, observation, rtol=1e-3)
+    assert np.isclose(wrapped_reward, total_reward, rtol=1e-3)
+    assert np.allclose(wrapped_env.unwrapped.bg_history, env.unwrapped.bg_history, rtol=1e-3)
@@ -1,16 +1,23 @@
+import pickle
+
 import pytest
-pytest.importorskip("atari_py")
 
 import numpy as np
 import gym
-from gym.wrappers import FrameStack
+from gym.wrappers import FrameStack, LazyFrames
+from gym.wrappers.frame_stack import FrameBuffer
 try:
     import lz4
 except ImportError:
     lz4 = None
+try:
+    import atari_py
+except ImportError:
+    atari_py = None
 
 
-@pytest.mark.parametrize('env_id', ['CartPole-v1', 'Pendulum-v0', 'Pong-v0'])
+@pytest.mark.parametrize('env_id', ['CartPole-v1', 'Pendulum-v0',
+    pytest.param('Pong-v0', marks=pytest.mark.skipif(atari_py is None, reason="Need atari_py to run Atari environments"))])
 @pytest.mark.parametrize('num_stack', [2, 3, 4])
 @pytest.mark.parametrize('lz4_compress', [
     pytest.param(True, marks=pytest.mark.skipif(lz4 is None, reason="Need lz4 to run tests with compression")),
@@ -34,3 +41,76 @@ def test_frame_stack(env_id, num_stack, lz4_compress):
     for i in range(1, num_stack - 1):
         assert np.allclose(obs[i - 1], obs[i])
     assert not np.allclose(obs[-1], obs[-2])
+
+
+@pytest.mark.parametrize('lz4_compress', [
+    pytest.param(True, marks=pytest.mark.skipif(lz4 is None, reason="Need lz4 to run tests with compression")),
+    False
+])
+def test_lazy_frames(lz4_compress):
+    env = FrameStack(gym.make('Pendulum-v0'), 3, lz4_compress)
+    env.seed(0)
+    observations = [env.reset()]
+    for _ in range(5):
+        observations.append(env.step(env.action_space.sample())[0])
+    last = np.asarray(observations[-1])
+
+    # Older observations are still valid, after the frame buffer moved on
+    for i in range(1, len(observations)):
+        obs = observations[i]
+        assert len(obs) == 3
+        expected = np.stack([obs[j] for j in range(3)])
+        assert np.array_equal(np.asarray(obs), expected)
+        assert not np.array_equal(obs[-1], observations[i - 1][-1])
+        assert np.array_equal(obs[0], observations[i - 1][1])
+    assert np.array_equal(np.asarray(observations[-1], dtype=np.float64),
+        last.astype(np.float64))
+    assert np.array_equal(observations[-1][1:], last[1:])
+    assert not observations[-1][0].flags.writeable
+
+    obs = LazyFrames([np.zeros(3), np.ones(3)], lz4_compress)
+    assert len(obs) == 2
+    assert np.array_equal(np.asarray(obs), [[0, 0, 0], [1, 1, 1]])
+
+
+@pytest.mark.parametrize('lz4_compress', [
+    pytest.param(True, marks=pytest.mark.skipif(lz4 is None, reason="Need lz4 to run tests with compression")),
+    False
+])
+def test_lazy_frames_pickle(lz4_compress):
+    env = FrameStack(gym.make('CartPole-v1'), 4, lz4_compress)
+    env.reset()
+    obs, _, _, _ = env.step(env.action_space.sample())
+    data = pickle.dumps(obs)
+    # Only the frames are serialized, not the decompression cache of the
+    # wrapper
+    assert len(data) < len(pickle.dumps(np.asarray(obs))) + 512
+    restored = pickle.loads(data)
+    assert np.array_equal(np.asarray(restored), np.asarray(obs))
+    assert np.array_equal(restored[-1], obs[-1])
+
+
+@pytest.mark.skipif(lz4 is None, reason="Need lz4 to run tests with compression")
+def test_lazy_frames_decompression_cache():
+    env = FrameStack(gym.make('Pendulum-v0'), 4, lz4_compress=True)
+    env.reset()
+    obs, _, _, _ = env.step(env.action_space.sample())
+    # Shared frames are decompressed once, and cached
+    assert obs[1] is obs[1]
+    assert len(set(id(obs[i]) for i in range(4))) == 2
+
+
+def test_frame_buffer():
+    frame_buffer = FrameBuffer((2,), np.int64, 3)
+    frame_buffer.reset(np.array([0, 0]))
+    for t in range(1, 8):
+        frame_buffer.append(np.array([t, -t]))
+        expected = [[s, -s] for s in range(max(t - 2, 0), t + 1)]
+        expected = [[0, 0]] * (3 - len(expected)) + expected
+        assert np.array_equal(frame_buffer.stack(), expected)
+
+    frame_buffer = FrameBuffer((), np.int64, 2, n=3)
+    frame_buffer.reset(np.array([1, 2, 3]))
+    frame_buffer.append(np.array([4, 5, 6]))
+    frame_buffer.reset(np.array([7, 8, 9]), mask=np.array([False, True, False]))
+    assert np.array_equal(frame_buffer.stack(), [[1, 4], [8, 8], [3, 6]])
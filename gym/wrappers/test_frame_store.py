@@ -0,0 +1,62 @@
+import pickle
+
+import pytest
+
+import numpy as np
+import gym
+from gym.wrappers import FrameStack, FrameStore
+try:
+    import lz4
+except ImportError:
+    lz4 = None
+
+
+@pytest.mark.parametrize('storage', ['array', 'memmap',
+    pytest.param('lz4', marks=pytest.mark.skipif(lz4 is None, reason="Need lz4 to run tests with compression"))
+])
+def test_frame_store(storage, tmpdir):
+    filename = str(tmpdir.join('frames.dat')) if storage == 'memmap' else None
+    frame_store = FrameStore((3,), np.float32, capacity=20, filename=filename,
+        lz4_compress=(storage == 'lz4'))
+    env = FrameStack(gym.make('Pendulum-v0'), 4, frame_store=frame_store)
+    env.seed(0)
+
+    transitions = [(env.reset(), env.frame_ids)]
+    for _ in range(12):
+        observation, _, _, _ = env.step(env.action_space.sample())
+        transitions.append((observation, env.frame_ids))
+    # The first observation (repeated 4 times) is stored once
+    assert len(frame_store) == 13
+    assert transitions[0][1] == (0, 0, 0, 0)
+    assert transitions[-1][1] == (9, 10, 11, 12)
+
+    for observation, frame_ids in transitions:
+        assert np.array_equal(frame_store.stack(frame_ids), np.asarray(observation))
+        assert np.array_equal(frame_store.get(frame_ids[-1]), observation[-1])
+    # Frame IDs are small tuples, which are cheap to pickle
+    assert pickle.loads(pickle.dumps(transitions[-1][1])) == (9, 10, 11, 12)
+
+    batch = np.array([frame_ids for (_, frame_ids) in transitions[-5:]])
+    expected = np.stack([np.asarray(observation) for (observation, _) in transitions[-5:]])
+    assert np.array_equal(frame_store.stack(batch), expected)
+    frame_store.flush()
+
+
+def test_frame_store_overwritten():
+    frame_store = FrameStore((2,), np.int64, capacity=3)
+    frame_ids = [frame_store.add(np.array([i, -i])) for i in range(5)]
+    assert frame_ids == [0, 1, 2, 3, 4]
+    assert len(frame_store) == 3
+    assert np.array_equal(frame_store.stack([2, 4]), [[2, -2], [4, -4]])
+    with pytest.raises(KeyError):
+        frame_store.get(1)
+    with pytest.raises(KeyError):
+        frame_store.get(5)
+
+
+def test_frame_store_invalid():
+    with pytest.raises(ValueError):
+        FrameStore((2,), np.uint8, capacity=3, filename='frames.dat', lz4_compress=True)
+    env = FrameStack(gym.make('Pendulum-v0'), 4)
+    env.reset()
+    assert env.frame_ids is None
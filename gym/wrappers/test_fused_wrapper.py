@@ -0,0 +1,81 @@
+import pytest
+
+import numpy as np
+
+import gym
+from gym.wrappers import FusedWrapper, TransformReward, ClipAction
+
+
+class ScaleObservation(gym.ObservationWrapper):
+    def observation(self, observation):
+        return 2. * observation
+
+
+class CountSteps(gym.Wrapper):
+    def __init__(self, env):
+        super(CountSteps, self).__init__(env)
+        self.num_steps = 0
+
+    def step(self, action):
+        self.num_steps += 1
+        return self.env.step(action)
+
+
+def make_stack(env_id):
+    env = gym.make(env_id)
+    if isinstance(env.action_space, gym.spaces.Box):
+        env = ClipAction(env)
+    env = TransformReward(ScaleObservation(env), lambda r: 0.5 * r)
+    return ScaleObservation(env)
+
+
+@pytest.mark.parametrize('env_id', ['CartPole-v1', 'Pendulum-v0'])
+def test_fused_wrapper(env_id):
+    env, fused_env = make_stack(env_id), FusedWrapper(make_stack(env_id))
+    assert fused_env.layers[-1] == 'TimeLimit'
+    assert fused_env.layers.count('ScaleObservation') == 2
+    env.seed(0)
+    fused_env.seed(0)
+    env.action_space.seed(0)
+
+    for _ in range(3):
+        assert np.allclose(env.reset(), fused_env.reset())
+        done = False
+        while not done:
+            action = env.action_space.sample()
+            if isinstance(env.action_space, gym.spaces.Box):
+                action = 3. * action
+            observation, reward, done, info = env.step(action)
+            fused_observation, fused_reward, fused_done, fused_info = fused_env.step(action)
+            assert np.allclose(observation, fused_observation)
+            assert reward == fused_reward
+            assert done == fused_done
+            assert info == fused_info
+    fused_env.close()
+    env.close()
+
+
+def test_fused_wrapper_not_fused_layer():
+    env = FusedWrapper(TransformReward(CountSteps(gym.make('CartPole-v1')),
+        lambda r: -r))
+    assert env.layers == ['TransformReward']
+    env.reset()
+    _, reward, _, _ = env.step(0)
+    assert reward == -1.
+    # The layers below `CountSteps` are called through it
+    assert env.num_steps == 1
+
+
+def test_fused_wrapper_attributes():
+    env = TransformReward(gym.make('CartPole-v1'), lambda r: r)
+    fused_env = FusedWrapper(env)
+    assert fused_env.unwrapped is env.unwrapped
+    assert fused_env.spec is env.spec
+    assert fused_env.f is env.f
+    assert fused_env.gravity == env.unwrapped.gravity
+    env.unwrapped.gravity = 1.
+    assert fused_env.gravity == 1.
+    with pytest.raises(AttributeError):
+        fused_env._elapsed_steps
+    with pytest.raises(AttributeError):
+        fused_env.missing_attribute
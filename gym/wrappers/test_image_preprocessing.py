@@ -0,0 +1,94 @@
+import pytest
+
+import numpy as np
+
+import gym
+from gym.spaces import Box
+from gym.wrappers import GrayScaleObservation, ResizeObservation
+from gym.wrappers.image_preprocessing import ImagePreprocessor
+cv2 = pytest.importorskip('cv2')
+
+
+def expected_frame(frame, previous_frame, grayscale, resize):
+    if previous_frame is not None:
+        frame = np.maximum(frame, previous_frame)
+    if grayscale:
+        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    if resize is not None:
+        frame = cv2.resize(frame, resize[::-1], interpolation=cv2.INTER_AREA)
+    return frame
+
+
+@pytest.mark.parametrize('n', [None, 3])
+@pytest.mark.parametrize('max_pool', [True, False])
+@pytest.mark.parametrize('grayscale,resize', [(True, (84, 84)), (True, None),
+    (False, (16, 12)), (False, None), (True, (210, 160))])
+def test_image_preprocessor(n, max_pool, grayscale, resize):
+    batch_shape = () if n is None else (n,)
+    space = Box(low=0, high=255, shape=batch_shape + (210, 160, 3), dtype=np.uint8)
+    frames, previous_frames = space.sample(), space.sample()
+    preprocessor = ImagePreprocessor((210, 160, 3), grayscale=grayscale,
+        resize=resize, max_pool=max_pool, n=n)
+
+    observation = preprocessor(frames, previous_frames if max_pool else None)
+    if n is None:
+        expected = expected_frame(frames, previous_frames if max_pool else None,
+            grayscale, resize)
+    else:
+        expected = np.stack([expected_frame(frame, previous_frame if max_pool else None,
+            grayscale, resize) for (frame, previous_frame) in zip(frames, previous_frames)])
+    assert observation.shape == batch_shape + preprocessor.output_shape
+    assert np.array_equal(observation, expected)
+
+
+@pytest.mark.parametrize('copy', [True, False])
+def test_image_preprocessor_buffers(copy):
+    frames = Box(low=0, high=255, shape=(4, 32, 32, 3), dtype=np.uint8).sample()
+    preprocessor = ImagePreprocessor((32, 32, 3), grayscale=True, resize=(8, 8),
+        n=4, copy=copy)
+    first, second = preprocessor(frames), preprocessor(frames)
+    assert (first is second) == (not copy)
+
+
+@pytest.mark.parametrize('n', [None, 3])
+@pytest.mark.parametrize('grayscale,resize', [(True, (32, 32)), (True, None),
+    (False, (16, 12))])
+def test_image_preprocessor_float(n, grayscale, resize):
+    batch_shape = () if n is None else (n,)
+    space = Box(low=0., high=1., shape=batch_shape + (64, 64, 3), dtype=np.float32)
+    frames, previous_frames = space.sample(), space.sample()
+    preprocessor = ImagePreprocessor((64, 64, 3), grayscale=grayscale,
+        resize=resize, max_pool=True, n=n)
+
+    observation = preprocessor(frames, previous_frames)
+    if n is None:
+        expected = expected_frame(frames, previous_frames, grayscale, resize)
+    else:
+        expected = np.stack([expected_frame(frame, previous_frame, grayscale,
+            resize) for (frame, previous_frame) in zip(frames, previous_frames)])
+    assert observation.dtype == np.float32
+    assert observation.shape == batch_shape + preprocessor.output_shape
+    assert np.allclose(observation, expected)
+
+
+class FloatImageEnv(gym.Env):
+    observation_space = Box(low=0., high=1., shape=(64, 64, 3), dtype=np.float32)
+    action_space = Box(low=-1., high=1., shape=(1,), dtype=np.float32)
+
+    def __init__(self):
+        self.frame = self.observation_space.sample()
+
+    def reset(self):
+        return self.frame
+
+
+def test_image_wrappers_float():
+    env = FloatImageEnv()
+    observation = GrayScaleObservation(env).reset()
+    assert observation.dtype == np.float32
+    assert np.allclose(observation, cv2.cvtColor(env.frame, cv2.COLOR_RGB2GRAY))
+
+    observation = ResizeObservation(env, 16).reset()
+    assert observation.dtype == np.float32
+    assert np.allclose(observation, cv2.resize(env.frame, (16, 16),
+        interpolation=cv2.INTER_AREA))
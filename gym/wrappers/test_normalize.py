@@ -0,0 +1,85 @@
+import pytest
+
+import numpy as np
+
+import gym
+from gym.wrappers import NormalizeObservation, NormalizeReward
+from gym.wrappers.normalize import RunningMeanStd
+
+
+def test_running_mean_std():
+    rng = np.random.RandomState(0)
+    # Large offset, to check the numerical stability of the updates
+    batches = [1e8 + rng.randn(size, 3) for size in (1, 7, 32, 5)]
+    rms = RunningMeanStd(shape=(3,))
+    for batch in batches:
+        rms.update(batch)
+    data = np.concatenate(batches)
+    assert rms.count == 45
+    assert np.allclose(rms.mean, data.mean(axis=0))
+    assert np.allclose(rms.var, data.var(axis=0), rtol=1e-6)
+
+    first, second = RunningMeanStd(shape=(3,)), RunningMeanStd(shape=(3,))
+    for batch in batches[:2]:
+        first.update(batch)
+    for batch in batches[2:]:
+        second.update(batch)
+    first.merge(second)
+    assert first.count == rms.count
+    assert np.allclose(first.mean, rms.mean)
+    assert np.allclose(first.var, rms.var)
+
+
+def test_running_mean_std_save_load(tmpdir):
+    rms = RunningMeanStd(shape=(2,))
+    rms.update(np.random.randn(10, 2))
+    path = str(tmpdir.join('statistics.npz'))
+    rms.save(path)
+    loaded = RunningMeanStd(shape=(2,))
+    loaded.load(path)
+    assert loaded.count == 10
+    assert np.array_equal(loaded.mean, rms.mean)
+    assert np.array_equal(loaded.var, rms.var)
+
+
+def test_normalize_observation():
+    env = NormalizeObservation(gym.make('Pendulum-v0'))
+    env.seed(0)
+    observation = env.reset()
+    assert observation.dtype == np.float32
+    assert env.observation_space.contains(observation)
+    for _ in range(50):
+        observation, _, _, _ = env.step(env.action_space.sample())
+    assert env.obs_rms.count == 51
+    assert np.all(np.abs(observation) < 10.)
+
+
+def test_normalize_observation_save_load(tmpdir):
+    env = NormalizeObservation(gym.make('CartPole-v0'))
+    env.reset()
+    for _ in range(5):
+        env.step(0)
+    path = str(tmpdir.join('statistics.npz'))
+    env.save(path)
+
+    # Evaluation environments reuse the training statistics
+    eval_env = NormalizeObservation(gym.make('CartPole-v0'), update_stats=False)
+    eval_env.load(path)
+    eval_env.reset()
+    assert eval_env.obs_rms.count == 6
+    assert np.array_equal(eval_env.obs_rms.mean, env.obs_rms.mean)
+
+
+def test_normalize_reward():
+    gamma = 0.9
+    env = NormalizeReward(gym.make('CartPole-v0'), gamma=gamma)
+    env.seed(0)
+    env.reset()
+    returns, all_returns, done = 0., [], False
+    while not done:
+        _, reward, done, _ = env.step(env.action_space.sample())
+        assert isinstance(reward, float)
+        returns = gamma * returns + 1.
+        all_returns.append(returns)
+        assert np.isclose(reward, 1. / np.sqrt(np.var(all_returns) + 1e-8))
+    assert env.returns == 0.
@@ -0,0 +1,26 @@
+import numpy as np
+
+import gym
+from gym.spaces import Box
+from gym.wrappers import OneHotObservation
+
+
+def test_one_hot_observation():
+    env = gym.make('FrozenLake-v0')
+    wrapped_env = OneHotObservation(gym.make('FrozenLake-v0'))
+    assert wrapped_env.observation_space == Box(low=0, high=1, shape=(16,), dtype=np.float32)
+
+    env.seed(0)
+    wrapped_env.seed(0)
+    obs = env.reset()
+    wrapped_obs = wrapped_env.reset()
+    assert wrapped_env.observation_space.contains(wrapped_obs)
+    assert np.argmax(wrapped_obs) == obs
+
+    for action in [1, 2, 2, 1, 0, 3]:
+        obs, _, _, _ = env.step(action)
+        next_wrapped_obs, _, _, _ = wrapped_env.step(action)
+        assert next_wrapped_obs is not wrapped_obs
+        assert np.argmax(next_wrapped_obs) == obs and next_wrapped_obs.sum() == 1
+        wrapped_obs = next_wrapped_obs
+
@@ -0,0 +1,90 @@
+import pytest
+
+import numpy as np
+
+import gym
+from gym.spaces import Box
+from gym.wrappers import QuantizeObservation
+from gym.vector import AsyncVectorEnv
+
+
+class BoundedObservationEnv(gym.Env):
+    observation_space = Box(low=np.array([0., -1., 2.]), high=np.array([500., 1., 2.]),
+        dtype=np.float32)
+    action_space = Box(low=-1., high=1., shape=(1,), dtype=np.float32)
+
+    def __init__(self):
+        self.rng = np.random.RandomState(0)
+
+    def reset(self):
+        return self.observation_space.low.copy()
+
+    def step(self, action):
+        observation = self.rng.uniform(self.observation_space.low,
+            self.observation_space.high).astype(np.float32)
+        return observation, 0., False, {}
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16, np.int16])
+def test_quantize_observation(dtype):
+    env = BoundedObservationEnv()
+    wrapped_env = QuantizeObservation(BoundedObservationEnv(), dtype=dtype)
+    info = np.iinfo(dtype)
+    assert wrapped_env.observation_space.dtype == dtype
+    assert np.all(wrapped_env.observation_space.low == info.min)
+    assert np.all(wrapped_env.observation_space.high == info.max)
+
+    assert np.allclose(wrapped_env.dequantize(wrapped_env.reset()), env.reset())
+    for _ in range(10):
+        observation, _, _, _ = env.step(None)
+        quantized, _, _, _ = wrapped_env.step(None)
+        assert quantized.dtype == dtype
+        assert wrapped_env.observation_space.contains(quantized)
+        error = np.abs(wrapped_env.dequantize(quantized) - observation)
+        assert np.all(error <= wrapped_env.scale / 2 + 1e-4)
+
+    # Observations out of bounds are clipped
+    quantized = wrapped_env.observation(np.array([600., -2., 2.]))
+    assert np.allclose(wrapped_env.dequantize(quantized), [500., -1., 2.])
+
+
+def test_quantize_observation_float16():
+    wrapped_env = QuantizeObservation(BoundedObservationEnv(), dtype=np.float16)
+    assert wrapped_env.observation_space.dtype == np.float16
+    observation, _, _, _ = wrapped_env.step(None)
+    assert observation.dtype == np.float16
+    assert wrapped_env.observation_space.contains(observation)
+
+
+def test_quantize_observation_unbounded():
+    env = BoundedObservationEnv()
+    env.observation_space = Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32)
+    with pytest.raises(ValueError):
+        QuantizeObservation(env, dtype=np.uint8)
+
+
+def test_quantize_observation_identity_uint8():
+    env = BoundedObservationEnv()
+    env.observation_space = Box(low=0, high=255, shape=(3,), dtype=np.uint8)
+    wrapped_env = QuantizeObservation(env, dtype=np.uint8)
+    observation = np.array([0, 17, 255], dtype=np.uint8)
+    assert np.array_equal(wrapped_env.observation(observation), observation)
+
+
+def make_quantized_env(dtype):
+    return lambda: QuantizeObservation(BoundedObservationEnv(), dtype=dtype)
+
+@pytest.mark.parametrize('dtype', [np.uint16, np.float16])
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_quantize_observation_async_vector_env(dtype, shared_memory):
+    env = AsyncVectorEnv([make_quantized_env(dtype) for _ in range(2)],
+        shared_memory=shared_memory)
+    try:
+        env.reset()
+        observations, _, _, _ = env.step(env.action_space.sample())
+    finally:
+        env.close()
+    assert observations.dtype == dtype
+    assert observations.shape == (2, 3)
+    # Both workers start from the same seed
+    assert np.array_equal(observations[0], observations[1])
@@ -0,0 +1,77 @@
+import pytest
+
+import numpy as np
+
+import gym
+from gym.wrappers import RecordEpisodeStatistics, TimeLimit
+from gym.wrappers.record_episode_statistics import EpisodeWindow, BGCounter
+
+
+def test_episode_window():
+    window = EpisodeWindow(size=3)
+    assert len(window) == 0
+    assert np.isnan(window.mean('r'))
+    for r in range(5):
+        window.add({'r': r, 'l': 10 * r})
+    assert window.count == 5
+    assert len(window) == 3
+    assert sorted(window.values('r')) == [2., 3., 4.]
+    assert window.mean('l') == 30.
+    assert np.allclose(window.percentile('r', [0, 50, 100]), [2., 3., 4.])
+
+
+@pytest.mark.parametrize('sizes', [(5, 5, 5), (5, 3, 1)])
+def test_bg_counter_update_batch(sizes):
+    rng = np.random.RandomState(0)
+    bgs = [rng.uniform(40., 250., size=size) for size in sizes]
+    counter, expected = BGCounter(3), BGCounter(3)
+    counter.update_batch(bgs)
+    for i, bg in enumerate(bgs):
+        expected.update(i, bg)
+    for i in range(3):
+        assert counter.episode(i) == expected.episode(i)
+    assert np.array_equal(counter.minutes, sizes)
+
+
+def test_bg_counter_update_batch_missing():
+    counter = BGCounter(3)
+    counter.update_batch([np.full(5, 100.), None, np.full(5, 50.)])
+    assert np.array_equal(counter.minutes, [5, 0, 5])
+    assert np.array_equal(counter.hypo, [0, 0, 5])
+    counter.update_batch([None, None, None])
+    assert np.array_equal(counter.minutes, [5, 0, 5])
+
+
+def test_record_episode_statistics():
+    env = RecordEpisodeStatistics(gym.make('CartPole-v1'), window_size=2)
+    env.seed(0)
+    for _ in range(3):
+        env.reset()
+        episode_return, episode_length, done = 0., 0, False
+        while not done:
+            _, reward, done, info = env.step(env.action_space.sample())
+            episode_return += reward
+            episode_length += 1
+            assert ('episode' in info) == done
+        assert info['episode'] == {'r': episode_return, 'l': episode_length}
+    assert env.episode_window.count == 3
+    assert len(env.episode_window) == 2
+
+
+def test_record_episode_statistics_diabetes():
+    env = gym.make('HovorkaCambridge-v0').unwrapped
+    env = RecordEpisodeStatistics(TimeLimit(env, max_episode_steps=5),
+        bg_range=(100., 150.))
+    np.random.seed(0)
+    env.reset()
+    done = False
+    while not done:
+        _, _, done, info = env.step(env.action_space.sample())
+
+    bg = env.unwrapped.bg_history
+    assert bg.size == 5 * env.unwrapped.simulation_time
+    episode = info['episode']
+    assert episode['hypo'] == np.count_nonzero(bg < 100.)
+    assert episode['hyper'] == np.count_nonzero(bg > 150.)
+    assert episode['time_in_range'] == pytest.approx(
+        np.mean((bg >= 100.) & (bg <= 150.)))
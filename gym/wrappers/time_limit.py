@@ -1,4 +1,5 @@
 import gym
+from gym.wrappers.action_repeat import repeat_step
 
 
 class TimeLimit(gym.Wrapper):
@@ -20,6 +21,18 @@ class TimeLimit(gym.Wrapper):
             done = True
         return observation, reward, done, info
 
+    def step_n(self, action, n):
+        assert self._elapsed_steps is not None, "Cannot call env.step() before calling reset()"
+        if self._max_episode_steps is not None:
+            n = max(1, min(n, self._max_episode_steps - self._elapsed_steps))
+        observation, reward, done, info = repeat_step(self.env, action, n)
+        self._elapsed_steps += info['num_steps']
+        if (self._max_episode_steps is not None) and \
+                (self._elapsed_steps >= self._max_episode_steps):
+            info['TimeLimit.truncated'] = not done
+            done = True
+        return observation, reward, done, info
+
     def reset(self, **kwargs):
         self._elapsed_steps = 0
         return self.env.reset(**kwargs)
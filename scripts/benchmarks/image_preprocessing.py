@@ -0,0 +1,77 @@
+"""Benchmark the image preprocessing of `AtariPreprocessing` (max-pooling of
+two frames, gray scale conversion and area resize) on a batch of random
+Atari-sized RGB frames.
+
+The per-frame implementation (`per-frame`), which calls OpenCV on each frame
+and allocates the intermediate images, is compared with the preallocated
+`ImagePreprocessor` stage, run on each frame (`stage`) or on the whole batch
+(`batched`). Throughput is reported in frames per second per core, from the
+CPU time of the process. Requires OpenCV.
+
+Example:
+    python scripts/benchmarks/image_preprocessing.py --num-envs 16
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy as np
+
+from gym.wrappers.image_preprocessing import ImagePreprocessor
+
+
+def per_frame(frames, previous_frames, screen_size):
+    import cv2
+    observations = []
+    for frame, previous_frame in zip(frames, previous_frames):
+        frame = np.maximum(frame, previous_frame)
+        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        observations.append(cv2.resize(frame, (screen_size, screen_size),
+            interpolation=cv2.INTER_AREA))
+    return np.stack(observations)
+
+
+def measure(fn, num_frames, num_steps):
+    fn()
+    start = time.process_time()
+    for _ in range(num_steps):
+        fn()
+    return num_steps * num_frames / (time.process_time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-envs', type=int, default=8)
+    parser.add_argument('--num-steps', type=int, default=500)
+    parser.add_argument('--screen-size', type=int, default=84)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    shape = (args.num_envs, 210, 160, 3)
+    frames = rng.randint(0, 256, size=shape, dtype=np.uint8)
+    previous_frames = rng.randint(0, 256, size=shape, dtype=np.uint8)
+    resize = (args.screen_size, args.screen_size)
+
+    stage = ImagePreprocessor(shape[1:], grayscale=True, resize=resize,
+        max_pool=True)
+    batched = ImagePreprocessor(shape[1:], grayscale=True, resize=resize,
+        max_pool=True, n=args.num_envs)
+
+    results = [
+        ('per-frame', lambda: per_frame(frames, previous_frames, args.screen_size)),
+        ('stage', lambda: [stage(frame, previous_frame)
+            for (frame, previous_frame) in zip(frames, previous_frames)]),
+        ('batched', lambda: batched(frames, previous_frames)),
+    ]
+    print('{0} frames of shape {1} -> {2}'.format(args.num_envs, shape[1:], resize))
+    reference = None
+    for name, fn in results:
+        fps = measure(fn, args.num_envs, args.num_steps)
+        reference = reference or fps
+        print('{0:10s} {1:10.0f} frames/s/core   speedup: {2:.2f}x'.format(
+            name, fps, fps / reference))
+
+
+if __name__ == '__main__':
+    main()
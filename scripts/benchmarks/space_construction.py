@@ -0,0 +1,63 @@
+"""Benchmark the construction of large nested and batched spaces.
+
+Since the PRNG of the spaces is created lazily, constructing a space does not
+seed it anymore. The `eager` timings seed every space right after construction,
+as `Space.__init__` used to do, to measure the saving.
+
+Example:
+    python scripts/benchmarks/space_construction.py --num-keys 64 --num-envs 256
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import numpy as np
+
+from gym.spaces import Box, Discrete, MultiBinary, Tuple, Dict
+from gym.vector.utils import batch_space
+
+
+def make_nested_space(num_keys):
+    return Dict(dict(('sensor_{0}'.format(i), Dict({
+        'position': Box(low=-1., high=1., shape=(3,), dtype=np.float32),
+        'status': Tuple((Discrete(5), MultiBinary(4))),
+    })) for i in range(num_keys)))
+
+
+def seed_all(space):
+    if isinstance(space, Tuple):
+        for subspace in space.spaces:
+            seed_all(subspace)
+    elif isinstance(space, Dict):
+        for subspace in space.spaces.values():
+            seed_all(subspace)
+    else:
+        space.seed()
+    return space
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-keys', type=int, default=64,
+        help='number of keys of the nested Dict space')
+    parser.add_argument('--num-envs', type=int, default=256,
+        help='batch size for `batch_space`')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    space = make_nested_space(args.num_keys)
+    benchmarks = [
+        ('nested Dict', lambda: make_nested_space(args.num_keys)),
+        ('batch_space', lambda: batch_space(space, n=args.num_envs)),
+    ]
+    for name, fn in benchmarks:
+        lazy = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        eager = min(timeit.repeat(lambda: seed_all(fn()), number=1,
+            repeat=args.repeat))
+        print('{0:<12} lazy: {1:8.3f} ms   eager: {2:8.3f} ms   '
+            'speedup: {3:.1f}x'.format(name, 1e3 * lazy, 1e3 * eager, eager / lazy))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the batched wrappers of `gym.vector.wrappers` against the same
+wrappers of `gym.wrappers` applied to each environment.
+
+The environments return random RGB frames (Atari-sized by default), which
+are converted to gray scale and resized, either in each environment
+(`per-env`) or once for the whole batch in the main process (`batched`).
+Requires OpenCV.
+
+Example:
+    python scripts/benchmarks/vector_wrappers.py --num-envs 16 --asynchronous
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym import spaces, wrappers
+from gym.vector import SyncVectorEnv, AsyncVectorEnv
+from gym.vector import wrappers as vector_wrappers
+
+
+class RandomFramesEnv(gym.Env):
+    def __init__(self, height=210, width=160, num_frames=16):
+        self.observation_space = spaces.Box(low=0, high=255,
+            shape=(height, width, 3), dtype=np.uint8)
+        self.action_space = spaces.Discrete(2)
+        rng = np.random.RandomState(0)
+        self._frames = rng.randint(0, 256, size=(num_frames, height, width, 3),
+            dtype=np.uint8)
+        self._t = 0
+
+    def reset(self):
+        self._t = 0
+        return self._frames[0]
+
+    def step(self, action):
+        self._t += 1
+        return self._frames[self._t % len(self._frames)], 0., False, {}
+
+
+def make_per_env(screen_size):
+    def _make():
+        env = wrappers.GrayScaleObservation(RandomFramesEnv(), keep_dim=True)
+        return wrappers.ResizeObservation(env, screen_size)
+    return _make
+
+
+def run(env, num_steps):
+    env.reset()
+    actions = np.zeros((env.num_envs,), dtype=np.int64)
+    start = time.time()
+    for _ in range(num_steps):
+        env.step(actions)
+    duration = time.time() - start
+    env.close()
+    return num_steps * env.num_envs / duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-envs', type=int, default=8)
+    parser.add_argument('--num-steps', type=int, default=200)
+    parser.add_argument('--screen-size', type=int, default=84)
+    parser.add_argument('--asynchronous', action='store_true',
+        help='use `AsyncVectorEnv` instead of `SyncVectorEnv`')
+    args = parser.parse_args()
+    VectorEnv = AsyncVectorEnv if args.asynchronous else SyncVectorEnv
+
+    per_env = VectorEnv([make_per_env(args.screen_size)] * args.num_envs)
+    batched = VectorEnv([RandomFramesEnv] * args.num_envs)
+    batched = vector_wrappers.GrayScaleObservation(batched, keep_dim=True)
+    batched = vector_wrappers.ResizeObservation(batched, args.screen_size)
+
+    per_env_fps = run(per_env, args.num_steps)
+    batched_fps = run(batched, args.num_steps)
+    print('{0} x {1}'.format(VectorEnv.__name__, args.num_envs))
+    print('per-env  {0:10.0f} frames/s'.format(per_env_fps))
+    print('batched  {0:10.0f} frames/s   speedup: {1:.2f}x'.format(batched_fps,
+        batched_fps / per_env_fps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark the overhead of each wrapper layer on `step`, for a cheap
+environment (CartPole), with and without `gym.wrappers.FusedWrapper`.
+
+Each stack is made of `gym.make` (with its `TimeLimit`) and of `num_layers`
+extra wrappers, alternating between an observation wrapper and a reward
+wrapper, both applying the identity. The overhead per layer is the increase
+of the time per step, divided by the number of layers (including
+`TimeLimit`).
+
+Example:
+    python scripts/benchmarks/wrapper_overhead.py --num-layers 8
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+import gym
+from gym.wrappers import FusedWrapper, TransformReward
+
+
+class IdentityObservation(gym.ObservationWrapper):
+    def observation(self, observation):
+        return observation
+
+
+def make_stack(env_id, num_layers):
+    env = gym.make(env_id)
+    for i in range(num_layers):
+        env = IdentityObservation(env) if (i % 2 == 0) \
+            else TransformReward(env, lambda r: r)
+    return env
+
+
+def time_per_step(env, num_steps):
+    env.seed(0)
+    env.reset()
+    step, reset = env.step, env.reset
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        _, _, done, _ = step(0)
+        if done:
+            reset()
+    return (time.perf_counter() - start) / num_steps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--env-id', type=str, default='CartPole-v1')
+    parser.add_argument('--num-layers', type=int, default=8)
+    parser.add_argument('--num-steps', type=int, default=50000)
+    args = parser.parse_args()
+
+    base = time_per_step(make_stack(args.env_id, 0).unwrapped, args.num_steps)
+    print('{0}: {1:.2f} us/step without wrappers'.format(args.env_id, 1e6 * base))
+    for name, fuse in [('wrapped', False), ('fused', True)]:
+        env = make_stack(args.env_id, args.num_layers)
+        if fuse:
+            env = FusedWrapper(env)
+        duration = time_per_step(env, args.num_steps)
+        overhead = (duration - base) / (args.num_layers + 1)
+        print('{0:8s} {1:8.2f} us/step   {2:6.2f} us/layer ({3} layers)'.format(
+            name, 1e6 * duration, 1e6 * overhead, args.num_layers + 1))
+
+
+if __name__ == '__main__':
+    main()
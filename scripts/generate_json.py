@@ -1,17 +1,14 @@
 from __future__ import unicode_literals
-from gym import envs, spaces, logger
+from gym import envs, logger
 import json
 import os
-import sys
 import argparse
 
 from gym.envs.tests.spec_list import should_skip_env_spec_for_tests
-from gym.envs.tests.test_envs_semantics import generate_rollout_hash, hash_object
+from gym.utils.rollout_hash import ROLLOUT_KEYS, generate_rollout_hashes
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'gym', 'envs', 'tests')
 ROLLOUT_STEPS = 100
-episodes = ROLLOUT_STEPS
-steps = ROLLOUT_STEPS
 
 ROLLOUT_FILE = os.path.join(DATA_DIR, 'rollout.json')
 
@@ -20,12 +17,7 @@ if not os.path.isfile(ROLLOUT_FILE):
     with open(ROLLOUT_FILE, "w") as outfile:
         json.dump({}, outfile, indent=2)
 
-def update_rollout_dict(spec, rollout_dict):
-    """
-    Takes as input the environment spec for which the rollout is to be generated,
-    and the existing dictionary of rollouts. Returns True iff the dictionary was
-    modified.
-    """
+def should_generate_rollout(spec):
     # Skip platform-dependent
     if should_skip_env_spec_for_tests(spec):
         logger.info("Skipping tests for {}".format(spec.id))
@@ -36,20 +28,21 @@ def update_rollout_dict(spec, rollout_dict):
         logger.info("Skipping tests for nondeterministic env {}".format(spec.id))
         return False
 
-    logger.info("Generating rollout for {}".format(spec.id))
+    return True
 
-    try:
-        observations_hash, actions_hash, rewards_hash, dones_hash = generate_rollout_hash(spec)
-    except:
+def update_rollout_dict(spec, hashes, error, rollout_dict):
+    """
+    Takes as input the environment spec for which the rollout was generated,
+    the hashes of the rollout (or the error raised while generating it), and
+    the existing dictionary of rollouts. Returns True iff the dictionary was
+    modified.
+    """
+    if error is not None:
         # If running the env generates an exception, don't write to the rollout file
-        logger.warn("Exception {} thrown while generating rollout for {}. Rollout not added.".format(sys.exc_info()[0], spec.id))
+        logger.warn("Exception {} thrown while generating rollout for {}. Rollout not added.".format(error, spec.id))
         return False
 
-    rollout = {}
-    rollout['observations'] = observations_hash
-    rollout['actions'] = actions_hash
-    rollout['rewards'] = rewards_hash
-    rollout['dones'] = dones_hash
+    rollout = dict(zip(ROLLOUT_KEYS, hashes))
 
     existing = rollout_dict.get(spec.id)
     if existing:
@@ -65,19 +58,28 @@ def update_rollout_dict(spec, rollout_dict):
     rollout_dict[spec.id] = rollout
     return True
 
-def add_new_rollouts(spec_ids, overwrite):
+def add_new_rollouts(spec_ids, overwrite, processes=None):
     environments = [spec for spec in envs.registry.all() if spec.entry_point is not None]
     if spec_ids:
         environments = [spec for spec in environments if spec.id in spec_ids]
         assert len(environments) == len(spec_ids), "Some specs not found"
     with open(ROLLOUT_FILE) as data_file:
         rollout_dict = json.load(data_file)
-    modified = False
+
+    specs = []
     for spec in environments:
         if not overwrite and spec.id in rollout_dict:
             logger.debug("Rollout already exists for {}. Skipping.".format(spec.id))
-        else:
-            modified = update_rollout_dict(spec, rollout_dict) or modified
+        elif should_generate_rollout(spec):
+            specs.append(spec)
+
+    logger.info("Generating rollouts for {} environments".format(len(specs)))
+    results = generate_rollout_hashes(specs, num_steps=ROLLOUT_STEPS,
+        processes=processes)
+    modified = False
+    for spec in specs:
+        hashes, error = results[spec.id]
+        modified = update_rollout_dict(spec, hashes, error, rollout_dict) or modified
 
     if modified:
         logger.info("Writing new rollout file to {}".format(ROLLOUT_FILE))
@@ -91,8 +93,10 @@ if __name__ == '__main__':
     parser.add_argument('-f', '--force', action='store_true', help='Overwrite '+
         'existing rollouts if hashes differ.')
     parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('-j', '--processes', type=int, default=None, help='Number '+
+        'of worker processes (default: number of CPUs)')
     parser.add_argument('specs', nargs='*', help='ids of env specs to check (default: all)')
     args = parser.parse_args()
     if args.verbose:
         logger.set_level(logger.INFO)
-    add_new_rollouts(args.specs, args.force)
+    add_new_rollouts(args.specs, args.force, args.processes)
@@ -7,6 +7,7 @@ import numpy as np
 import gym
 from gym.spaces import Dict, Box, Discrete, Tuple
 from gym.wrappers.dict import FlattenDictWrapper
+from gym.wrappers.flatten_observation import FlattenObservation
 
 
 class FakeEnvironment(gym.Env):
@@ -152,3 +153,15 @@ class TestNestedDictWrapper(object):
 
         with pytest.raises(error_type, match=error_match):
             FlattenDictWrapper(env, env.obs_keys)
+
+
+@pytest.mark.parametrize("observation_space, flat_shape", NESTED_DICT_TEST_CASES)
+def test_nested_dicts_flatten_observation(observation_space, flat_shape):
+    env = FakeEnvironment(observation_space=observation_space)
+    wrapped_env = FlattenObservation(env)
+    assert wrapped_env.observation_space.shape == flat_shape
+
+    obs = wrapped_env.reset()
+    assert obs.shape == flat_shape
+    assert obs.dtype == np.float32
+    assert wrapped_env.observation_space.contains(obs)
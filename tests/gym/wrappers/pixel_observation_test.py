@@ -116,3 +116,52 @@ class TestPixelObservationWrapper(object):
 
         assert depth_observation.shape == (32, 32, 3)
         assert depth_observation.dtype == np.uint8
+
+
+class CountingEnvironment(FakeArrayObservationEnvironment):
+    def __init__(self, *args, **kwargs):
+        super(CountingEnvironment, self).__init__(*args, **kwargs)
+        self.num_renders = 0
+
+    def render(self, width=32, height=32, *args, **kwargs):
+        self.num_renders += 1
+        image = super(CountingEnvironment, self).render(width, height, *args, **kwargs)
+        image[...] = self.num_renders
+        return image
+
+
+class TestPixelObservationCache(object):
+    def test_shared_render_kwargs(self):
+        env = CountingEnvironment()
+        wrapped_env = PixelObservationWrapper(
+            env,
+            pixel_keys=('left', 'right', 'small'),
+            render_kwargs={'small': {'width': 8, 'height': 8}})
+        # One render per distinct render kwargs
+        assert env.num_renders == 2
+        assert wrapped_env.observation_space.spaces['small'].shape == (8, 8, 3)
+
+        observation = wrapped_env.reset()
+        assert env.num_renders == 4
+        assert np.array_equal(observation['left'], observation['right'])
+        assert observation['left'] is not observation['right']
+
+        observation, _, _, _ = wrapped_env.step(wrapped_env.action_space.sample())
+        assert env.num_renders == 6
+        # Rendering the current frame again reuses the cached frame
+        frame = wrapped_env.render(mode='rgb_array')
+        assert env.num_renders == 6
+        assert np.array_equal(frame, observation['left'])
+        wrapped_env.render(mode='rgb_array', width=16, height=16)
+        assert env.num_renders == 7
+
+    @pytest.mark.parametrize("copy", (True, False))
+    def test_readback_buffer(self, copy):
+        env = CountingEnvironment()
+        wrapped_env = PixelObservationWrapper(env, pixel_keys=('pixels', ),
+                                              copy=copy)
+        first = wrapped_env.reset()['pixels']
+        second, _, _, _ = wrapped_env.step(wrapped_env.action_space.sample())
+        second = second['pixels']
+        assert (first is second) == (not copy)
+        assert np.all(second == env.num_renders)